@@ -5,6 +5,8 @@ import sqlite3
 
 db_path = "app.db"
 
+# Rows go into the published batch of Phase 1 Review 2 (run the app once first to create it)
+
 # Sample marks for Phase 1 Review 2 (Objectives:10, Methodology:10, Presentation:10, Q&A:10 = 40 total)
 p1r2_data = [
     # student_id, phase, review_no, total, c1, c2, c3, c4, m1c1, m1c2, m1c3, m1c4, m2c1, m2c2, m2c3, m2c4, gc1, gc2, gc3, gc4
@@ -30,9 +32,12 @@ try:
                 criteria1, criteria2, criteria3, criteria4,
                 member1_criteria1, member1_criteria2, member1_criteria3, member1_criteria4,
                 member2_criteria1, member2_criteria2, member2_criteria3, member2_criteria4,
-                guide_criteria1, guide_criteria2, guide_criteria3, guide_criteria4
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (student_id, phase, review_no, total, c1, c2, c3, c4, m1c1, m1c2, m1c3, m1c4, m2c1, m2c2, m2c3, m2c4, gc1, gc2, gc3, gc4))
+                guide_criteria1, guide_criteria2, guide_criteria3, guide_criteria4,
+                member1_total, member2_total, guide_total, import_batch_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                      (SELECT batch_id FROM active_batch WHERE phase = ? AND review_no = ?))
+        """, (student_id, phase, review_no, total, c1, c2, c3, c4, m1c1, m1c2, m1c3, m1c4, m2c1, m2c2, m2c3, m2c4, gc1, gc2, gc3, gc4,
+              m1c1 + m1c2 + m1c3 + m1c4, m2c1 + m2c2 + m2c3 + m2c4, gc1 + gc2 + gc3 + gc4, phase, review_no))
     
     conn.commit()
     print("SUCCESS: Added 7 Phase 1 Review 2 evaluations")
@@ -1,27 +1,191 @@
 import io
 import os
 import csv
+import unicodedata
+from urllib.parse import quote
 from pathlib import Path
-from datetime import date
-from flask import Flask, render_template, request, redirect, url_for, send_file, flash, session
-from models import db, Student, Evaluation
-from utils import reverse_engineer_components, normalize_header, TOTAL_MAX
-from pdf_template import build_review1_pdf
-from comprehensive_pdf_template import build_comprehensive_pdf
-from upload_helpers import map_excel_columns_to_criteria
+from datetime import date, timezone
+from functools import lru_cache, wraps
+from typing import Iterable, Iterator, Optional, Sequence
+from flask import (Flask, Response, render_template, request, redirect, url_for, send_file, flash, session,
+                   jsonify, make_response, g, current_app, stream_with_context)
+from models import db, Student, ImportErrorRow
+from renderers import build_review1_pdf, build_comprehensive_pdf
+from bulk_pdfs import sheet_filename, sheet_payload, stream_review_sheets
+from import_jobs import submit_import, get_job
+from upload_helpers import spool_upload, upload_hasher
+from import_engine import find_previous_import, record_rollback
+from import_batches import rollback_batch
+from repository import (student_evaluations, iter_student_evaluations, student_evaluation, student_evaluations_page, review_stats,
+                        grouped_evaluations)
 from review_config import get_review_config
+from data_versions import data_version
+from result_cache import ResultCache, DEFAULT_MAX_BYTES
+from migrations import run_migrations, schema_is_current
+from sqlite_profile import sqlite_pragmas, sqlite_engine_options
 from dotenv import load_dotenv
 import sqlalchemy
 from sqlalchemy import text
-from openpyxl import load_workbook
 
 APP_DIR = Path(__file__).parent.resolve()
 EXPORTS_DIR = APP_DIR / "exports"
 
-def create_app() -> Flask:
-    # Load .env if present
+# Rows per page of an import error report
+ERRORS_PER_PAGE = 50
+
+# CSV rows encoded per chunk of a streamed download
+CSV_CHUNK_ROWS = 500
+
+# Row partials rendered for each paginated student view
+ROW_TEMPLATES = {
+    "list": "_student_rows.html",
+    "individual": "_individual_rows.html",
+}
+
+def conditional_on_data(all_reviews: bool = False, remembers_review: bool = False, daily: bool = False):
+    """
+    Answer repeat GETs with 304 Not Modified while the data a view renders is unchanged.
+    The ETag combines the endpoint, the phase/review the view reads (query args, then
+    session) and that review's data version; all_reviews views use every review's version.
+    The output is cached under the ETag, as a version of the result named by the
+    endpoint and phase/review alone.
+    Views that store the selected phase/review in the session set remembers_review so a
+    304 still does that. Views that print today's date set daily: the date joins the ETag
+    and no Last-Modified is sent, so a copy from an earlier day is never revalidated.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if all_reviews:
+                name = request.endpoint
+                tag, updated_at = data_version()
+            else:
+                phase = request.args.get("phase", session.get("current_phase", 1), type=int)
+                review = request.args.get("review", session.get("current_review", 1), type=int)
+                name = f"{request.endpoint}-p{phase}r{review}"
+                tag, updated_at = data_version(phase, review)
+            etag = f"{name}-{tag}"
+            if daily:
+                etag += f"-{date.today().strftime('%Y%m%d')}"
+                updated_at = None
+            # The rendered output is cacheable under the same key, unless it will show a flash message
+            g.result_key = None if session.get("_flashes") else etag
+            g.result_name = name
+            last_modified = updated_at.replace(tzinfo=timezone.utc, microsecond=0) if updated_at else None
+
+            # A pending flash message is part of the page, so never answer 304 over it
+            if not session.get("_flashes"):
+                if request.if_none_match:
+                    not_modified = request.if_none_match.contains(etag)
+                else:
+                    not_modified = bool(last_modified and request.if_modified_since
+                                        and request.if_modified_since >= last_modified)
+                if not_modified:
+                    if remembers_review:
+                        session["current_phase"] = phase
+                        session["current_review"] = review
+                    response = Response(status=304)
+                    response.set_etag(etag)
+                    response.cache_control.no_cache = True
+                    return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+                if last_modified:
+                    response.last_modified = last_modified
+                # Browsers may keep the page but must revalidate it on every use
+                response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+
+def cached_result() -> Optional[bytes]:
+    """Cached output of the current versioned view, if any (see conditional_on_data)"""
+    key = g.get("result_key")
+    return current_app.extensions["result_cache"].get(key, g.result_name) if key else None
+
+
+def cache_result(value: bytes) -> bytes:
+    """Store the output of the current versioned view and return it"""
+    key = g.get("result_key")
+    if key:
+        current_app.extensions["result_cache"].put(key, value, g.result_name)
+    return value
+
+
+def csv_chunks(rows: Iterable[Sequence]) -> Iterator[bytes]:
+    """UTF-8 CSV in chunks of CSV_CHUNK_ROWS rows, produced as the rows arrive"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % CSV_CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def cache_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Pass chunks through and cache the complete output of the current versioned view.
+    Output larger than the result cache is streamed without being kept, and a
+    download the client abandons is never cached half-written.
+    """
+    limit = current_app.extensions["result_cache"].max_bytes
+    parts, size = [], 0
+    for chunk in chunks:
+        if parts is not None:
+            size += len(chunk)
+            if size <= limit:
+                parts.append(chunk)
+            else:
+                parts = None
+        yield chunk
+    if parts is not None:
+        cache_result(b"".join(parts))
+
+
+def stream_download(chunks: Iterable[bytes], filename: str, mimetype: str) -> Response:
+    """Attachment response that sends each chunk as soon as it is produced"""
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    try:
+        filename.encode("ascii")
+        names = {"filename": filename}
+    except UnicodeEncodeError:
+        # Same fallback as send_file: an ASCII name plus the RFC 5987 UTF-8 name
+        names = {
+            "filename": unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode("ascii"),
+            "filename*": f"UTF-8''{quote(filename, safe='!#$&+^`|~')}",
+        }
+    response.headers.set("Content-Disposition", "attachment", **names)
+    return response
+
+
+@lru_cache(maxsize=None)
+def _load_env() -> None:
+    """Read .env once per process; later create_app() calls reuse the environment"""
     load_dotenv()
 
+
+def _create_mysql_database(uri: str) -> None:
+    """CREATE DATABASE IF NOT EXISTS through a server-level connection (first bootstrap only)"""
+    url = sqlalchemy.engine.make_url(uri)
+    engine_no_db = sqlalchemy.create_engine(url.set(database=None), future=True)
+    try:
+        with engine_no_db.connect() as conn:
+            conn.execute(text(f"CREATE DATABASE IF NOT EXISTS `{url.database}` DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;"))
+    finally:
+        engine_no_db.dispose()
+
+
+def create_app(test_config=None) -> Flask:
+    # Load .env if present
+    _load_env()
+
     app = Flask(__name__)
     app.config["SECRET_KEY"] = "dev-secret"
 
@@ -33,13 +197,7 @@ def create_app() -> Flask:
     db_name = os.getenv("DB_NAME")
 
     if db_host and db_user and db_name:
-        # Ensure database exists
-        engine_no_db = sqlalchemy.create_engine(
-            f"mysql+pymysql://{db_user}:{db_pass}@{db_host}:{db_port}/?charset=utf8mb4",
-            future=True,
-        )
-        with engine_no_db.connect() as conn:
-            conn.execute(text(f"CREATE DATABASE IF NOT EXISTS `{db_name}` DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;"))
+        # The database itself is created on first bootstrap, see below
         app.config["SQLALCHEMY_DATABASE_URI"] = (
             f"mysql+pymysql://{db_user}:{db_pass}@{db_host}:{db_port}/{db_name}?charset=utf8mb4"
         )
@@ -47,9 +205,35 @@ def create_app() -> Flask:
         app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{APP_DIR/'app.db'}"
 
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    # Rendered views and exports cache; RESULT_CACHE_SPILL=1 keeps evicted results in exports/cache
+    app.config["RESULT_CACHE_MAX_BYTES"] = int(os.getenv("RESULT_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+    app.config["RESULT_CACHE_SPILL"] = os.getenv("RESULT_CACHE_SPILL", "") == "1"
+    # WAL journal for SQLite, opted into by serve.py; off by default so app.db stays self-contained
+    app.config["SQLITE_WAL"] = os.getenv("SQLITE_WAL", "") == "1"
+    # "auto" skips database creation, create_all() and migrations when the schema marker
+    # is current; DB_BOOTSTRAP=always runs them on every start
+    app.config["DB_BOOTSTRAP"] = os.getenv("DB_BOOTSTRAP", "auto")
+    if test_config:
+        # Allow tests/scripts to point the app at a scratch database
+        app.config.update(test_config)
+    # Per-connection pragmas when serving from SQLite, installed by db on the app's engine;
+    # an empty dict leaves SQLite defaults
+    app.config.setdefault("SQLITE_PRAGMAS", sqlite_pragmas(app.config["SQLITE_WAL"]))
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **sqlite_engine_options(app.config["SQLALCHEMY_DATABASE_URI"]),
+        **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+    }
     db.init_app(app)
+    app.extensions["result_cache"] = ResultCache(
+        app.config["RESULT_CACHE_MAX_BYTES"],
+        EXPORTS_DIR / "cache" if app.config["RESULT_CACHE_SPILL"] else None,
+    )
     with app.app_context():
-        db.create_all()
+        if app.config["DB_BOOTSTRAP"] == "always" or not schema_is_current():
+            if db.engine.dialect.name == "mysql":
+                _create_mysql_database(app.config["SQLALCHEMY_DATABASE_URI"])
+            db.create_all()
+            run_migrations()
 
     @app.route("/")
     def index():
@@ -58,6 +242,9 @@ def create_app() -> Flask:
     @app.route("/upload", methods=["GET", "POST"])
     def upload_csv():
         if request.method == "POST":
+            # Multi-sheet mode: one sheet per phase/review, so the selectors are ignored
+            all_sheets = request.form.get("mode") == "all_sheets"
+
             # Get phase and review from form
             try:
                 phase = int(request.form.get("phase", 1))
@@ -80,173 +267,67 @@ def create_app() -> Flask:
                 flash("Only .xlsx files are accepted.", "error")
                 return redirect(request.url)
 
-            # Read Excel (.xlsx) with openpyxl
-            raw = file.stream.read()
-            try:
-                wb = load_workbook(io.BytesIO(raw), data_only=True)
-            except Exception:
-                flash("Could not read the .xlsx file. Please ensure it is a valid Excel file.", "error")
-                return redirect(request.url)
-            ws = wb.active
-
-            header_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), tuple())
-            fieldnames = [str(v) if v is not None else "" for v in header_row]
-            headers = [normalize_header(h) for h in fieldnames]
-
-            def iter_rows_dict():
-                for vals in ws.iter_rows(min_row=2, values_only=True):
-                    row = {}
-                    for i, key in enumerate(fieldnames):
-                        val = vals[i] if i < len(vals) else None
-                        row[key] = val
-                    yield row
-            rows_iter = iter_rows_dict()
-
-            # Map common header names to our keys
-            # Required: student name, seat no. Optional: group no, project title, evaluator marks.
-            key_map = {}
-            for raw in fieldnames or []:
-                h = normalize_header(raw)
-                # Default: map normalized key to raw header (for dynamic lookup)
-                key_map[h] = raw
-                
-                if h in ("name", "student_name"):
-                    key_map["name"] = raw
-                elif h in ("seat_no", "seatno", "usn", "univ_seat_no"):
-                    key_map["seat_no"] = raw
-                elif h in ("total", "total_marks", "average", "avg"):
-                    key_map["total"] = raw
-                elif h in ("group", "group_no", "group_number", "project_group"):
-                    key_map["group_no"] = raw
-                elif h in ("project_title", "title"):
-                    key_map["project_title"] = raw
-                elif h in ("project_guide",):
-                    key_map["project_guide"] = raw
-                elif h in ("member1", "member_1", "chairperson"):
-                    key_map["member1"] = raw
-                elif h in ("member2", "member_2"):
-                    key_map["member2"] = raw
-                elif h in ("internal_guide", "guide", "project_guide"):
-                    key_map["internal_guide"] = raw
-                elif h in ("literature", "literature_survey"):
-                    key_map["literature_survey"] = raw
-                elif h in ("problem", "problem_identification"):
-                    key_map["problem_identification"] = raw
-                elif h in ("presentation", "project_presentation_skill", "presentation_skill"):
-                    key_map["presentation"] = raw
-                elif h in ("qa", "qna", "question_answer", "question_and_answer_session", "q_a"):
-                    # Map to full name to ensure fuzzy match with criteria "Question and answer session"
-                    key_map["question_and_answer_session"] = raw
-
-            missing = [k for k in ("name", "seat_no") if k not in key_map]
-            if missing:
-                flash(f"Excel file missing required columns: {', '.join(missing)}", "error")
-                return redirect(request.url)
-
-            # Delete existing evaluations for this specific phase and review only
-            try:
-                db.session.execute(text(f"DELETE FROM evaluation WHERE phase = {phase} AND review_no = {review_no}"))
-                db.session.commit()
-            except Exception:
-                db.session.rollback()
-                flash(f"Failed to delete existing Phase {phase} Review {review_no} data before import.", "error")
-                return redirect(request.url)
-
-            created = 0
-            for row in rows_iter:
-                name = str(row.get(key_map["name"]) or "").strip()
-                seat_no = str(row.get(key_map["seat_no"]) or "").strip()
-                if not name or not seat_no:
-                    continue
-
-                group_no = str(row.get(key_map.get("group_no", ""), "") or "").strip()
-                project_title = str(row.get(key_map.get("project_title", ""), "") or "").strip()
-                project_guide = str(row.get(key_map.get("project_guide", ""), "") or "").strip()
-
-                student = Student.query.filter_by(seat_no=seat_no).one_or_none()
-                if not student:
-                    student = Student(name=name, seat_no=seat_no, group_no=group_no, project_title=project_title, project_guide=project_guide)
-                    db.session.add(student)
-                else:
-                    # update all fields if provided (including name for corrections/updates)
-                    if name:
-                        student.name = name
-                    if group_no:
-                        student.group_no = group_no
-                    if project_title:
-                        student.project_title = project_title
-                    if project_guide:
-                        student.project_guide = project_guide
-
-                # Use dynamic column mapping based on phase/review
-                try:
-                    comp, member1_comp, member2_comp, guide_comp = map_excel_columns_to_criteria(
-                        row, key_map, phase, review_no
-                    )
-                    total = sum(comp.values())
-                except Exception as e:
-                    flash(f"Error processing row for {name}: {str(e)}", "error")
-                    continue
-
-                # Upsert: one evaluation per student per phase per review
-                existing = Evaluation.query.filter_by(student=student, phase=phase, review_no=review_no).one_or_none()
-                if existing:
-                    existing.phase = phase
-                    existing.total_marks = total
-                    existing.criteria1 = comp["criteria1"]
-                    existing.criteria2 = comp["criteria2"]
-                    existing.criteria3 = comp["criteria3"]
-                    existing.criteria4 = comp["criteria4"]
-                    existing.member1_criteria1 = member1_comp["criteria1"]
-                    existing.member1_criteria2 = member1_comp["criteria2"]
-                    existing.member1_criteria3 = member1_comp["criteria3"]
-                    existing.member1_criteria4 = member1_comp["criteria4"]
-                    existing.member2_criteria1 = member2_comp["criteria1"]
-                    existing.member2_criteria2 = member2_comp["criteria2"]
-                    existing.member2_criteria3 = member2_comp["criteria3"]
-                    existing.member2_criteria4 = member2_comp["criteria4"]
-                    existing.guide_criteria1 = guide_comp["criteria1"]
-                    existing.guide_criteria2 = guide_comp["criteria2"]
-                    existing.guide_criteria3 = guide_comp["criteria3"]
-                    existing.guide_criteria4 = guide_comp["criteria4"]
-                else:
-                    evaluation = Evaluation(
-                        phase=phase,
-                        review_no=review_no,
-                        total_marks=total,
-                        criteria1=comp["criteria1"],
-                        criteria2=comp["criteria2"],
-                        criteria3=comp["criteria3"],
-                        criteria4=comp["criteria4"],
-                        # Individual evaluator marks
-                        member1_criteria1=member1_comp["criteria1"],
-                        member1_criteria2=member1_comp["criteria2"],
-                        member1_criteria3=member1_comp["criteria3"],
-                        member1_criteria4=member1_comp["criteria4"],
-                        member2_criteria1=member2_comp["criteria1"],
-                        member2_criteria2=member2_comp["criteria2"],
-                        member2_criteria3=member2_comp["criteria3"],
-                        member2_criteria4=member2_comp["criteria4"],
-                        guide_criteria1=guide_comp["criteria1"],
-                        guide_criteria2=guide_comp["criteria2"],
-                        guide_criteria3=guide_comp["criteria3"],
-                        guide_criteria4=guide_comp["criteria4"],
-                        student=student,
-                    )
-                    db.session.add(evaluation)
-                    created += 1
-
-            db.session.commit()
-
-            # TODO: Update CSV export for new criteria-based system (temporarily disabled)
-
-            if created > 0:
-                flash(f"Imported {created} evaluation record(s) for Phase {phase} Review {review_no}.", "success")
-            return redirect(url_for("list_students", phase=phase, review=review_no))
-
-        return render_template("upload.html")
+            if all_sheets:
+                phase = review_no = None
+
+            # Spool the upload to disk, hashing the bytes on the way through
+            hasher = upload_hasher(phase, review_no)
+            upload_path = spool_upload(file.stream, hasher)
+            content_hash = hasher.hexdigest()
+
+            # Identical re-upload of the latest import: skip parsing entirely
+            previous = find_previous_import(content_hash, phase, review_no)
+            if previous:
+                os.remove(upload_path)
+                flash(f"This file was already imported on {previous.imported_at.strftime('%d/%m/%Y %H:%M')} "
+                      f"({previous.rows_written} row(s) written); nothing to do.", "success")
+                if phase is None:
+                    return redirect(url_for("list_students"))
+                return redirect(url_for("list_students", phase=phase, review=review_no))
+
+            # Import it on the worker pool
+            job = submit_import(app, upload_path, phase, review_no, content_hash, file.filename)
+            return redirect(url_for("upload_csv", job=job.id))
+
+        job = get_job(request.args.get("job", ""))
+        return render_template("upload.html", job=job.to_dict() if job else None)
+
+    @app.route("/upload/jobs/<job_id>")
+    def import_job_status(job_id: str):
+        job = get_job(job_id)
+        if not job:
+            return jsonify({"error": "Unknown import job"}), 404
+        status = job.to_dict()
+        if job.phase is None:
+            status["students_url"] = url_for("list_students")
+        else:
+            status["students_url"] = url_for("list_students", phase=job.phase, review=job.review)
+        status["errors_url"] = url_for("import_errors", import_id=job.id)
+        return jsonify(status)
+
+    @app.route("/upload/errors/<import_id>")
+    def import_errors(import_id: str):
+        page = request.args.get("page", 1, type=int)
+        errors = db.paginate(
+            sqlalchemy.select(ImportErrorRow).where(ImportErrorRow.import_id == import_id).order_by(ImportErrorRow.id),
+            page=page, per_page=ERRORS_PER_PAGE, error_out=False,
+        )
+        return render_template("import_errors.html", import_id=import_id, errors=errors)
+
+    @app.route("/upload/rollback", methods=["POST"])
+    def rollback_import():
+        phase = request.form.get("phase", 1, type=int)
+        review = request.form.get("review", 1, type=int)
+        restored = rollback_batch(phase, review)
+        if restored is None:
+            flash(f"No earlier import of Phase {phase} Review {review} to restore.", "error")
+            return redirect(url_for("upload_csv"))
+        record_rollback(phase, review, restored)
+        flash(f"Restored the previous import of Phase {phase} Review {review}.", "success")
+        return redirect(url_for("list_students", phase=phase, review=review))
 
     @app.route("/students")
+    @conditional_on_data(remembers_review=True)
     def list_students():
         # Get phase and review from query params, default to session then Phase 1 Review 1
         phase = request.args.get("phase", session.get("current_phase", 1), type=int)
@@ -257,72 +338,56 @@ def create_app() -> Flask:
         # Get review configuration
         config = get_review_config(phase, review)
         
-        students = Student.query.order_by(Student.group_no, Student.name).all()
-        # Filter evaluations by phase and review
-        data = []
-        for s in students:
-            ev = Evaluation.query.filter_by(student_id=s.id, phase=phase, review_no=review).first()
-            if ev:
-                data.append((s, ev))
-        return render_template("students.html", items=data, phase=phase, review=review, config=config)
+        # First page only; later pages are fetched from student_rows as the table scrolls
+        page = student_page("list", phase, review)
+        return render_template("students.html", phase=phase, review=review, config=config, **page)
     
     @app.route("/students/groupwise")
+    @conditional_on_data(remembers_review=True)
     def students_groupwise():
         # Session-persistent phase and review
         phase = request.args.get("phase", session.get("current_phase", 1), type=int)
         review = request.args.get("review", session.get("current_review", 1), type=int)
         session["current_phase"] = phase
         session["current_review"] = review
+
+        cached = cached_result()
+        if cached is not None:
+            return cached
         
         # Get review configuration
         config = get_review_config(phase, review)
         
-        # Get all students with their evaluations, grouped by group_no
-        students = Student.query.order_by(Student.group_no, Student.name).all()
-        
-        # Group students by group_no
-        groups = {}
-        for student in students:
-            group_no = student.group_no or "No Group"
-            
-            # Get evaluation for specific phase and review
-            ev = Evaluation.query.filter_by(student=student, phase=phase, review_no=review).first()
-            if ev:
-                if group_no not in groups:
-                    groups[group_no] = []
-                groups[group_no].append((student, ev))
+        # Sections per group_no, with statistics aggregated in SQL
+        groups = grouped_evaluations(phase, review, by="group")
         
-        return render_template("students_groupwise.html", groups=groups, phase=phase, review=review, config=config)
+        html = render_template("students_groupwise.html", groups=groups, phase=phase, review=review, config=config)
+        return cache_result(html.encode("utf-8"))
     
     @app.route("/students/guidewise")
+    @conditional_on_data(remembers_review=True)
     def students_guidewise():
         # Session-persistent phase and review
         phase = request.args.get("phase", session.get("current_phase", 1), type=int)
         review = request.args.get("review", session.get("current_review", 1), type=int)
         session["current_phase"] = phase
         session["current_review"] = review
+
+        cached = cached_result()
+        if cached is not None:
+            return cached
         
         # Get review configuration
         config = get_review_config(phase, review)
         
-        # Get all students with their evaluations, grouped by guide
-        students = Student.query.order_by(Student.name).all()
+        # Sections per project guide, with statistics aggregated in SQL
+        guides = grouped_evaluations(phase, review, by="guide")
         
-        # Group students by their actual project guide from database
-        guides = {}
-        
-        for student in students:
-            ev = Evaluation.query.filter_by(student=student, phase=phase, review_no=review).first()
-            if ev and student.project_guide:
-                guide_name = student.project_guide.strip()
-                
-                if guide_name not in guides:
-                    guides[guide_name] = []
-                guides[guide_name].append((student, ev))
-        
-        return render_template("students_guidewise.html", guides=guides, phase=phase, review=review, config=config)
+        html = render_template("students_guidewise.html", guides=guides, phase=phase, review=review, config=config)
+        return cache_result(html.encode("utf-8"))
     
     @app.route("/students/individual")
+    @conditional_on_data(remembers_review=True)
     def students_individual():
         # Session-persistent phase and review
         phase = request.args.get("phase", session.get("current_phase", 1), type=int)
@@ -333,28 +398,34 @@ def create_app() -> Flask:
         # Get review configuration
         config = get_review_config(phase, review)
         
-        # Enhanced individual view with more details
-        students = Student.query.order_by(Student.name).all()
-        data = []
-        for s in students:
-            ev = Evaluation.query.filter_by(student=s, phase=phase, review_no=review).first()
-            if ev:
-                # Add more detailed individual data
-                individual_data = {
-                    'student': s,
-                    'evaluation': ev,
-                    'member1_total': (ev.member1_criteria1 or 0) + (ev.member1_criteria2 or 0) + 
-                                   (ev.member1_criteria3 or 0) + (ev.member1_criteria4 or 0),
-                    'member2_total': (ev.member2_criteria1 or 0) + (ev.member2_criteria2 or 0) + 
-                                   (ev.member2_criteria3 or 0) + (ev.member2_criteria4 or 0),
-                    'guide_total': (ev.guide_criteria1 or 0) + (ev.guide_criteria2 or 0) + 
-                                  (ev.guide_criteria3 or 0) + (ev.guide_criteria4 or 0),
-                }
-                data.append(individual_data)
-        
-        return render_template("students_individual.html", students_data=data, phase=phase, review=review, config=config)
+        # Enhanced individual view with more details, one page at a time
+        page = student_page("individual", phase, review)
+        
+        return render_template("students_individual.html", phase=phase, review=review, config=config,
+                               stats=review_stats(phase, review), **page)
+
+    @app.route("/students/rows")
+    @conditional_on_data()
+    def student_rows():
+        # JSON chunk of table rows for the scroll loader on the paginated student views
+        view = request.args.get("view", "list")
+        if view not in ROW_TEMPLATES:
+            return jsonify({"error": "Unknown view"}), 400
+        phase = request.args.get("phase", 1, type=int)
+        review = request.args.get("review", 1, type=int)
+        page = student_page(view, phase, review)
+        html = render_template(ROW_TEMPLATES[view], phase=phase, review=review,
+                               config=get_review_config(phase, review), **page)
+        return jsonify({"html": html, "count": page["count"], "next": page["next_cursor"]})
+
+    def student_page(view: str, phase: int, review: int):
+        """Template context for one keyset page of a student table (cursor in ?after=)"""
+        rows, next_cursor = student_evaluations_page(phase, review, after=request.args.get("after"))
+        return dict(items=rows, view=view, start=request.args.get("start", 0, type=int),
+                    count=len(rows), next_cursor=next_cursor)
 
     @app.route("/students/<int:student_id>")
+    @conditional_on_data(remembers_review=True)
     def student_detail(student_id: int):
         # Session-persistent phase and review
         phase = request.args.get("phase", session.get("current_phase", 1), type=int)
@@ -364,7 +435,7 @@ def create_app() -> Flask:
         
         student = Student.query.get_or_404(student_id)
         # Get evaluation for specific phase and review
-        ev = Evaluation.query.filter_by(student=student, phase=phase, review_no=review).first()
+        ev = student_evaluation(student.id, phase, review)
         
         if not ev:
             flash(f"No evaluation found for Phase {phase} Review {review}", "error")
@@ -376,6 +447,7 @@ def create_app() -> Flask:
         return render_template("student_detail.html", student=student, ev=ev, phase=phase, review=review, config=config)
 
     @app.route("/students/<int:student_id>/download")
+    @conditional_on_data(remembers_review=True)
     def download_review1(student_id: int):
         # Session-persistent phase and review
         phase = request.args.get("phase", session.get("current_phase", 1), type=int)
@@ -385,24 +457,45 @@ def create_app() -> Flask:
         
         student = Student.query.get_or_404(student_id)
         # Get evaluation for specific phase and review
-        ev = Evaluation.query.filter_by(student=student, phase=phase, review_no=review).first()
+        ev = student_evaluation(student.id, phase, review)
         
         if not ev:
             flash(f"No evaluation found for Phase {phase} Review {review}", "error")
             return redirect(url_for("list_students", phase=phase, review=review))
         
         pdf_buffer = build_review1_pdf(student, ev, phase, review)
-        filename = f"Phase{phase}_Review{review}_{student.seat_no}_{student.name.replace(' ', '_')}.pdf"
+        filename = sheet_filename(student, phase, review)
         return send_file(pdf_buffer, as_attachment=True, download_name=filename, mimetype="application/pdf")
 
+    @app.route("/students/review-sheets.zip")
+    @conditional_on_data()
+    def download_review_sheets():
+        # Every student's review sheet, or one group (?group=, empty for "No Group") or guide (?guide=)
+        phase = request.args.get("phase", session.get("current_phase", 1), type=int)
+        review = request.args.get("review", session.get("current_review", 1), type=int)
+        group = request.args.get("group")
+        guide = request.args.get("guide")
+
+        payloads = [sheet_payload(student, ev, phase, review)
+                    for student, ev in iter_student_evaluations(phase, review, group=group, guide=guide)]
+        if not payloads:
+            flash(f"No evaluations found for Phase {phase} Review {review}", "error")
+            return redirect(url_for("list_students", phase=phase, review=review))
+
+        # Sheets render in worker processes and are zipped as each one finishes
+        subset = f"_Group_{group or 'None'}" if group is not None else f"_{guide.replace(' ', '_')}" if guide else ""
+        filename = f"Review_Sheets_Phase{phase}_Review{review}{subset}.zip"
+        return stream_download(stream_review_sheets(payloads), filename, "application/zip")
+
     @app.route("/students/<int:student_id>/csv")
+    @conditional_on_data()
     def download_review1_csv(student_id: int):
         # Get phase/review from query params or session
         phase = request.args.get("phase", session.get("current_phase", 1), type=int)
         review = request.args.get("review", session.get("current_review", 1), type=int)
         
         student = Student.query.get_or_404(student_id)
-        ev = Evaluation.query.filter_by(student_id=student.id, phase=phase, review_no=review).first()
+        ev = student_evaluation(student.id, phase, review)
         if not ev:
             flash(f"No evaluation found for Phase {phase} Review {review}", "error")
             return redirect(url_for("student_detail", student_id=student.id, phase=phase, review=review))
@@ -412,134 +505,97 @@ def create_app() -> Flask:
         labels = [c['name'] for c in config['criteria']]
         max_marks = [c['max_marks'] for c in config['criteria']]
 
-        # Prepare per-student CSV with component rows and averages
-        bio = io.StringIO()
-        writer = csv.writer(bio)
-        writer.writerow(["Seat No", student.seat_no])
-        writer.writerow(["Name", student.name])
-        writer.writerow(["Group No", student.group_no or "-"])
-        writer.writerow(["Project Title", student.project_title or "-"])
-        writer.writerow(["Phase", phase])
-        writer.writerow(["Review", review])
-        writer.writerow([])
-        writer.writerow(["Component", "Member 1", "Member 2", "Internal Guide", "Average"]) 
-
-        rows = []
-        for i in range(1, 5):
-            lbl = f"{labels[i-1]} ({max_marks[i-1]})"
-            m1 = getattr(ev, f"member1_criteria{i}", 0) or 0
-            m2 = getattr(ev, f"member2_criteria{i}", 0) or 0
-            g = getattr(ev, f"guide_criteria{i}", 0) or 0
-            rows.append((lbl, m1, m2, g))
-
-        member1_total = 0
-        member2_total = 0
-        guide_total = 0
-        avg_total = 0
-        for label, m1, m2, g in rows:
-            avg = int(round((int(m1) + int(m2) + int(g)) / 3))
-            writer.writerow([label, m1, m2, g, avg])
-            member1_total += int(m1)
-            member2_total += int(m2)
-            guide_total += int(g)
-            avg_total += avg
-
-        writer.writerow([])
-        writer.writerow(["Total (50)", member1_total, member2_total, guide_total, avg_total])
-
-        bio.seek(0)
+        # Per-student CSV with component rows and averages; stored scores only, see utils.score_evaluation
+        def rows():
+            yield ["Seat No", student.seat_no]
+            yield ["Name", student.name]
+            yield ["Group No", student.group_no or "-"]
+            yield ["Project Title", student.project_title or "-"]
+            yield ["Phase", phase]
+            yield ["Review", review]
+            yield []
+            yield ["Component", "Member 1", "Member 2", "Internal Guide", "Average"]
+            for i in range(1, 5):
+                lbl = f"{labels[i-1]} ({max_marks[i-1]})"
+                m1 = getattr(ev, f"member1_criteria{i}", 0) or 0
+                m2 = getattr(ev, f"member2_criteria{i}", 0) or 0
+                g = getattr(ev, f"guide_criteria{i}", 0) or 0
+                yield [lbl, m1, m2, g, getattr(ev, f"criteria{i}")]
+            yield []
+            yield ["Total (50)", ev.member1_total, ev.member2_total, ev.guide_total, ev.total_marks]
+
         filename = f"Phase{phase}_Review{review}_{student.seat_no}_{student.name.replace(' ', '_')}.csv"
-        return send_file(io.BytesIO(bio.getvalue().encode("utf-8")), as_attachment=True, download_name=filename, mimetype="text/csv")
+        return stream_download(csv_chunks(rows()), filename, "text/csv")
 
     @app.route("/export.csv")
+    @conditional_on_data()
     def download_export_csv():
         # Get phase/review from session or params
         phase = request.args.get("phase", session.get("current_phase", 1), type=int)
         review = request.args.get("review", session.get("current_review", 1), type=int)
+        filename = f"Evaluations_Phase{phase}_Review{review}.csv"
+
+        cached = cached_result()
+        if cached is not None:
+            return send_file(io.BytesIO(cached), as_attachment=True, download_name=filename, mimetype="text/csv")
         
         # Get dynamic configuration
         config = get_review_config(phase, review)
         labels = [c['name'] for c in config['criteria']]
-        
-        bio = io.StringIO()
-        writer = csv.writer(bio)
-        
-        # Headers
-        header_row = [
-            "group_no", "project_title", "seat_no", "name", "phase", "review_no"
-        ]
-        # Add evaluator-specific headers
-        for evaluator in ["member1", "member2", "guide"]:
-            for lbl in labels:
-                header_row.append(f"{evaluator}_{lbl.lower().replace(' ', '_')}")
-            header_row.append(f"{evaluator}_total")
-        
-        # Add average headers
-        for lbl in labels:
-            header_row.append(f"avg_{lbl.lower().replace(' ', '_')}")
-        header_row.append("avg_total_marks")
-        
-        writer.writerow(header_row)
 
-        students = Student.query.order_by(Student.group_no, Student.name).all()
-        for s in students:
-            ev = Evaluation.query.filter_by(student_id=s.id, phase=phase, review_no=review).first()
-            if not ev:
-                continue
-            
-            row = [
-                s.group_no or "",
-                s.project_title or "",
-                s.seat_no,
-                s.name,
-                phase,
-                review
+        def rows():
+            # Headers
+            header_row = [
+                "group_no", "project_title", "seat_no", "name", "phase", "review_no"
             ]
+            # Add evaluator-specific headers
+            for evaluator in ["member1", "member2", "guide"]:
+                for lbl in labels:
+                    header_row.append(f"{evaluator}_{lbl.lower().replace(' ', '_')}")
+                header_row.append(f"{evaluator}_total")
             
-            ev_data = {}
-            # Evaluate totals for each member
-            totals = {"member1": 0, "member2": 0, "guide": 0}
-            avgs = {}
+            # Add average headers
+            for lbl in labels:
+                header_row.append(f"avg_{lbl.lower().replace(' ', '_')}")
+            header_row.append("avg_total_marks")
             
-            for i in range(1, 5):
-                m1 = getattr(ev, f"member1_criteria{i}", 0) or 0
-                m2 = getattr(ev, f"member2_criteria{i}", 0) or 0
-                g = getattr(ev, f"guide_criteria{i}", 0) or 0
-                
-                ev_data[f"member1_{i}"] = m1
-                ev_data[f"member2_{i}"] = m2
-                ev_data[f"guide_{i}"] = g
+            yield header_row
+
+            # Rows come off a server-side cursor, a batch at a time
+            for s, ev in iter_student_evaluations(phase, review, order="group"):
+                row = [
+                    s.group_no or "",
+                    s.project_title or "",
+                    s.seat_no,
+                    s.name,
+                    phase,
+                    review
+                ]
                 
-                totals["member1"] += m1
-                totals["member2"] += m2
-                totals["guide"] += g
+                # Member marks and stored totals
+                for evaluator in ["member1", "member2", "guide"]:
+                    for i in range(1, 5):
+                        row.append(getattr(ev, f"{evaluator}_criteria{i}", 0) or 0)
+                    row.append(getattr(ev, f"{evaluator}_total"))
                 
-                avgs[i] = int(round((m1 + m2 + g) / 3))
-
-            # Add member marks to row
-            for evaluator in ["member1", "member2", "guide"]:
+                # Stored averages (utils.score_evaluation)
                 for i in range(1, 5):
-                    row.append(ev_data[f"{evaluator}_{i}"])
-                row.append(totals[evaluator])
-            
-            # Add averages
-            avg_sum = 0
-            for i in range(1, 5):
-                row.append(avgs[i])
-                avg_sum += avgs[i]
-            row.append(ev.total_marks)
-            
-            writer.writerow(row)
+                    row.append(getattr(ev, f"criteria{i}"))
+                row.append(ev.total_marks)
+                
+                yield row
 
-        bio.seek(0)
-        filename = f"Evaluations_Phase{phase}_Review{review}.csv"
-        return send_file(io.BytesIO(bio.getvalue().encode("utf-8")), as_attachment=True, download_name=filename, mimetype="text/csv")
+        return stream_download(cache_chunks(csv_chunks(rows())), filename, "text/csv")
     
     @app.route("/summary.pdf")
+    @conditional_on_data(all_reviews=True, daily=True)
     def download_summary_pdf():
+        filename = f"CIE_Comprehensive_Report_All_Reviews_{date.today().strftime('%Y%m%d')}.pdf"
+        cached = cached_result()
+        if cached is not None:
+            return send_file(io.BytesIO(cached), as_attachment=True, download_name=filename, mimetype="application/pdf")
+
         # Collect all evaluations grouped by phase and review
-        students = Student.query.order_by(Student.name).all()
-        
         # Structure: {(phase, review): {'guides': {...}, 'groups': {...}}}
         all_data = {}
         
@@ -550,22 +606,19 @@ def create_app() -> Flask:
             guides = {}
             groups = {}
             
-            for student in students:
-                ev = next((e for e in student.evaluations if e.phase == phase and e.review_no == review), None)
-                
+            for student, ev in student_evaluations(phase, review, order="name"):
                 # Add to guides
-                if ev and student.project_guide:
+                if student.project_guide:
                     guide_name = student.project_guide.strip()
                     if guide_name not in guides:
                         guides[guide_name] = []
                     guides[guide_name].append((student, ev))
                 
                 # Add to groups
-                if ev:
-                    group_no = student.group_no or "No Group"
-                    if group_no not in groups:
-                        groups[group_no] = []
-                    groups[group_no].append((student, ev))
+                group_no = student.group_no or "No Group"
+                if group_no not in groups:
+                    groups[group_no] = []
+                groups[group_no].append((student, ev))
             
             # Only include if there's data
             if guides or groups:
@@ -575,9 +628,8 @@ def create_app() -> Flask:
             flash("No evaluation data found to generate summary.", "error")
             return redirect(url_for("list_students"))
         
-        pdf_buffer = build_comprehensive_pdf(all_data)
-        filename = f"CIE_Comprehensive_Report_All_Reviews_{date.today().strftime('%Y%m%d')}.pdf"
-        return send_file(pdf_buffer, as_attachment=True, download_name=filename, mimetype="application/pdf")
+        pdf = cache_result(build_comprehensive_pdf(all_data).getvalue())
+        return send_file(io.BytesIO(pdf), as_attachment=True, download_name=filename, mimetype="application/pdf")
 
     return app
 
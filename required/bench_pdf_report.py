@@ -0,0 +1,50 @@
+"""
+Benchmark the comprehensive PDF report on a large synthetic cohort
+Reports build time and peak Python allocations (tracemalloc) for ROWS students in one review
+"""
+
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from types import SimpleNamespace
+from comprehensive_pdf_template import build_comprehensive_pdf
+
+ROWS = 5000
+
+
+def make_report_data(rows: int):
+    groups = defaultdict(list)
+    for i in range(rows):
+        student = SimpleNamespace(
+            name=f"Student Number {i}",
+            seat_no=f"3GN21CS{i:04d}",
+            group_no=f"G{i // 4 + 1}",
+            project_guide=f"Dr. Guide {i // 20 + 1}",
+        )
+        marks = [10 + i % 10, 5 + i % 5, 5 + i % 5, 4 + i % 6]
+        ev = SimpleNamespace(total_marks=sum(marks), **{f"criteria{n}": m for n, m in enumerate(marks, 1)})
+        groups[student.group_no].append((student, ev))
+    return {(1, 1): {"guides": {}, "groups": dict(groups)}}
+
+
+def run_benchmark(rows: int = ROWS):
+    data = make_report_data(rows)
+    build_comprehensive_pdf(make_report_data(10))  # imports and font setup
+
+    start = time.perf_counter()
+    size = len(build_comprehensive_pdf(data).getvalue())
+    duration = time.perf_counter() - start
+
+    tracemalloc.start()
+    build_comprehensive_pdf(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"--- Comprehensive report: {rows} rows ---")
+    print(f"Build time: {duration:.2f} s ({size / 1024:.0f} KiB PDF)")
+    print(f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS)
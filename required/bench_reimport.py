@@ -0,0 +1,58 @@
+"""
+Benchmark a one-mark re-import against a full import on a scratch SQLite database
+Shows what the staging copy of the published batch costs at class and department sizes
+"""
+
+import os
+import sys
+import tempfile
+import time
+from openpyxl import Workbook
+from app import create_app
+from models import db
+from import_batches import active_batch_id, stage_batch
+from import_engine import import_workbook
+
+SIZES = (200, 2000, 20000)
+
+
+def write_workbook(path: str, rows: int, corrected: int = 0) -> None:
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["Name", "Seat No", "Group No", "Project Guide", "Member 1", "Member 2", "Internal Guide"])
+    for i in range(rows):
+        member1 = 45 if i < corrected else 40
+        ws.append([f"Student {i}", f"3GN21CS{i:05d}", f"G{i // 4 + 1}", f"Dr. Guide {i // 20 + 1}", member1, 42, 44])
+    wb.save(path)
+
+
+def timed(action):
+    start = time.perf_counter()
+    result = action()
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(rows: int):
+    tmp_dir = tempfile.mkdtemp()
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"})
+    full_path, one_mark_path = os.path.join(tmp_dir, "full.xlsx"), os.path.join(tmp_dir, "one_mark.xlsx")
+    write_workbook(full_path, rows)
+    write_workbook(one_mark_path, rows, corrected=1)
+
+    with app.app_context():
+        _, full = timed(lambda: import_workbook(full_path, 1, 1))
+        (summary, _), one_mark = timed(lambda: import_workbook(one_mark_path, 1, 1))
+        assert summary["updated"] == 1, summary
+        # The copy on its own, rolled back so the database is left as it was
+        _, copy = timed(lambda: stage_batch(1, 1, active_batch_id(1, 1)))
+        db.session.rollback()
+
+    print(f"--- Re-import: {rows} rows ---")
+    print(f"Full import:        {full:.3f} s")
+    print(f"One mark corrected: {one_mark:.3f} s")
+    print(f"  of which staging copy of the published batch: {copy:.3f} s")
+
+
+if __name__ == "__main__":
+    for size in ([int(sys.argv[1])] if len(sys.argv) > 1 else SIZES):
+        run_benchmark(size)
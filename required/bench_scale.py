@@ -10,6 +10,7 @@ sys.path.append(os.path.join(os.getcwd(), 'required'))
 
 from app import create_app
 from models import db, Student, Evaluation
+from repository import student_evaluations
 
 def run_benchmark():
     app = create_app()
@@ -84,16 +85,11 @@ def run_benchmark():
         print(f"Rate: {200/write_duration:.2f} students/second")
         
         # 4. Simulate Read Performance (List View)
-        print("\nBenchmarking Read Performance (N+1 Query Pattern)...")
+        print("\nBenchmarking Read Performance (joined list query)...")
         start_time = time.time()
         
-        students = Student.query.order_by(Student.group_no, Student.name).all()
-        count = 0
-        for s in students:
-            # Simulate the lookups done in list_students()
-            ev = Evaluation.query.filter_by(student=s, phase=PHASE, review_no=REVIEW).first()
-            if ev:
-                count += 1
+        # The single joined query used by list_students()
+        count = len(student_evaluations(PHASE, REVIEW, order="group"))
                 
         end_time = time.time()
         read_duration = end_time - start_time
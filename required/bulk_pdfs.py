@@ -0,0 +1,102 @@
+"""
+Bulk Review Sheets
+Render many students' review PDFs across worker processes and stream them as one ZIP
+"""
+
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Sheets queued per worker; bounds memory while keeping every worker busy
+IN_FLIGHT_PER_WORKER = 4
+
+# Below this many sheets, starting worker processes costs more than it saves
+MIN_PARALLEL_SHEETS = 8
+
+
+def sheet_filename(student, phase: int, review: int) -> str:
+    """Same name as the single-sheet download"""
+    return f"Phase{phase}_Review{review}_{student.seat_no}_{student.name.replace(' ', '_')}.pdf"
+
+
+def sheet_payload(student, ev, phase: int, review: int) -> Tuple[Dict, Dict, int, int]:
+    """Plain column values of a (student, evaluation) pair, cheap to send to a worker process"""
+    return (
+        {c.key: getattr(student, c.key) for c in student.__table__.columns},
+        {c.key: getattr(ev, c.key) for c in ev.__table__.columns},
+        phase,
+        review,
+    )
+
+
+def render_sheet(payload: Tuple[Dict, Dict, int, int]) -> Tuple[str, bytes]:
+    """Worker entry point: one review sheet as (filename, pdf bytes), drawn over the cached form"""
+    from renderers import build_review1_pdf_fast
+    student_fields, ev_fields, phase, review = payload
+    student, ev = SimpleNamespace(**student_fields), SimpleNamespace(**ev_fields)
+    return sheet_filename(student, phase, review), build_review1_pdf_fast(student, ev).getvalue()
+
+
+class _ZipStream:
+    """Write-only file object whose contents are collected and handed out by drain()"""
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _rendered(payloads: Iterable, workers: int) -> Iterator[Tuple[str, bytes]]:
+    """Sheets in completion order, a bounded number queued at any time"""
+    payloads = iter(payloads)
+    if workers <= 1:
+        yield from map(render_sheet, payloads)
+        return
+    # spawn, not fork: downloads run on a threaded server
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        pending = set()
+        for payload in payloads:
+            pending.add(pool.submit(render_sheet, payload))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        # An abandoned download stops the remaining work
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def stream_review_sheets(payloads: List, workers: Optional[int] = None) -> Iterator[bytes]:
+    """
+    ZIP archive of rendered review sheets, yielded piece by piece as each PDF finishes.
+    payloads come from sheet_payload; workers defaults to one process per core.
+    """
+    if workers is None:
+        workers = min(len(payloads), os.cpu_count() or 1) if len(payloads) >= MIN_PARALLEL_SHEETS else 1
+    sink = _ZipStream()
+    # PDF content streams are already compressed
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+        date_time = datetime.now().timetuple()[:6]
+        for filename, pdf in _rendered(payloads, workers):
+            archive.writestr(zipfile.ZipInfo(filename, date_time=date_time), pdf)
+            yield sink.drain()
+    yield sink.drain()
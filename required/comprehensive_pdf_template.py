@@ -1,24 +1,17 @@
 #!/usr/bin/env python3
 
 import io
-import os
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.units import inch, mm
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from review_config import get_review_config, get_criteria_labels, get_max_marks
+from pdf_styles import paragraph_style, table_cell, column_style
+from pdf_assets import letterhead
 from datetime import date
 
-def get_college_logo():
-    """Get the college logo image"""
-    logo_path = os.path.join(os.path.dirname(__file__), 'college_logo.png')
-    if os.path.exists(logo_path):
-        return Image(logo_path, width=25*mm, height=25*mm)
-    else:
-        return Paragraph("<b>LOGO</b>", ParagraphStyle('Logo', fontSize=8, alignment=TA_CENTER))
-
 def build_comprehensive_pdf(all_data):
     """Build a comprehensive PDF report for all phases and reviews
     
@@ -39,15 +32,8 @@ def build_comprehensive_pdf(all_data):
     # Create professional styles
     styles = getSampleStyleSheet()
     
-    college_title_style = ParagraphStyle(
-        'CollegeTitle',
-        parent=styles['Normal'],
-        fontSize=13,
-        fontName='Helvetica-Bold',
-        alignment=TA_CENTER,
-        spaceAfter=4,
-        leading=16
-    )
+    college_title_style = paragraph_style(fontName='Helvetica-Bold', fontSize=13, alignment=TA_CENTER,
+                                          spaceAfter=4, leading=16)
     
     title_style = ParagraphStyle(
         'Title',
@@ -82,23 +68,9 @@ def build_comprehensive_pdf(all_data):
     
     story = []
     
-    # Header with logo and college info
-    header_data = [[
-        get_college_logo(),
-        Paragraph("<b>GURU NANAK DEV ENGINEERING COLLEGE, BIDAR 585403</b><br/>"
-                 "<font size=9>Affiliated to VTU Belagavi & Approved by AICTE New Delhi</font><br/>"
-                 "<font size=10><b>Department of Computer Science Engineering</b></font>", college_title_style)
-    ]]
-    
-    header_table = Table(header_data, colWidths=[30*mm, 150*mm])
-    header_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-        ('ALIGN', (1, 0), (1, 0), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 0),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-    ]))
-    story.append(header_table)
+    # Header with logo and college info, drawn once and repeated as a form
+    header = letterhead(college_title_style)
+    story.append(header)
     story.append(Spacer(1, 8))
     
     # Academic info
@@ -136,7 +108,7 @@ def build_comprehensive_pdf(all_data):
         if idx > 0:
             story.append(PageBreak())
             # Add header again for new page
-            story.append(header_table)
+            story.append(header)
             story.append(Spacer(1, 8))
         
         # Phase and review header
@@ -155,8 +127,8 @@ def build_comprehensive_pdf(all_data):
         
         # Create simple summary table with better formatting - prevent word breaking in headers
         # Increased leading to prevent text collision
-        header_style_sm = ParagraphStyle('header_sm', fontSize=7, alignment=TA_CENTER, leading=9, wordWrap='LTR', splitLongWords=0)
-        header_style_criteria = ParagraphStyle('header_crit', fontSize=6.5, alignment=TA_CENTER, leading=8, wordWrap='LTR', splitLongWords=0)
+        header_style_sm = paragraph_style(fontSize=7, alignment=TA_CENTER, leading=9, wordWrap='LTR', splitLongWords=0)
+        header_style_criteria = paragraph_style(fontSize=6.5, alignment=TA_CENTER, leading=8, wordWrap='LTR', splitLongWords=0)
         
         table_data = [[
             Paragraph("<b>Sl.<br/>No.</b>", header_style_sm),  # Two lines to prevent collision
@@ -197,6 +169,20 @@ def build_comprehensive_pdf(all_data):
         
         table_data[0].append(Paragraph("<b>Total<br/>(50)</b>", header_style_sm))
         
+        # Column styles are shared; cells are plain strings unless they need to wrap
+        col_widths = [11*mm, 14*mm, 22*mm, 35*mm, 29*mm] + [18*mm] * len(criteria) + [14*mm]
+        number_style = paragraph_style(fontSize=9, alignment=TA_CENTER)
+        seat_style = paragraph_style(fontSize=7, alignment=TA_CENTER, leading=9, wordWrap='CJK')
+        name_style = paragraph_style(fontSize=9, alignment=TA_LEFT)
+        guide_style = paragraph_style(fontSize=8, alignment=TA_LEFT, leading=10)
+        mark_style = paragraph_style(fontName='Helvetica-Bold', fontSize=10, alignment=TA_CENTER)
+        total_style = paragraph_style(fontName='Helvetica-Bold', fontSize=11, alignment=TA_CENTER,
+                                      textColor=colors.HexColor('#006400'))
+        cell_styles = [number_style, number_style, seat_style, name_style, guide_style] + \
+            [mark_style] * len(criteria) + [total_style]
+        # Text width of each column inside the 2pt left and right padding
+        text_widths = [width - 4 for width in col_widths]
+        
         # Add student data with proper formatting
         for idx, (student, ev) in enumerate(sorted(all_students, key=lambda x: (x[0].group_no or '', x[0].name)), 1):
             # Format student name to fit
@@ -210,26 +196,23 @@ def build_comprehensive_pdf(all_data):
                 guide_name = guide_name[:22] + "..."
             
             row = [
-                Paragraph(str(idx), ParagraphStyle('center', fontSize=9, alignment=TA_CENTER)),
-                Paragraph(str(student.group_no or '-'), ParagraphStyle('center', fontSize=9, alignment=TA_CENTER)),
-                Paragraph(f'<font size=7>{student.seat_no}</font>', ParagraphStyle('center', fontSize=7, alignment=TA_CENTER, leading=9, wordWrap='CJK')),
-                Paragraph(student_name, ParagraphStyle('left', fontSize=9, alignment=TA_LEFT)),
-                Paragraph(guide_name, ParagraphStyle('left', fontSize=8, alignment=TA_LEFT, leading=10))
+                str(idx),
+                table_cell(student.group_no or '-', number_style, text_widths[1]),
+                table_cell(student.seat_no, seat_style, text_widths[2]),
+                table_cell(student_name, name_style, text_widths[3]),
+                table_cell(guide_name, guide_style, text_widths[4])
             ]
-            # Add criteria marks with proper formatting
+            # Add criteria marks; bold comes from the column style
             for i in range(1, len(criteria) + 1):
-                mark = str(getattr(ev, f"criteria{i}", 0))
-                row.append(Paragraph(f"<b>{mark}</b>", ParagraphStyle('center', fontSize=10, alignment=TA_CENTER)))
+                row.append(str(getattr(ev, f"criteria{i}", 0)))
             # Add total with emphasis
-            row.append(Paragraph(f"<b>{ev.total_marks}</b>", ParagraphStyle('center', fontSize=11, alignment=TA_CENTER, textColor=colors.HexColor('#006400'))))
+            row.append(str(ev.total_marks))
             table_data.append(row)
         
-        # Create table with optimized column widths - wider columns for better spacing
-        col_widths = [11*mm, 14*mm, 22*mm, 35*mm, 29*mm] + [18*mm] * len(criteria) + [14*mm]
         summary_table = Table(table_data, colWidths=col_widths, repeatRows=1, rowHeights=None)
         
         # Apply enhanced styling with better visibility
-        summary_table.setStyle(TableStyle([
+        table_style = [
             # Header styling with gradient-like appearance
             ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e3a8a')),  # Deep blue
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
@@ -238,7 +221,7 @@ def build_comprehensive_pdf(all_data):
             ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
             ('VALIGN', (0, 0), (-1, 0), 'MIDDLE'),
             
-            # Data styling - no font specifications for Paragraph content
+            # Data styling
             ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
             ('VALIGN', (0, 1), (-1, -1), 'MIDDLE'),
             
@@ -254,18 +237,13 @@ def build_comprehensive_pdf(all_data):
             ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
             ('TOPPADDING', (0, 1), (-1, -1), 5),
             ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
-        ]))
-        
-        # Add alternating row colors with better contrast
-        for i in range(1, len(table_data)):
-            if i % 2 == 0:
-                summary_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, i), (-1, i), colors.HexColor('#f0f4f8'))
-                ]))
-            else:
-                summary_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, i), (-1, i), colors.white)
-                ]))
+            
+            # Alternating row colors with better contrast
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f4f8')]),
+        ]
+        for col, cell_style in enumerate(cell_styles):
+            table_style.extend(column_style(col, cell_style))
+        summary_table.setStyle(TableStyle(table_style))
         
         story.append(summary_table)
         story.append(Spacer(1, 20))
@@ -0,0 +1,78 @@
+"""
+Test Fixtures
+Scratch apps on pytest's tmp_path, plus the spreadsheet and upload helpers the test modules share
+"""
+
+import io
+import itertools
+import time
+import pytest
+from openpyxl import Workbook
+from app import create_app
+from models import db
+
+MARKS_HEADER = ("Name", "Seat No", "Group No", "Project Guide", "Member 1", "Member 2", "Internal Guide")
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """
+    Factory of apps, each on a new SQLite file under tmp_path; keyword config overrides
+    the defaults. Their engines are disposed afterwards so pytest can remove the files.
+    """
+    apps = []
+    numbers = itertools.count(1)
+
+    def make(**config):
+        path = tmp_path / f"test{next(numbers)}.db"
+        app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}", **config})
+        apps.append(app)
+        return app
+
+    yield make
+    for app in apps:
+        with app.app_context():
+            db.forget_engine(db.engine)
+
+
+def _make_xlsx(rows, header=MARKS_HEADER):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(list(header))
+    for r in rows:
+        ws.append(list(r))
+    buf = io.BytesIO()
+    wb.save(buf)
+    buf.seek(0)
+    return buf
+
+
+@pytest.fixture
+def make_xlsx():
+    """Builds an in-memory marks workbook: make_xlsx(rows, header=MARKS_HEADER)"""
+    return _make_xlsx
+
+
+def _upload(client, buf, phase=1, review=1, mode=None):
+    data = {
+        "phase": str(phase),
+        "review": str(review),
+        "file": (buf, "marks.xlsx"),
+    }
+    if mode:
+        data["mode"] = mode
+    response = client.post("/upload", data=data, content_type="multipart/form-data")
+    assert response.status_code == 302
+    job_id = response.headers["Location"].split("job=")[1]
+    for _ in range(200):
+        status = client.get(f"/upload/jobs/{job_id}").get_json()
+        if status["status"] in ("done", "failed"):
+            return status
+        time.sleep(0.05)
+    raise AssertionError("import job did not finish")
+
+
+@pytest.fixture
+def upload():
+    """Submits an upload and waits for its background job: upload(client, buf) -> final job status"""
+    return _upload
@@ -22,7 +22,7 @@ def create_simplified_view():
     cursor.execute("DROP VIEW IF EXISTS readable_marks")
     
     # Create View
-    # Combines Student Name with Phase, Review, and Total Marks
+    # Combines Student Name with Phase, Review, and Total Marks of the published batches only
     sql = """
     CREATE VIEW readable_marks AS
     SELECT 
@@ -36,6 +36,7 @@ def create_simplified_view():
         e.criteria3 AS Criteria_3,
         e.criteria4 AS Criteria_4
     FROM evaluation e
+    JOIN active_batch a ON a.phase = e.phase AND a.review_no = e.review_no AND a.batch_id = e.import_batch_id
     JOIN student s ON e.student_id = s.id
     ORDER BY s.name, e.phase, e.review_no;
     """
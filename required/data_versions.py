@@ -0,0 +1,64 @@
+"""
+Data Versions
+Per phase/review change counters behind ETag / Last-Modified on the read routes
+"""
+
+from datetime import datetime
+from itertools import chain
+from typing import Iterable, Optional, Tuple
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from models import db, Student, Evaluation, ActiveBatch, DataVersion
+from review_config import REVIEW_CRITERIA
+
+
+def _bump(session, scopes: Iterable[Tuple[int, int]]) -> None:
+    now = datetime.utcnow()
+    with session.no_autoflush:
+        for phase, review in scopes:
+            row = session.get(DataVersion, (phase, review))
+            if row is None:
+                session.add(DataVersion(phase=phase, review_no=review, version=1, updated_at=now))
+            else:
+                # Incremented in SQL so concurrent writers never produce the same version twice
+                row.version = DataVersion.version + 1
+                row.updated_at = now
+
+
+def bump_data_version(phase: Optional[int] = None, review: Optional[int] = None) -> None:
+    """
+    Mark a phase/review (or, without arguments, every review) as changed.
+    Committed with the caller's transaction. ORM changes to students, evaluations
+    and the published batch bump automatically; call this after bulk or raw SQL writes.
+    """
+    _bump(db.session, [(phase, review)] if phase is not None else list(REVIEW_CRITERIA))
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_on_orm_changes(session, flush_context, instances):
+    scopes = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        if isinstance(obj, Evaluation):
+            scopes.add((obj.phase, obj.review_no))
+        elif isinstance(obj, ActiveBatch):
+            scopes.add((obj.phase, obj.review_no))
+        elif isinstance(obj, Student):
+            # Student details appear in every review
+            scopes.update(REVIEW_CRITERIA)
+    if scopes:
+        _bump(session, sorted(scopes))
+
+
+def data_version(phase: Optional[int] = None, review: Optional[int] = None) -> Tuple[str, Optional[datetime]]:
+    """
+    Current version tag and last change time of one phase/review, or of all reviews combined
+    Returns: (tag, updated_at) where updated_at is None if nothing was ever imported
+    """
+    query = select(DataVersion.phase, DataVersion.review_no, DataVersion.version, DataVersion.updated_at)
+    if phase is not None:
+        query = query.where(DataVersion.phase == phase, DataVersion.review_no == review)
+    rows = db.session.execute(query.order_by(DataVersion.phase, DataVersion.review_no)).all()
+    tag = ".".join(f"p{p}r{r}v{v}" for p, r, v, _ in rows) or "v0"
+    return tag, max((updated_at for *_, updated_at in rows), default=None)
@@ -4,7 +4,8 @@ Fix evaluation data so students in the same group have similar marks
 """
 
 from app import create_app
-from models import db, Student, Evaluation
+from models import db, Student
+from import_batches import active_evaluations
 import random
 
 def fix_group_marks():
@@ -78,7 +79,7 @@ def fix_group_marks():
                     total = group_total
                     
                     # Update evaluation
-                    ev = Evaluation.query.filter_by(student=student, phase=phase, review_no=review).first()
+                    ev = active_evaluations(phase, review).filter_by(student_id=student.id).first()
                     if ev:
                         ev.total_marks = total
                         ev.criteria1 = avg_marks[0]
@@ -106,7 +107,7 @@ def fix_group_marks():
         for group_no, group_students in sorted(groups.items()):
             print(f"\n  Group {group_no}:")
             for student in group_students:
-                ev = Evaluation.query.filter_by(student=student, phase=1, review_no=1).first()
+                ev = active_evaluations(1, 1).filter_by(student_id=student.id).first()
                 if ev:
                     print(f"    {student.name}: {ev.total_marks}/50")
 
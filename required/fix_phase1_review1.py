@@ -6,7 +6,8 @@ Fix Phase 1 Review 1 data:
 """
 
 from app import create_app
-from models import db, Evaluation
+from models import db
+from import_batches import active_evaluations
 
 def fix_phase1_review1():
     app = create_app()
@@ -17,8 +18,8 @@ def fix_phase1_review1():
         print("\nSetting Member-1 and Member-2 marks to 0 for Criteria 1 & 2")
         print("(Only Guide provided marks for Literature Survey and Problem ID)\n")
         
-        # Get all Phase 1 Review 1 evaluations
-        evaluations = Evaluation.query.filter_by(phase=1, review_no=1).all()
+        # Get the published Phase 1 Review 1 evaluations
+        evaluations = active_evaluations(1, 1).all()
         
         if not evaluations:
             print("No Phase 1 Review 1 evaluations found!")
@@ -10,9 +10,10 @@ import openpyxl
 from pathlib import Path
 from app import create_app
 from models import db, Student, Evaluation
+from import_batches import active_batch_clause
 from utils import normalize_header
 from upload_helpers import map_excel_columns_to_criteria, get_criteria_key_map
-from sqlalchemy import text
+from sqlalchemy import delete
 
 # Config
 EXCEL_PATH = Path("required/Project_2018_Data_Ready.xlsx")
@@ -39,8 +40,8 @@ def import_sheet(app, ws, phase, review):
         elif h in ("qa", "question_and_answer_session"): key_map["question_and_answer_session"] = raw
 
     with app.app_context():
-        # Clear existing for this phase/review
-        db.session.execute(text(f"DELETE FROM evaluation WHERE phase = {phase} AND review_no = {review}"))
+        # Clear the published evaluations of this phase/review; new rows land in the same batch
+        db.session.execute(delete(Evaluation).where(active_batch_clause(phase, review)))
         db.session.commit()
         
         created = 0
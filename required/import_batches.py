@@ -0,0 +1,141 @@
+"""
+Import Batches
+Imports are staged into a new batch of evaluation rows and published by
+flipping the active_batch pointer, so readers never see a half-written review.
+"""
+
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy import select, insert, update, delete
+from models import db, Evaluation, ImportBatch, ActiveBatch
+from review_config import REVIEW_CRITERIA
+
+# Columns copied from the active batch when staging a new one
+_COPY_COLUMNS = [c.name for c in Evaluation.__table__.columns if c.name not in ("id", "import_batch_id")]
+
+
+def active_batch_id(phase: int, review: int) -> Optional[int]:
+    """Id of the published batch for a phase/review"""
+    return db.session.execute(
+        select(ActiveBatch.batch_id).where(ActiveBatch.phase == phase, ActiveBatch.review_no == review)
+    ).scalar()
+
+
+def active_batch_ids() -> Dict[Tuple[int, int], int]:
+    """Published batch id of every phase/review, in one query"""
+    return {(p, r): b for p, r, b in db.session.execute(
+        select(ActiveBatch.phase, ActiveBatch.review_no, ActiveBatch.batch_id)
+    )}
+
+
+def active_batch_clause(phase: int, review: int):
+    """
+    Filter for the published evaluations of a phase/review. The pointer is read
+    by a subquery in the same statement, so each read sees one consistent batch.
+    """
+    pointer = select(ActiveBatch.batch_id).where(
+        ActiveBatch.phase == phase, ActiveBatch.review_no == review
+    ).scalar_subquery()
+    return db.and_(Evaluation.phase == phase, Evaluation.review_no == review,
+                   Evaluation.import_batch_id == pointer)
+
+
+def active_evaluations(phase: int, review: int):
+    """Evaluation query limited to the published batch of a phase/review"""
+    return Evaluation.query.filter(active_batch_clause(phase, review))
+
+
+def create_batch(phase: int, review: int, published: bool = False) -> int:
+    """Insert a new (staging) batch record and return its id"""
+    batch = ImportBatch(phase=phase, review_no=review, published_at=datetime.utcnow() if published else None)
+    db.session.add(batch)
+    db.session.flush()
+    return batch.id
+
+
+def stage_batch(phase: int, review: int, source_batch_id: Optional[int]) -> int:
+    """
+    Create a staging batch holding a copy of the source batch's rows,
+    copied with one INSERT ... SELECT. Readers keep seeing the source batch,
+    which stays untouched as the rollback target.
+    """
+    batch_id = create_batch(phase, review)
+    if source_batch_id is not None:
+        table = Evaluation.__table__
+        columns = [table.c[name] for name in _COPY_COLUMNS]
+        db.session.execute(
+            insert(table).from_select(
+                _COPY_COLUMNS + ["import_batch_id"],
+                select(*columns, db.literal(batch_id)).where(table.c.import_batch_id == source_batch_id),
+            )
+        )
+    return batch_id
+
+
+def publish_batch(phase: int, review: int, batch_id: int) -> None:
+    """
+    Point readers at batch_id; this single-row write is the atomic swap.
+    A batch published for the first time remembers the batch it replaced.
+    """
+    pointer = db.session.get(ActiveBatch, (phase, review))
+    db.session.execute(
+        update(ImportBatch).where(ImportBatch.id == batch_id, ImportBatch.published_at.is_(None))
+        .values(published_at=datetime.utcnow(), replaced_batch_id=pointer.batch_id if pointer else None)
+    )
+    if pointer is None:
+        db.session.add(ActiveBatch(phase=phase, review_no=review, batch_id=batch_id))
+    else:
+        pointer.batch_id = batch_id
+    db.session.flush()
+
+
+def discard_batch(batch_id: int) -> None:
+    """Delete a batch and its evaluation rows"""
+    db.session.execute(delete(Evaluation).where(Evaluation.import_batch_id == batch_id))
+    db.session.execute(delete(ImportBatch).where(ImportBatch.id == batch_id))
+
+
+def prune_batches(phase: int, review: int) -> None:
+    """Drop published batches other than the active one and the batch it replaced (for rollback)"""
+    active = active_batch_id(phase, review)
+    keep = {active, db.session.execute(
+        select(ImportBatch.replaced_batch_id).where(ImportBatch.id == active)
+    ).scalar()}
+    published = db.session.execute(
+        select(ImportBatch.id).where(
+            ImportBatch.phase == phase, ImportBatch.review_no == review, ImportBatch.published_at.is_not(None),
+        )
+    ).scalars().all()
+    for batch_id in published:
+        if batch_id not in keep:
+            discard_batch(batch_id)
+
+
+def rollback_batch(phase: int, review: int) -> Optional[int]:
+    """
+    Re-publish the batch the active one replaced, and drop the undone batch
+    Returns: the batch id now active, or None when there is nothing to roll back to
+    """
+    active = active_batch_id(phase, review)
+    if active is None:
+        return None
+    previous = db.session.execute(
+        select(ImportBatch.id).where(
+            ImportBatch.id == select(ImportBatch.replaced_batch_id).where(ImportBatch.id == active).scalar_subquery(),
+            ImportBatch.published_at.is_not(None),
+        )
+    ).scalar()
+    if previous is None:
+        return None
+    publish_batch(phase, review, previous)
+    discard_batch(active)
+    db.session.commit()
+    return previous
+
+
+def ensure_active_batches() -> None:
+    """Give every configured phase/review a published batch so scripts always have a target"""
+    for phase, review in REVIEW_CRITERIA:
+        if active_batch_id(phase, review) is None:
+            publish_batch(phase, review, create_batch(phase, review, published=True))
+    db.session.commit()
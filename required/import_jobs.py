@@ -0,0 +1,144 @@
+"""
+Import Jobs
+Runs uploads on an in-process worker pool so web threads return immediately
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+from models import db
+from import_engine import (import_workbook, import_workbook_sheets, describe_changes, record_import,
+                           record_import_errors)
+
+# Imports run one at a time: students are upserted chunk by chunk and each publish
+# replaces the live batch, so two concurrent imports would race on both
+MAX_WORKERS = 1
+
+# Finished jobs are kept this long (seconds) so the upload page can read the outcome
+JOB_RETENTION = 3600
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="import")
+_jobs: Dict[str, "ImportJob"] = {}
+_lock = threading.Lock()
+
+
+class ImportJob:
+    """Progress and outcome of one background import"""
+
+    def __init__(self, phase: Optional[int], review: Optional[int], content_hash: str = "", filename: str = ""):
+        # phase/review are None for a multi-sheet (whole semester) import
+        self.id = uuid.uuid4().hex
+        self.phase = phase
+        self.review = review
+        self.content_hash = content_hash
+        self.filename = filename
+        self.status = "queued"  # queued -> running -> done | failed
+        self.rows_parsed = 0
+        self.rows_written = 0
+        self.created = 0
+        self.changes = {}
+        self.error_count = 0  # the rows themselves are in the import_error table
+        self.message = ""
+        self.submitted_at = time.time()
+        self.finished_at = None
+
+    def update(self, **fields):
+        with _lock:
+            for key, value in fields.items():
+                setattr(self, key, value)
+
+    def to_dict(self) -> Dict:
+        with _lock:
+            return {
+                "id": self.id,
+                "phase": self.phase,
+                "review": self.review,
+                "status": self.status,
+                "rows_parsed": self.rows_parsed,
+                "rows_written": self.rows_written,
+                "created": self.created,
+                "changes": dict(self.changes),
+                "error_count": self.error_count,
+                "message": self.message,
+                "elapsed": round((self.finished_at or time.time()) - self.submitted_at, 2),
+            }
+
+
+def _run_import(app, job: ImportJob, upload_path: str):
+    with app.app_context():
+        job.update(status="running")
+        started = time.time()
+        try:
+            if job.phase is None:
+                summaries, errors = import_workbook_sheets(upload_path, progress=job.update)
+            else:
+                summary, errors = import_workbook(upload_path, job.phase, job.review, progress=job.update)
+                summaries = {(job.phase, job.review): summary}
+        except ValueError as e:
+            db.session.rollback()
+            job.update(status="failed", message=str(e))
+        except Exception as e:
+            db.session.rollback()
+            job.update(status="failed", message=f"Import failed: {e}")
+        else:
+            changes = {f"Phase {p} Review {r}": summary for (p, r), summary in sorted(summaries.items())}
+            message = " ".join(f"{scope}: {describe_changes(summary)}." for scope, summary in changes.items())
+            error_count = len(errors)
+            # The marks are published by now, so bookkeeping failures only add a warning
+            try:
+                if errors:
+                    record_import_errors(job.id, errors)
+            except Exception as e:
+                db.session.rollback()
+                error_count = 0
+                message += f" Warning: {len(errors)} row errors could not be stored ({e})."
+            try:
+                if job.content_hash:
+                    record_import(job.content_hash, job.phase, job.review, job.filename,
+                                  job.rows_parsed, job.rows_written, int((time.time() - started) * 1000))
+            except Exception as e:
+                db.session.rollback()
+                message += f" Warning: the upload was not recorded, so the same file will import again ({e})."
+            job.update(
+                status="done",
+                created=sum(summary["inserted"] for summary in summaries.values()),
+                changes=changes,
+                error_count=error_count,
+                message=message,
+            )
+        finally:
+            job.update(finished_at=time.time())
+            db.session.remove()
+            os.remove(upload_path)
+
+
+def _prune_finished():
+    cutoff = time.time() - JOB_RETENTION
+    with _lock:
+        for job_id in [j.id for j in _jobs.values() if j.finished_at and j.finished_at < cutoff]:
+            del _jobs[job_id]
+
+
+def submit_import(app, upload_path: str, phase: Optional[int] = None, review: Optional[int] = None,
+                  content_hash: str = "", filename: str = "") -> ImportJob:
+    """
+    Queue a spooled upload for import; the worker removes upload_path when done.
+    Without phase/review every sheet named after a phase/review is imported.
+    With a content_hash the finished import is recorded in the upload ledger.
+    Returns: the new job (poll it with get_job)
+    """
+    _prune_finished()
+    job = ImportJob(phase, review, content_hash, filename)
+    with _lock:
+        _jobs[job.id] = job
+    _executor.submit(_run_import, app, job, upload_path)
+    return job
+
+
+def get_job(job_id: str) -> Optional[ImportJob]:
+    """Look up a job by id"""
+    with _lock:
+        return _jobs.get(job_id)
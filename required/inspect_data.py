@@ -7,13 +7,14 @@ from sqlalchemy.orm import sessionmaker
 # Add 'required' to path
 sys.path.append(os.path.join(os.getcwd(), 'required'))
 from models import Evaluation, Student, db
+from import_batches import active_evaluations
 from app import create_app
 
 def inspect_phase2_data():
     app = create_app()
     with app.app_context():
         print("\n--- Inspecting Phase 1 Review 1 (1, 1) ---")
-        evals_p1r1 = Evaluation.query.filter_by(phase=1, review_no=1).all()
+        evals_p1r1 = active_evaluations(1, 1).all()
         if not evals_p1r1:
             print("No data found for Phase 1 Review 1")
         else:
@@ -22,7 +23,7 @@ def inspect_phase2_data():
                       f"C1: {ev.criteria1}, C2: {ev.criteria2}, C3: {ev.criteria3}, C4: {ev.criteria4}")
         
         print("\n--- Inspecting Phase 1 Review 2 (1, 2) ---")
-        evals_p1r2 = Evaluation.query.filter_by(phase=1, review_no=2).all()
+        evals_p1r2 = active_evaluations(1, 2).all()
         if not evals_p1r2:
             print("No data found for Phase 1 Review 2")
         else:
@@ -0,0 +1,160 @@
+"""
+Schema Migrations
+Versioned in-place upgrades applied by create_app after db.create_all()
+"""
+
+from sqlalchemy import inspect, select, update, delete, text, func
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import aliased
+from models import db, Student, Evaluation, SchemaVersion
+from utils import EVALUATORS
+from import_batches import active_batch_id, create_batch, publish_batch, ensure_active_batches
+
+
+def _evaluation_columns():
+    return [c["name"] for c in inspect(db.engine).get_columns("evaluation")]
+
+
+def _rebuild_sqlite_evaluation():
+    """SQLite cannot alter constraints, so copy the rows into a freshly created table"""
+    columns = ", ".join(_evaluation_columns())
+    with db.engine.begin() as conn:
+        conn.execute(text("ALTER TABLE evaluation RENAME TO evaluation_old"))
+        # Index names are database-wide and survive the rename
+        for (name,) in conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'evaluation_old' AND sql IS NOT NULL"
+        )).all():
+            conn.execute(text(f"DROP INDEX {name}"))
+    Evaluation.__table__.create(db.engine)
+    with db.engine.begin() as conn:
+        conn.execute(text(f"INSERT INTO evaluation ({columns}) SELECT {columns} FROM evaluation_old"))
+        conn.execute(text("DROP TABLE evaluation_old"))
+
+
+def _add_import_batches():
+    """
+    Version 1: evaluation rows belong to an import batch. Older tables are rebuilt
+    (the unique constraint changes) and existing rows become each review's first batch,
+    which replaced nothing. The batch tables themselves come from create_all().
+    """
+    if "import_batch_id" not in _evaluation_columns():
+        if db.engine.dialect.name == "sqlite":
+            _rebuild_sqlite_evaluation()
+        else:
+            unique = [u["name"] for u in inspect(db.engine).get_unique_constraints("evaluation")]
+            with db.engine.begin() as conn:
+                conn.execute(text(
+                    "ALTER TABLE evaluation ADD COLUMN import_batch_id INTEGER NULL, "
+                    "ADD CONSTRAINT fk_evaluation_import_batch FOREIGN KEY (import_batch_id) REFERENCES import_batch(id), "
+                    + "".join(f"DROP INDEX `{name}`, " for name in unique)
+                    + "ADD CONSTRAINT uq_eval_student_phase_review UNIQUE (student_id, phase, review_no, import_batch_id)"
+                ))
+
+    pairs = db.session.execute(
+        select(Evaluation.phase, Evaluation.review_no).where(Evaluation.import_batch_id.is_(None)).distinct()
+    ).all()
+    for phase, review in pairs:
+        batch_id = active_batch_id(phase, review)
+        if batch_id is None:
+            batch_id = create_batch(phase, review, published=True)
+            publish_batch(phase, review, batch_id)
+        db.session.execute(
+            update(Evaluation)
+            .where(Evaluation.phase == phase, Evaluation.review_no == review, Evaluation.import_batch_id.is_(None))
+            .values(import_batch_id=batch_id)
+        )
+    db.session.commit()
+    ensure_active_batches()
+
+
+def _add_evaluator_totals():
+    """Version 2: stored member1/member2/guide totals, backfilled from the stored criteria"""
+    existing = _evaluation_columns()
+    with db.engine.begin() as conn:
+        for evaluator in EVALUATORS:
+            if f"{evaluator}_total" not in existing:
+                conn.execute(text(f"ALTER TABLE evaluation ADD COLUMN {evaluator}_total INTEGER NOT NULL DEFAULT 0"))
+    db.session.execute(update(Evaluation).values({
+        f"{evaluator}_total": sum(func.coalesce(getattr(Evaluation, f"{evaluator}_criteria{i}"), 0) for i in range(1, 5))
+        for evaluator in EVALUATORS
+    }))
+    db.session.commit()
+
+
+def _merge_duplicate_students():
+    """
+    Fold students sharing a seat_no into the first one, as the importer already
+    resolves them. Evaluations move over unless the first student has its own.
+    """
+    keepers = dict(db.session.execute(
+        select(Student.seat_no, func.min(Student.id)).group_by(Student.seat_no).having(func.count() > 1)
+    ).all())
+    if not keepers:
+        return
+    duplicates = db.session.execute(
+        select(Student.id, Student.seat_no).where(Student.seat_no.in_(keepers), Student.id.notin_(keepers.values()))
+    ).all()
+    for sid, seat_no in duplicates:
+        keeper_id = keepers[seat_no]
+        kept = aliased(Evaluation)
+        db.session.execute(
+            update(Evaluation)
+            .where(Evaluation.student_id == sid, ~select(kept.id).where(
+                kept.student_id == keeper_id, kept.phase == Evaluation.phase,
+                kept.review_no == Evaluation.review_no, kept.import_batch_id == Evaluation.import_batch_id,
+            ).exists())
+            .values(student_id=keeper_id)
+        )
+        db.session.execute(delete(Evaluation).where(Evaluation.student_id == sid))
+        db.session.execute(delete(Student).where(Student.id == sid))
+    db.session.commit()
+
+
+def _add_query_indexes():
+    """
+    Version 3: unique seat_no, plus the index for the published-batch filter
+    """
+    _merge_duplicate_students()
+    seat_index = next((ix for ix in inspect(db.engine).get_indexes("student") if ix["name"] == "ix_student_seat_no"), None)
+    if seat_index and not seat_index["unique"]:
+        with db.engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_student_seat_no" + (" ON student" if db.engine.dialect.name == "mysql" else "")))
+    for index in (*Student.__table__.indexes, *Evaluation.__table__.indexes):
+        index.create(db.engine, checkfirst=True)
+
+
+# Applied in order; the position in this list (1-based) is the schema version.
+# New tables also need an entry here: create_app skips create_all() on a current schema
+MIGRATIONS = [
+    _add_import_batches,
+    _add_evaluator_totals,
+    _add_query_indexes,
+]
+
+
+def schema_is_current() -> bool:
+    """
+    True when the database already has every table and migration, read from the
+    schema_version marker with one query. A missing database or table counts as stale.
+    """
+    try:
+        with db.engine.connect() as conn:
+            version = conn.execute(select(SchemaVersion.version).where(SchemaVersion.id == 1)).scalar()
+    except DBAPIError:
+        return False
+    return version is not None and version >= len(MIGRATIONS)
+
+
+def run_migrations():
+    """Apply every migration newer than the stored schema version"""
+    marker = db.session.get(SchemaVersion, 1)
+    if marker is None:
+        marker = SchemaVersion(id=1, version=0)
+        db.session.add(marker)
+        db.session.commit()
+    for version, migration in enumerate(MIGRATIONS, start=1):
+        if marker.version >= version:
+            continue
+        migration()
+        marker.version = version
+        db.session.commit()
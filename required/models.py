@@ -1,19 +1,61 @@
+from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from sqlite_profile import install_sqlite_pragmas
+from utils import EVALUATORS, score_evaluation
 
-db = SQLAlchemy()
+class SharedEngineSQLAlchemy(SQLAlchemy):
+    """
+    Apps created in the same process for the same database reuse one engine and
+    its connection pool, so scripts and tests that call create_app() repeatedly
+    don't reconnect each time. The app's SQLITE_PRAGMAS are part of the key and
+    are installed when the engine is made, so an app asking for WAL never gets
+    an engine whose connections were set up without it.
+    """
+    _shared_engines = {}
+
+    def _make_engine(self, bind_key, options, app):
+        pragmas = app.config.get("SQLITE_PRAGMAS", {})
+        key = repr((sorted((name, repr(value)) for name, value in options.items()), sorted(pragmas.items())))
+        engine = self._shared_engines.get(key)
+        if engine is None:
+            engine = super()._make_engine(bind_key, options, app)
+            install_sqlite_pragmas(engine, pragmas)
+            self._shared_engines[key] = engine
+        return engine
+
+    def forget_engine(self, engine):
+        """Dispose a shared engine and drop it from the cache, e.g. once a scratch database is done with"""
+        engine.dispose()
+        for key in [key for key, shared in self._shared_engines.items() if shared is engine]:
+            del self._shared_engines[key]
+
+db = SharedEngineSQLAlchemy()
 
 class Student(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     group_no = db.Column(db.String(50))
     project_title = db.Column(db.String(255))
     project_guide = db.Column(db.String(128))
-    seat_no = db.Column(db.String(64), nullable=False, index=True)
+    seat_no = db.Column(db.String(64), nullable=False, unique=True, index=True)
     name = db.Column(db.String(128), nullable=False)
     evaluations = db.relationship("Evaluation", backref="student", lazy=True, cascade="all, delete-orphan")
 
+def _current_batch(context):
+    """Rows inserted outside the import engine (scripts) land in the published batch"""
+    params = context.get_current_parameters()
+    return context.connection.execute(
+        db.select(ActiveBatch.batch_id).where(
+            ActiveBatch.phase == params.get("phase", 1),
+            ActiveBatch.review_no == params.get("review_no", 1),
+        )
+    ).scalar()
+
 class Evaluation(db.Model):
     __table_args__ = (
-        db.UniqueConstraint('student_id', 'phase', 'review_no', name='uq_eval_student_phase_review'),
+        # One evaluation per student per phase/review within each import batch
+        db.UniqueConstraint('student_id', 'phase', 'review_no', 'import_batch_id', name='uq_eval_student_phase_review'),
+        # Covers the published-batch filter of every list view and its join to student
+        db.Index('ix_eval_phase_review_batch_student', 'phase', 'review_no', 'import_batch_id', 'student_id'),
     )
     id = db.Column(db.Integer, primary_key=True)
     phase = db.Column(db.Integer, default=1, nullable=False)  # 1 or 2
@@ -42,4 +84,83 @@ class Evaluation(db.Model):
     guide_criteria3 = db.Column(db.Integer, nullable=True)
     guide_criteria4 = db.Column(db.Integer, nullable=True)
     
+    # Per-evaluator totals, stored at write time (see utils.score_evaluation)
+    member1_total = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    member2_total = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    guide_total = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    
     student_id = db.Column(db.Integer, db.ForeignKey("student.id"), nullable=False)
+    
+    # Import batch this row belongs to; readers only see the batch published in active_batch
+    import_batch_id = db.Column(db.Integer, db.ForeignKey("import_batch.id"), nullable=True, default=_current_batch)
+
+@db.event.listens_for(Evaluation, "before_insert")
+@db.event.listens_for(Evaluation, "before_update")
+def _store_evaluator_totals(mapper, connection, target):
+    """
+    Keep every derived score in step with criteria edited through the ORM (fix scripts),
+    using utils.score_evaluation. Rows with no evaluator marks keep their stored averages.
+    """
+    marks = [{f"criteria{i}": getattr(target, f"{evaluator}_criteria{i}") for i in range(1, 5)}
+             for evaluator in EVALUATORS]
+    values = score_evaluation(*({key: mark or 0 for key, mark in comp.items()} for comp in marks))
+    derived = [f"{evaluator}_total" for evaluator in EVALUATORS]
+    if any(mark is not None for comp in marks for mark in comp.values()):
+        derived += ["total_marks"] + [f"criteria{i}" for i in range(1, 5)]
+    for column in derived:
+        setattr(target, column, values[column])
+
+class ImportBatch(db.Model):
+    """A versioned set of evaluation rows for one phase/review"""
+    __tablename__ = "import_batch"
+    id = db.Column(db.Integer, primary_key=True)
+    phase = db.Column(db.Integer, nullable=False)
+    review_no = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    published_at = db.Column(db.DateTime, nullable=True)  # NULL while staging
+    replaced_batch_id = db.Column(db.Integer, nullable=True)  # batch it took over from, the rollback target
+
+class ActiveBatch(db.Model):
+    """Pointer to the published import batch of each phase/review"""
+    __tablename__ = "active_batch"
+    phase = db.Column(db.Integer, primary_key=True)
+    review_no = db.Column(db.Integer, primary_key=True)
+    batch_id = db.Column(db.Integer, db.ForeignKey("import_batch.id"), nullable=False)
+
+class SchemaVersion(db.Model):
+    """Single-row marker of the last applied schema migration"""
+    __tablename__ = "schema_version"
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+class UploadLedger(db.Model):
+    """One row per successful upload import, used to skip identical re-uploads"""
+    __tablename__ = "upload_ledger"
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), nullable=False, index=True)  # sha256 of phase/review + file bytes
+    phase = db.Column(db.Integer, nullable=True)  # NULL for multi-sheet uploads
+    review_no = db.Column(db.Integer, nullable=True)
+    filename = db.Column(db.String(255))
+    imported_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    rows_parsed = db.Column(db.Integer, nullable=False, default=0)
+    rows_written = db.Column(db.Integer, nullable=False, default=0)
+    duration_ms = db.Column(db.Integer, nullable=False, default=0)
+
+class ImportErrorRow(db.Model):
+    """A spreadsheet row that could not be imported, kept server-side per import job"""
+    __tablename__ = "import_error"
+    id = db.Column(db.Integer, primary_key=True)
+    import_id = db.Column(db.String(32), nullable=False, index=True)  # ImportJob.id
+    row_no = db.Column(db.Integer, nullable=True)  # spreadsheet row, header is row 1
+    sheet = db.Column(db.String(64), nullable=True)  # set for multi-sheet uploads
+    student_name = db.Column(db.String(128))
+    message = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class DataVersion(db.Model):
+    """Change counter of one phase/review, bumped whenever its visible marks or students change"""
+    __tablename__ = "data_version"
+    phase = db.Column(db.Integer, primary_key=True)
+    review_no = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
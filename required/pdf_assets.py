@@ -0,0 +1,188 @@
+"""
+PDF Assets
+College logo and letterhead prepared once per process and drawn as shared forms in every PDF
+"""
+
+import copy
+import io
+import os
+import re
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+import reportlab
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfdoc import PDFImageXObject
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Flowable, Paragraph, Table, TableStyle
+from pdf_styles import paragraph_style
+
+LOGO_PATH = os.path.join(os.path.dirname(__file__), "college_logo.png")
+LOGO_SIZE = 25 * mm
+
+# Form XObject name of the logo image inside each PDF
+LOGO_FORM = "collegeLogo"
+
+# College name block of the letterhead; the builders differ only in font sizes
+LETTERHEAD_MARKUP = (
+    "<b>GURU NANAK DEV ENGINEERING COLLEGE, BIDAR 585403</b><br/>"
+    "<font size={affiliation}>Affiliated to VTU Belagavi & Approved by AICTE New Delhi</font><br/>"
+    "<font size={department}><b>Department of Computer Science Engineering</b></font>"
+)
+
+# Font selection in a captured content stream, e.g. "/F2 13 Tf"
+_FONT_OPERATOR = re.compile(r"(/F\d+)(?= \S+ Tf)")
+
+# Form use in a captured content stream, e.g. "/FormXob.collegeLogo Do"
+_FORM_OPERATOR = re.compile(r"/FormXob\.(\S+) Do")
+
+# ReportLab's canvas has no public access to its content stream. Only _embed_logo,
+# capture_drawing and replay_drawing use canvas internals (canv._code, _doc.fontMapping,
+# _doc.addForm), checked against this release, which requirements.txt pins
+REPORTLAB_VERSION = "5.0.1"
+if reportlab.Version != REPORTLAB_VERSION:
+    raise RuntimeError(
+        f"pdf_assets relies on ReportLab {REPORTLAB_VERSION} canvas internals but ReportLab "
+        f"{reportlab.Version} is installed; install reportlab=={REPORTLAB_VERSION} from requirements.txt"
+    )
+
+
+@lru_cache(maxsize=None)
+def _logo_image() -> Optional[PDFImageXObject]:
+    """Logo read and encoded as a PDF image stream once per process; None without a logo file"""
+    if not os.path.exists(LOGO_PATH):
+        return None
+    return PDFImageXObject(LOGO_FORM, LOGO_PATH)
+
+
+def _embed_logo(canv) -> None:
+    """Add the logo image to canv's PDF, once per document however often it is drawn"""
+    doc = canv._doc
+    if not doc.hasForm(LOGO_FORM):
+        # A document registers the object it is given, so each PDF gets its own shallow copy
+        doc.addForm(LOGO_FORM, copy.copy(_logo_image()))
+
+
+def draw_logo(canv, x: float, y: float, width: float = LOGO_SIZE, height: float = LOGO_SIZE) -> bool:
+    """Logo scaled into the box at (x, y); False when there is no logo file"""
+    if _logo_image() is None:
+        return False
+    _embed_logo(canv)
+    canv.saveState()
+    canv.translate(x, y)
+    canv.scale(width, height)
+    canv.doForm(LOGO_FORM)
+    canv.restoreState()
+    return True
+
+
+class _Logo(Flowable):
+    """Logo table cell drawn from the shared image"""
+
+    def wrap(self, availWidth, availHeight):
+        return LOGO_SIZE, LOGO_SIZE
+
+    def draw(self):
+        draw_logo(self.canv, 0, 0)
+
+
+def get_college_logo() -> Flowable:
+    """Logo flowable, or a LOGO placeholder without a logo file"""
+    if _logo_image() is None:
+        return Paragraph("<b>LOGO</b>", paragraph_style(fontSize=8, alignment=TA_CENTER))
+    return _Logo()
+
+
+def letterhead_table(logo, style: ParagraphStyle, affiliation: float = 9, department: float = 10) -> Table:
+    """Logo and college name in one row, centred over the 180mm text width"""
+    title = Paragraph(LETTERHEAD_MARKUP.format(affiliation=affiliation, department=department), style)
+    table = Table([[logo, title]], colWidths=[30*mm, 150*mm])
+    table.setStyle(TableStyle([
+        ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+        ('ALIGN', (1, 0), (1, 0), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+    ]))
+    return table
+
+
+class CapturedDrawing(NamedTuple):
+    """Content stream drawn on a scratch canvas, and the font behind each resource name it selects"""
+    code: Tuple[str, ...]
+    fonts: Dict[str, str]
+
+
+def capture_drawing(canv) -> CapturedDrawing:
+    """Everything drawn so far on canv's current page, to be replayed into other PDFs"""
+    return CapturedDrawing(tuple(canv._code), {internal: font for font, internal in canv._doc.fontMapping.items()})
+
+
+def replay_drawing(canv, drawing: CapturedDrawing) -> None:
+    """
+    Append a captured drawing to canv's current page or form. Font resource names are
+    looked up in canv's PDF, and forms are drawn through doForm so the page declares them.
+    """
+    fonts = {internal: canv._doc.getInternalFontName(font) for internal, font in drawing.fonts.items()}
+    code = canv._code
+    for line in drawing.code:
+        form = _FORM_OPERATOR.fullmatch(line)
+        if form:
+            if form.group(1) == LOGO_FORM:
+                _embed_logo(canv)
+            canv.doForm(form.group(1))
+        elif "Tf" in line:
+            code.append(_FONT_OPERATOR.sub(lambda m: fonts[m.group(1)], line))
+        else:
+            code.append(line)
+
+
+class PreparedLetterhead(NamedTuple):
+    """Letterhead drawn once on a scratch canvas"""
+    name: str
+    width: float
+    height: float
+    drawing: CapturedDrawing
+
+
+@lru_cache(maxsize=None)
+def prepare_letterhead(style: ParagraphStyle, affiliation: float = 9, department: float = 10) -> PreparedLetterhead:
+    """
+    Lay out and draw the letterhead on a scratch canvas once per process.
+    style must come from pdf_styles.paragraph_style, so equal styles hit the cache.
+    """
+    table = letterhead_table(get_college_logo(), style, affiliation, department)
+    width, height = table.wrap(180*mm, 1000*mm)
+    canv = Canvas(io.BytesIO())
+    table.drawOn(canv, 0, 0)
+    name = f"letterhead_{style.name}_{affiliation}_{department}"
+    return PreparedLetterhead(name, width, height, capture_drawing(canv))
+
+
+class Letterhead(Flowable):
+    """
+    Letterhead flowable: the first one drawn in a PDF defines a form from the prepared
+    content stream, every later page or section only refers to that form.
+    """
+
+    def __init__(self, prepared: PreparedLetterhead):
+        super().__init__()
+        self.prepared = prepared
+        self.hAlign = 'CENTER'
+
+    def wrap(self, availWidth, availHeight):
+        return self.prepared.width, self.prepared.height
+
+    def draw(self):
+        canv, prepared = self.canv, self.prepared
+        if not canv.hasForm(prepared.name):
+            canv.beginForm(prepared.name, 0, 0, prepared.width, prepared.height)
+            replay_drawing(canv, prepared.drawing)
+            canv.endForm()
+        canv.doForm(prepared.name)
+
+
+def letterhead(style: ParagraphStyle, affiliation: float = 9, department: float = 10) -> Letterhead:
+    """College letterhead for a story; a new flowable each call over the shared prepared one"""
+    return Letterhead(prepare_letterhead(style, affiliation, department))
@@ -0,0 +1,135 @@
+"""
+Review Sheet Overlay
+Fast review PDFs: the static form is laid out once per phase/review, each sheet only draws its values
+"""
+
+import io
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Dict, NamedTuple, Tuple
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Flowable, Paragraph, SimpleDocTemplate
+from pdf_template import REVIEW1_PAGE, review1_story, project_info_markup
+from pdf_assets import CapturedDrawing, capture_drawing, replay_drawing, draw_logo
+
+
+class _Slot(Flowable):
+    """Empty placeholder that records where the platypus layout put a per-student value"""
+
+    def __init__(self, name, style, bold, boxes, info_lines):
+        super().__init__()
+        self.name, self.style, self.bold, self._boxes = name, style, bold, boxes
+        self.info_lines = info_lines
+
+    def wrap(self, availWidth, availHeight):
+        if self.name == "logo":
+            self.width, self.height = 25*mm, 25*mm
+        else:
+            # Table cell values are centred on the slot, so one line is enough there;
+            # the project info paragraph pushes the table down by its line count
+            lines = self.info_lines if self.name == "info" else 1
+            self.width, self.height = availWidth, self.style.leading * lines
+        return self.width, self.height
+
+    def draw(self):
+        x, y = self.canv.absolutePosition(0, 0)
+        self._boxes[self.name] = (x, y, self.width, self.height, self.style, self.bold)
+
+
+class _CaptureDocTemplate(SimpleDocTemplate):
+    """Keeps the content stream of the first page instead of only writing it out"""
+
+    def afterPage(self):
+        if self.page == 1:
+            self.drawing = capture_drawing(self.canv)
+        else:
+            raise ValueError("review sheet form does not fit on one page")
+
+
+class ReviewForm(NamedTuple):
+    """Static part of a review sheet: its captured drawing and the value boxes"""
+    drawing: CapturedDrawing
+    boxes: Dict[str, Tuple]
+
+
+@lru_cache(maxsize=None)
+def review_form(phase: int, review: int, info_lines: int = 1) -> ReviewForm:
+    """
+    Lay out the form of a phase/review once per process, every value left as a placeholder
+    and info_lines lines kept for the project info
+    """
+    boxes = {}
+    doc = _CaptureDocTemplate(io.BytesIO(), **REVIEW1_PAGE)
+    blank = SimpleNamespace(seat_no="", name="", group_no=None, project_title=None)
+    story = review1_story(blank, SimpleNamespace(phase=phase, review_no=review),
+                          slot=lambda name, style, bold: _Slot(name, style, bold, boxes, info_lines))
+    doc.build(story)
+    return ReviewForm(doc.drawing, boxes)
+
+
+def _draw_value(canv, box, value) -> None:
+    """
+    Centred cell value as pdf_template's Paragraph shows it, wrapped to the box width and
+    centred on it. Text that fits on one line, every mark included, is drawn straight at
+    that paragraph's baseline without parsing markup.
+    """
+    x, y, width, height, style, bold = box
+    text = " ".join(str(value).split())
+    font = "Helvetica-Bold" if bold else style.fontName
+    if "<" in text or "&" in text or stringWidth(text, font, style.fontSize) > width:
+        paragraph = Paragraph(f"<b>{value}</b>" if bold else str(value), style)
+        _, paragraph_height = paragraph.wrapOn(canv, width, 1000*mm)
+        paragraph.drawOn(canv, x, y + (height - paragraph_height) / 2)
+    elif text:
+        canv.setFont(font, style.fontSize)
+        canv.setFillColor(style.textColor)
+        canv.drawCentredString(x + width / 2, y + height / 2 + style.leading / 2 - style.fontSize, text)
+
+
+def build_review1_pdf_fast(student, ev):
+    """
+    Same sheet as pdf_template.build_review1_pdf: the cached form of ev's phase/review
+    is copied onto a fresh page and only the student's values are drawn over it.
+    Values are the template's own paragraphs, so long names and titles wrap the same way.
+    """
+    form = review_form(ev.phase, ev.review_no)
+    _, _, width, _, style, _ = form.boxes["info"]
+    info = Paragraph(project_info_markup(student), style)
+    _, info_height = info.wrap(width, 1000*mm)
+    info_lines = round(info_height / style.leading)
+    if info_lines != 1:
+        form = review_form(ev.phase, ev.review_no, info_lines)
+
+    buffer = io.BytesIO()
+    canv = Canvas(buffer, pagesize=REVIEW1_PAGE.get("pagesize", A4))
+    replay_drawing(canv, form.drawing)
+
+    boxes = form.boxes
+    # The logo image is encoded once per process, not once per sheet
+    x, y, width, height, _, _ = boxes["logo"]
+    if not draw_logo(canv, x, y, width, height):
+        canv.setFont("Helvetica-Bold", 8)
+        canv.drawCentredString(x + width / 2, y + height / 2, "LOGO")
+
+    # The info box is as tall as the paragraph measured above
+    x, y, _, _, _, _ = boxes["info"]
+    info.drawOn(canv, x, y)
+    _draw_value(canv, boxes["seat_no"], student.seat_no)
+    _draw_value(canv, boxes["name"], student.name)
+    for i in range(1, 5):
+        guide = int(getattr(ev, f"guide_criteria{i}", 0) or 0)
+        if guide > 0:
+            _draw_value(canv, boxes[f"guide{i}"], guide)
+        _draw_value(canv, boxes[f"avg{i}"], int(getattr(ev, f"criteria{i}", 0) or 0))
+        if f"m1_{i}" in boxes:
+            _draw_value(canv, boxes[f"m1_{i}"], int(getattr(ev, f"member1_criteria{i}", 0) or 0))
+            _draw_value(canv, boxes[f"m2_{i}"], int(getattr(ev, f"member2_criteria{i}", 0) or 0))
+    _draw_value(canv, boxes["total"], ev.total_marks)
+
+    canv.showPage()
+    canv.save()
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,51 @@
+"""
+PDF Styles
+Shared paragraph styles and table cells for the PDF builders
+"""
+
+from typing import Dict, List, Tuple, Union
+from xml.sax.saxutils import escape
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Paragraph
+
+# Table cell alignment names of the ParagraphStyle alignments
+TABLE_ALIGN = {TA_LEFT: "LEFT", TA_CENTER: "CENTER", TA_RIGHT: "RIGHT"}
+
+_styles: Dict[Tuple, ParagraphStyle] = {}
+
+
+def paragraph_style(**attrs) -> ParagraphStyle:
+    """
+    One ParagraphStyle per distinct set of attributes, shared by every cell of every build.
+    Styles are shared, so callers must not modify the one they get.
+    """
+    key = tuple(sorted(attrs.items()))
+    style = _styles.get(key)
+    if style is None:
+        style = _styles[key] = ParagraphStyle(f"shared{len(_styles)}", **attrs)
+    return style
+
+
+def table_cell(text, style: ParagraphStyle, width: float) -> Union[str, Paragraph]:
+    """
+    Plain string when the text fits on one line of width points, else a wrapping Paragraph.
+    The table draws plain strings with the font of column_style, no Paragraph to lay out.
+    """
+    text = str(text)
+    if "\n" not in text and stringWidth(text, style.fontName, style.fontSize) <= width:
+        return text
+    return Paragraph(escape(text), style)
+
+
+def column_style(col: int, style: ParagraphStyle, first_row: int = 1, last_row: int = -1) -> List[Tuple]:
+    """TableStyle commands that draw plain strings in a column like Paragraphs in style"""
+    start, end = (col, first_row), (col, last_row)
+    return [
+        ("FONTNAME", start, end, style.fontName),
+        ("FONTSIZE", start, end, style.fontSize),
+        ("LEADING", start, end, style.leading),
+        ("TEXTCOLOR", start, end, style.textColor),
+        ("ALIGN", start, end, TABLE_ALIGN[style.alignment]),
+    ]
@@ -2,21 +2,47 @@ from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch, mm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from datetime import date
 import io
-import os
 from review_config import get_review_config
+from pdf_styles import paragraph_style
+from pdf_assets import letterhead, letterhead_table
 
-def get_college_logo():
-    """Get the college logo image"""
-    logo_path = os.path.join(os.path.dirname(__file__), 'college_logo.png')
-    if os.path.exists(logo_path):
-        return Image(logo_path, width=25*mm, height=25*mm)
-    else:
-        # Create a simple placeholder
-        return Paragraph("<b>LOGO</b>", ParagraphStyle('Logo', fontSize=8, alignment=TA_CENTER))
+# Printed in place of a missing project title
+PROJECT_TITLE_BLANK = "........................................................................................................................................................................................................."
+
+# Page setup of a review sheet
+REVIEW1_PAGE = dict(
+    pagesize=A4,
+    rightMargin=12*mm, 
+    leftMargin=12*mm, 
+    topMargin=8*mm, 
+    bottomMargin=10*mm
+)
+
+def split_project_title(project_title):
+    """Break a long project title in two like manual form filling; returns (line1, line2 or None)"""
+    if len(project_title) <= 85:  # Wrap at reasonable line length
+        return project_title, None
+    # Find the best break point (prefer spaces, then punctuation)
+    mid_point = 85  # Target first line length
+    break_point = mid_point
+    
+    # Look backwards from target length for natural break
+    for i in range(mid_point, max(0, mid_point - 20), -1):
+        if i < len(project_title) and project_title[i] in [' ', ',', '-', ':', ';', '.']:
+            break_point = i + (1 if project_title[i] != '-' else 0)
+            break
+    
+    return project_title[:break_point].strip(), project_title[break_point:].strip()
+
+def project_info_markup(student):
+    """Group number and project title paragraph, a long title's second line indented like manual forms"""
+    line1, line2 = split_project_title(student.project_title or PROJECT_TITLE_BLANK)
+    project_title = f"{line1}<br/>{'&nbsp;' * 38}{line2}" if line2 else line1
+    return f"Group No: {student.group_no or '.........'}     Project Title: {project_title}"
 
 def build_review1_pdf(student, ev, phase=None, review=None):
     """
@@ -29,27 +55,24 @@ def build_review1_pdf(student, ev, phase=None, review=None):
         review: Review number (optional, uses ev.review_no if not provided)
     """
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(
-        buffer, 
-        pagesize=A4,
-        rightMargin=12*mm, 
-        leftMargin=12*mm, 
-        topMargin=8*mm, 
-        bottomMargin=10*mm
-    )
-    
+    doc = SimpleDocTemplate(buffer, **REVIEW1_PAGE)
+    doc.build(review1_story(student, ev))
+    buffer.seek(0)
+    return buffer
+
+def review1_story(student, ev, slot=None):
+    """
+    Flowables of one review sheet. With slot(name, style, bold) every per-student
+    value becomes a placeholder instead; pdf_overlay lays out the static form that way.
+    """
+    def field(name, markup, style, bold=True):
+        return slot(name, style, bold) if slot else Paragraph(markup, style)
+
     elements = []
     styles = getSampleStyleSheet()
     
     # Create professional styles
-    title_style = ParagraphStyle(
-        'Title',
-        parent=styles['Normal'],
-        fontSize=14,
-        fontName='Helvetica-Bold',
-        alignment=TA_CENTER,
-        spaceAfter=3
-    )
+    title_style = paragraph_style(fontName='Helvetica-Bold', fontSize=14, alignment=TA_CENTER, spaceAfter=3)
     
     subtitle_style = ParagraphStyle(
         'Subtitle',
@@ -79,23 +102,11 @@ def build_review1_pdf(student, ev, phase=None, review=None):
         spaceAfter=6  # Extra space after paragraph
     )
     
-    # Header with logo and college info in a single row
-    header_data = [[
-        get_college_logo(),
-        Paragraph("<b>GURU NANAK DEV ENGINEERING COLLEGE, BIDAR 585403</b><br/>"
-                 "<font size=9>Affiliated to VTU Belagavi & Approved by AICTE New Delhi</font><br/>"
-                 "<font size=10><b>Department of Computer Science Engineering</b></font>", title_style)
-    ]]
-    
-    header_table = Table(header_data, colWidths=[30*mm, 150*mm])
-    header_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-        ('ALIGN', (1, 0), (1, 0), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 0),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-    ]))
-    elements.append(header_table)
+    # Header with logo and college info in a single row, a form shared by every sheet
+    if slot:
+        elements.append(letterhead_table(slot("logo", None, False), title_style))
+    else:
+        elements.append(letterhead(title_style))
     elements.append(Spacer(1, 5))
     
     # Academic info in corners
@@ -123,30 +134,10 @@ def build_review1_pdf(student, ev, phase=None, review=None):
     elements.append(Spacer(1, 8))
     
     # Group and project info with manual-style title wrapping
-    project_title = student.project_title or "........................................................................................................................................................................................................."
-    
-    # Wrap long project titles to two lines like manual form filling
-    if len(project_title) > 85:  # Wrap at reasonable line length
-        # Find the best break point (prefer spaces, then punctuation)
-        mid_point = 85  # Target first line length
-        break_point = mid_point
-        
-        # Look backwards from target length for natural break
-        for i in range(mid_point, max(0, mid_point - 20), -1):
-            if i < len(project_title) and project_title[i] in [' ', ',', '-', ':', ';', '.']:
-                break_point = i + (1 if project_title[i] != '-' else 0)
-                break
-        
-        # Create properly formatted two-line title
-        line1 = project_title[:break_point].strip()
-        line2 = project_title[break_point:].strip()
-        
-        # Add proper spacing for second line alignment (like manual forms)
-        spaces = "&nbsp;" * 38  # Align with "Project Title:" label
-        project_title = f"{line1}<br/>{spaces}{line2}"
-    
-    project_info = Paragraph(f"Group No: {student.group_no or '.........'}     Project Title: {project_title}", info_style)
-    elements.append(project_info)
+    if slot:
+        elements.append(slot("info", info_style, False))
+    else:
+        elements.append(Paragraph(project_info_markup(student), info_style))
     elements.append(Spacer(1, 8))  # Reduced spacing to fit on single page
     
     # Get configuration for this phase/review
@@ -155,7 +146,7 @@ def build_review1_pdf(student, ev, phase=None, review=None):
         # Fallback if config not found
         config = get_review_config(1, 1)
     
-    # Calculate marks dynamically based on criteria
+    # Marks per criterion, as stored at import time
     criteria_marks = []
     for i in range(1, 5):  # criteria1 to criteria4
         criterion_config = config['criteria'][i-1]
@@ -166,59 +157,53 @@ def build_review1_pdf(student, ev, phase=None, review=None):
         # Check if guide marks are applicable for this criterion
         guide_marks_applicable = criterion_config.get('guide_marks', True)
         
-        # Calculate average: if guide marks not applicable, average only m1 and m2
-        if guide_marks_applicable:
-            avg = int(round((m1 + m2 + m_guide) / 3)) if (m1 + m2 + m_guide) > 0 else 0
-        else:
-            avg = int(round((m1 + m2) / 2)) if (m1 + m2) > 0 else 0
-        
         criteria_marks.append({
             'm1': m1, 
             'm2': m2, 
             'guide': m_guide,  # Always store guide marks for display
-            'avg': avg,
+            'avg': int(getattr(ev, f'criteria{i}', 0) or 0),  # stored average (utils.score_evaluation)
             'guide_applicable': guide_marks_applicable
         })
     
-    total_marks = sum(c['avg'] for c in criteria_marks)
+    total_marks = getattr(ev, 'total_marks', 0)
     
     # Create the main evaluation table with dynamic criteria - using Paragraph for text wrapping
     table_data = [
         # Header row with CIE span
-        [Paragraph('<b></b>', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-         Paragraph('<b></b>', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-         Paragraph('<b></b>', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-         Paragraph('<b></b>', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-         Paragraph('<b>Continuous Internal Evaluation (CIE) by</b>', ParagraphStyle('header', fontSize=8, alignment=TA_CENTER, leading=9)), 
-         Paragraph('<b></b>', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-         Paragraph('<b></b>', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-         Paragraph('<b>Average CIE Marks (50 Marks)</b>', ParagraphStyle('header', fontSize=7, alignment=TA_CENTER, leading=9))],
+        [Paragraph('<b></b>', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+         Paragraph('<b></b>', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+         Paragraph('<b></b>', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+         Paragraph('<b></b>', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+         Paragraph('<b>Continuous Internal Evaluation (CIE) by</b>', paragraph_style(fontSize=8, alignment=TA_CENTER, leading=9)), 
+         Paragraph('<b></b>', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+         Paragraph('<b></b>', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+         Paragraph('<b>Average CIE Marks (50 Marks)</b>', paragraph_style(fontSize=7, alignment=TA_CENTER, leading=9))],
         
         # Sub-header row with smaller font
-        [Paragraph('<b>Sl. No.</b>', ParagraphStyle('header', fontSize=7, alignment=TA_CENTER, leading=9)), 
-         Paragraph('<b>Univ. Seat No.</b>', ParagraphStyle('header', fontSize=7, alignment=TA_CENTER, leading=9)), 
-         Paragraph('<b>Name of the Student</b>', ParagraphStyle('header', fontSize=7, alignment=TA_CENTER, leading=9)), 
-         Paragraph('<b>Aspect for Assessment</b>', ParagraphStyle('header', fontSize=7, alignment=TA_CENTER, leading=9)), 
-         Paragraph('<b>Chairperson (Member-1) Marks</b>', ParagraphStyle('header', fontSize=7, alignment=TA_CENTER, leading=9)), 
-         Paragraph('<b>Member-2 Marks</b>', ParagraphStyle('header', fontSize=7, alignment=TA_CENTER, leading=9)), 
-         Paragraph('<b>Internal Guide Marks</b>', ParagraphStyle('header', fontSize=7, alignment=TA_CENTER, leading=9)), 
-         Paragraph('<b></b>', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER))],
+        [Paragraph('<b>Sl. No.</b>', paragraph_style(fontSize=7, alignment=TA_CENTER, leading=9)), 
+         Paragraph('<b>Univ. Seat No.</b>', paragraph_style(fontSize=7, alignment=TA_CENTER, leading=9)), 
+         Paragraph('<b>Name of the Student</b>', paragraph_style(fontSize=7, alignment=TA_CENTER, leading=9)), 
+         Paragraph('<b>Aspect for Assessment</b>', paragraph_style(fontSize=7, alignment=TA_CENTER, leading=9)), 
+         Paragraph('<b>Chairperson (Member-1) Marks</b>', paragraph_style(fontSize=7, alignment=TA_CENTER, leading=9)), 
+         Paragraph('<b>Member-2 Marks</b>', paragraph_style(fontSize=7, alignment=TA_CENTER, leading=9)), 
+         Paragraph('<b>Internal Guide Marks</b>', paragraph_style(fontSize=7, alignment=TA_CENTER, leading=9)), 
+         Paragraph('<b></b>', paragraph_style(fontSize=7, alignment=TA_CENTER))],
         
         # Project Guide section header
-        [Paragraph('', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-         Paragraph('', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-         Paragraph('', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-         Paragraph(f"<b>{config.get('guide_section_label', 'Marks allotted by Project Guide')}</b>", ParagraphStyle('section', fontSize=7, alignment=TA_LEFT, leading=9)), 
-         Paragraph('', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-         Paragraph('', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-         Paragraph('', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-         Paragraph('', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER))],
+        [Paragraph('', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+         Paragraph('', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+         Paragraph('', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+         Paragraph(f"<b>{config.get('guide_section_label', 'Marks allotted by Project Guide')}</b>", paragraph_style(fontSize=7, alignment=TA_LEFT, leading=9)), 
+         Paragraph('', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+         Paragraph('', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+         Paragraph('', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+         Paragraph('', paragraph_style(fontSize=7, alignment=TA_CENTER))],
     ]
     
     # Create paragraph styles for table cells
-    cell_style = ParagraphStyle('cell', fontSize=7, alignment=TA_CENTER, leading=9)
-    cell_style_left = ParagraphStyle('cell_left', fontSize=7, alignment=TA_LEFT, leading=9)
-    cell_style_bold = ParagraphStyle('cell_bold', fontSize=8, alignment=TA_CENTER, leading=10, fontName='Helvetica-Bold')
+    cell_style = paragraph_style(fontSize=7, alignment=TA_CENTER, leading=9)
+    cell_style_left = paragraph_style(fontSize=7, alignment=TA_LEFT, leading=9)
+    cell_style_bold = paragraph_style(fontSize=8, alignment=TA_CENTER, leading=10, fontName='Helvetica-Bold')
     
     # Add first two criteria (guide marks) with student info on first row
     # Per reference format, for "Marks allotted by Project Guide" section:
@@ -230,26 +215,26 @@ def build_review1_pdf(student, ev, phase=None, review=None):
         
         row = [
             Paragraph('<b>1</b>' if idx == 1 else '', cell_style_bold if idx == 1 else cell_style),
-            Paragraph(f'<b>{student.seat_no}</b>' if idx == 1 else '', cell_style_bold if idx == 1 else cell_style),
-            Paragraph(f'<b>{student.name}</b>' if idx == 1 else '', cell_style_bold if idx == 1 else cell_style),
+            field('seat_no', f'<b>{student.seat_no}</b>', cell_style_bold) if idx == 1 else Paragraph('', cell_style),
+            field('name', f'<b>{student.name}</b>', cell_style_bold) if idx == 1 else Paragraph('', cell_style),
             Paragraph(f"({chr(96+idx)}) {criterion['name']} ({criterion['max_marks']} Marks)", cell_style_left),
             Paragraph('<b>NA</b>', cell_style),  # Chairperson shows NA in guide section
             Paragraph('<b>NA</b>', cell_style),  # Member-2 shows NA in guide section
-            Paragraph(f'<b>{marks["guide"]}</b>' if marks['guide'] > 0 else '', cell_style),  # Guide shows actual marks
-            Paragraph(f'<b>{marks["avg"]}</b>', ParagraphStyle('avg', fontSize=9, alignment=TA_CENTER, leading=11, fontName='Helvetica-Bold', textColor=colors.HexColor('#059669')))
+            field(f'guide{idx}', f'<b>{marks["guide"]}</b>' if marks['guide'] > 0 else '', cell_style),  # Guide shows actual marks
+            field(f'avg{idx}', f'<b>{marks["avg"]}</b>', paragraph_style(fontSize=9, alignment=TA_CENTER, leading=11, fontName='Helvetica-Bold', textColor=colors.HexColor('#059669')))
         ]
         table_data.append(row)
     
     # Committee section header
     table_data.append([
-        Paragraph('', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-        Paragraph('', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-        Paragraph('', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-        Paragraph(f"<b>{config.get('committee_section_label', 'Marks allotted by Committee')}</b>", ParagraphStyle('section', fontSize=7, alignment=TA_LEFT, leading=9)), 
-        Paragraph('', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-        Paragraph('', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-        Paragraph('', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER)), 
-        Paragraph('', ParagraphStyle('tiny', fontSize=7, alignment=TA_CENTER))
+        Paragraph('', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+        Paragraph('', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+        Paragraph('', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+        Paragraph(f"<b>{config.get('committee_section_label', 'Marks allotted by Committee')}</b>", paragraph_style(fontSize=7, alignment=TA_LEFT, leading=9)), 
+        Paragraph('', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+        Paragraph('', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+        Paragraph('', paragraph_style(fontSize=7, alignment=TA_CENTER)), 
+        Paragraph('', paragraph_style(fontSize=7, alignment=TA_CENTER))
     ])
     
     # Add last two criteria (committee marks)
@@ -265,10 +250,10 @@ def build_review1_pdf(student, ev, phase=None, review=None):
             Paragraph('', cell_style),
             Paragraph('', cell_style),
             Paragraph(f"({chr(96+idx)}) {criterion['name']} ({criterion['max_marks']} Marks)", cell_style_left),
-            Paragraph(f'<b>{marks["m1"]}</b>', cell_style),  # Chairperson shows actual marks
-            Paragraph(f'<b>{marks["m2"]}</b>', cell_style),  # Member-2 shows actual marks
-            Paragraph(f'<b>{marks["guide"]}</b>' if marks['guide'] > 0 else '', cell_style),  # Internal Guide shows actual marks
-            Paragraph(f'<b>{marks["avg"]}</b>', ParagraphStyle('avg', fontSize=9, alignment=TA_CENTER, leading=11, fontName='Helvetica-Bold', textColor=colors.HexColor('#059669')))
+            field(f'm1_{idx}', f'<b>{marks["m1"]}</b>', cell_style),  # Chairperson shows actual marks
+            field(f'm2_{idx}', f'<b>{marks["m2"]}</b>', cell_style),  # Member-2 shows actual marks
+            field(f'guide{idx}', f'<b>{marks["guide"]}</b>' if marks['guide'] > 0 else '', cell_style),  # Internal Guide shows actual marks
+            field(f'avg{idx}', f'<b>{marks["avg"]}</b>', paragraph_style(fontSize=9, alignment=TA_CENTER, leading=11, fontName='Helvetica-Bold', textColor=colors.HexColor('#059669')))
         ]
         table_data.append(row)
     
@@ -277,11 +262,11 @@ def build_review1_pdf(student, ev, phase=None, review=None):
         Paragraph('', cell_style),
         Paragraph('', cell_style),
         Paragraph('', cell_style),
-        Paragraph('<b>Total Marks (50 Marks)</b>', ParagraphStyle('total', fontSize=8, alignment=TA_LEFT, leading=10, fontName='Helvetica-Bold')),
+        Paragraph('<b>Total Marks (50 Marks)</b>', paragraph_style(fontSize=8, alignment=TA_LEFT, leading=10, fontName='Helvetica-Bold')),
         Paragraph('', cell_style),
         Paragraph('', cell_style),
         Paragraph('', cell_style),
-        Paragraph(f'<b>{total_marks}</b>', ParagraphStyle('total_val', fontSize=10, alignment=TA_CENTER, leading=12, fontName='Helvetica-Bold', textColor=colors.HexColor('#059669')))
+        field('total', f'<b>{total_marks}</b>', paragraph_style(fontSize=10, alignment=TA_CENTER, leading=12, fontName='Helvetica-Bold', textColor=colors.HexColor('#059669')))
     ])
     
     # Optimized column widths for A4 to fit all content properly
@@ -370,11 +355,7 @@ def build_review1_pdf(student, ev, phase=None, review=None):
     ]))
     
     elements.append(sig_table)
-    
-    # Build the beautiful PDF
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer
+    return elements
 
 
 def build_summary_pdf(students_evaluations):
@@ -395,15 +376,8 @@ def build_summary_pdf(students_evaluations):
     styles = getSampleStyleSheet()
     
     # Enhanced custom styles
-    college_title_style = ParagraphStyle(
-        'CollegeTitle',
-        parent=styles['Normal'],
-        fontSize=16,
-        fontName='Helvetica-Bold',
-        alignment=TA_CENTER,
-        spaceAfter=4,
-        textColor=colors.black
-    )
+    college_title_style = paragraph_style(fontName='Helvetica-Bold', fontSize=16, alignment=TA_CENTER,
+                                          spaceAfter=4, textColor=colors.black)
     
     affiliation_style = ParagraphStyle(
         'Affiliation',
@@ -436,22 +410,7 @@ def build_summary_pdf(students_evaluations):
     )
     
     # Header with logo and college info
-    header_data = [[
-        get_college_logo(),
-        Paragraph("<b>GURU NANAK DEV ENGINEERING COLLEGE, BIDAR 585403</b><br/>"
-                 "<font size=10>Affiliated to VTU Belagavi & Approved by AICTE New Delhi</font><br/>"
-                 "<font size=11><b>Department of Computer Science Engineering</b></font>", college_title_style)
-    ]]
-    
-    header_table = Table(header_data, colWidths=[30*mm, 150*mm])
-    header_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-        ('ALIGN', (1, 0), (1, 0), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 0),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-    ]))
-    elements.append(header_table)
+    elements.append(letterhead(college_title_style, affiliation=10, department=11))
     
     # Report title
     elements.append(Paragraph("FINAL YEAR PROJECT REVIEW-I SUMMARY REPORT", title_style))
@@ -490,6 +449,7 @@ def build_summary_pdf(students_evaluations):
     ]
     
     # Add student data with proper formatting
+    project_title_style = paragraph_style(fontSize=7, leading=9)
     for idx, (student, evaluation) in enumerate(students_evaluations, 1):
         # Calculate grade
         total = evaluation.total_marks or 0
@@ -526,8 +486,7 @@ def build_summary_pdf(students_evaluations):
                 line2 = line2[:32] + "..."
             
             # Create paragraph with line breaks  
-            project_title_para = Paragraph(f"<font size=7>{line1}<br/>{line2}</font>", 
-                                         ParagraphStyle('ProjectTitle', fontSize=7, leading=9))
+            project_title_para = Paragraph(f"<font size=7>{line1}<br/>{line2}</font>", project_title_style)
         else:
             # Short title - use as is
             project_title_para = project_title
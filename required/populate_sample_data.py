@@ -5,6 +5,7 @@ This script creates sample data so you can test all views (groupwise, guidewise,
 
 from app import create_app
 from models import db, Student, Evaluation
+from import_batches import active_evaluations
 import random
 
 def populate_sample_data():
@@ -25,8 +26,8 @@ def populate_sample_data():
         for phase, review in phase_review_combos:
             print(f"\nCreating evaluations for Phase {phase} Review {review}...")
             
-            # Delete existing evaluations for this phase/review
-            existing = Evaluation.query.filter_by(phase=phase, review_no=review).all()
+            # Delete the published evaluations for this phase/review; new rows land in the same batch
+            existing = active_evaluations(phase, review).all()
             for ev in existing:
                 db.session.delete(ev)
             db.session.commit()
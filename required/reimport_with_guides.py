@@ -4,6 +4,7 @@ import openpyxl
 from models import db, Student, Evaluation
 from app import create_app
 from utils import reverse_engineer_components
+from data_versions import bump_data_version
 
 def reimport_with_guides():
     """Re-import Excel file with project guide information"""
@@ -18,6 +19,7 @@ def reimport_with_guides():
             # Clear existing data
             db.session.execute(db.text("DELETE FROM evaluation"))
             db.session.execute(db.text("DELETE FROM student"))
+            bump_data_version()
             db.session.commit()
             print("Cleared existing data")
             
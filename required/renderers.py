@@ -0,0 +1,31 @@
+"""
+Renderers
+Lazy entry points to the ReportLab and openpyxl subsystems, imported on first use
+"""
+
+# ReportLab and openpyxl each add close to 100 ms and several MB to a process.
+# View-only workers and maintenance scripts that import app never load them.
+
+
+def build_review1_pdf(*args, **kwargs):
+    """pdf_template.build_review1_pdf, importing ReportLab on the first call"""
+    from pdf_template import build_review1_pdf as build
+    return build(*args, **kwargs)
+
+
+def build_review1_pdf_fast(*args, **kwargs):
+    """pdf_overlay.build_review1_pdf_fast: the cached static form with only the values drawn per sheet"""
+    from pdf_overlay import build_review1_pdf_fast as build
+    return build(*args, **kwargs)
+
+
+def build_comprehensive_pdf(*args, **kwargs):
+    """comprehensive_pdf_template.build_comprehensive_pdf, importing ReportLab on the first call"""
+    from comprehensive_pdf_template import build_comprehensive_pdf as build
+    return build(*args, **kwargs)
+
+
+def load_workbook(*args, **kwargs):
+    """openpyxl.load_workbook, importing openpyxl on the first call"""
+    from openpyxl import load_workbook as load
+    return load(*args, **kwargs)
@@ -0,0 +1,188 @@
+"""
+Read Repository
+Joined student + evaluation queries for the list views and exports
+"""
+
+import base64
+import json
+from itertools import groupby
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import select, func, case, tuple_
+from models import db, Student, Evaluation
+from import_batches import active_batch_clause
+
+# Rows per page of the paginated student tables
+PAGE_SIZE = 100
+
+# Rows fetched per round trip when streaming an export
+STREAM_BATCH = 500
+
+# Keyset for paginated tables; NULL groups sort as "" so the key is comparable
+_KEYSET = (func.coalesce(Student.group_no, ""), Student.name, Student.id)
+
+# Row order of each view; Student.id keeps ties stable between requests
+ORDERINGS = {
+    "group": (Student.group_no, Student.name, Student.id),
+    "name": (Student.name, Student.id),
+}
+
+
+def student_evaluations(phase: int, review: int, order: str = "group") -> List[Tuple[Student, Evaluation]]:
+    """
+    (student, evaluation) pairs for the published batch of a phase/review in one
+    joined query. Students without an evaluation for this review are left out.
+    """
+    return [tuple(row) for row in db.session.execute(
+        select(Student, Evaluation)
+        .join(Evaluation, Evaluation.student_id == Student.id)
+        .where(active_batch_clause(phase, review))
+        .order_by(*ORDERINGS[order])
+    )]
+
+
+def iter_student_evaluations(phase: int, review: int, order: str = "group", batch_size: int = STREAM_BATCH,
+                             group: Optional[str] = None,
+                             guide: Optional[str] = None) -> Iterator[Tuple[Student, Evaluation]]:
+    """
+    Same pairs as student_evaluations, fetched batch_size rows at a time from a
+    server-side cursor so exports of any size hold only one batch in memory.
+    group / guide limit the rows to one section of the group-wise or guide-wise
+    view (group="" is the "No Group" section).
+    """
+    query = (
+        select(Student, Evaluation)
+        .join(Evaluation, Evaluation.student_id == Student.id)
+        .where(active_batch_clause(phase, review))
+    )
+    if group is not None:
+        query = query.where(_grouping_key("group").is_(None) if group == "" else Student.group_no == group)
+    if guide is not None:
+        query = query.where(_grouping_key("guide") == guide.strip())
+    result = db.session.execute(query.order_by(*ORDERINGS[order]).execution_options(yield_per=batch_size))
+    for row in result:
+        yield tuple(row)
+
+
+def student_evaluation(student_id: int, phase: int, review: int) -> Optional[Evaluation]:
+    """Published evaluation of one student for a phase/review"""
+    return db.session.execute(
+        select(Evaluation).where(Evaluation.student_id == student_id, active_batch_clause(phase, review))
+    ).scalars().first()
+
+
+def encode_cursor(student: Student) -> str:
+    """Opaque keyset cursor for the row after which the next page starts"""
+    key = [student.group_no or "", student.name, student.id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Tuple]:
+    """Cursor back to its (group_no, name, id) key; None for a missing or malformed token"""
+    if not token:
+        return None
+    try:
+        group_no, name, sid = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        return str(group_no), str(name), int(sid)
+    except (ValueError, TypeError):
+        return None
+
+
+def student_evaluations_page(phase: int, review: int, after: Optional[str] = None,
+                             limit: int = PAGE_SIZE) -> Tuple[List[Tuple[Student, Evaluation]], Optional[str]]:
+    """
+    One page of (student, evaluation) pairs ordered by (group_no, name, id).
+    Pages seek past the cursor instead of using OFFSET, so every page costs the same.
+    Returns: (rows, cursor of the next page or None on the last page)
+    """
+    query = (
+        select(Student, Evaluation)
+        .join(Evaluation, Evaluation.student_id == Student.id)
+        .where(active_batch_clause(phase, review))
+    )
+    key = decode_cursor(after)
+    if key:
+        query = query.where(tuple_(*_KEYSET) > tuple_(*key))
+    # One extra row tells whether another page follows
+    rows = [tuple(row) for row in db.session.execute(query.order_by(*_KEYSET).limit(limit + 1))]
+    if len(rows) > limit:
+        return rows[:limit], encode_cursor(rows[limit - 1][0])
+    return rows, None
+
+
+def review_stats(phase: int, review: int) -> Dict:
+    """Class statistics of a phase/review, aggregated in SQL rather than over loaded rows"""
+    marks = Evaluation.total_marks
+    row = db.session.execute(
+        select(
+            func.count(Evaluation.id), func.avg(marks), func.max(marks), func.min(marks),
+            func.sum(case((marks >= 25, 1), else_=0)),
+            func.sum(case((marks >= 40, 1), else_=0)),
+            func.sum(case(((marks >= 35) & (marks < 40), 1), else_=0)),
+            func.sum(case(((marks >= 30) & (marks < 35), 1), else_=0)),
+            func.sum(case(((marks >= 25) & (marks < 30), 1), else_=0)),
+            func.sum(case((marks < 25, 1), else_=0)),
+        ).where(active_batch_clause(phase, review))
+    ).one()
+    count, avg, highest, lowest, passed, *grades = (value or 0 for value in row)
+    return {
+        "count": count,
+        "average": float(avg),
+        "highest": highest,
+        "lowest": lowest,
+        "pass_rate": (passed / count * 100) if count else 0,
+        "grades": dict(zip("ABCDF", grades)),
+    }
+
+
+def _grouping_key(by: str):
+    if by == "guide":
+        return func.trim(Student.project_guide)
+    # Blank and missing group numbers form one "No Group" section
+    return func.nullif(Student.group_no, "")
+
+
+def grouped_evaluations(phase: int, review: int, by: str = "group") -> List[Dict]:
+    """
+    Sections of the group-wise (by="group") or guide-wise (by="guide") view.
+    Membership and statistics come from two queries: one GROUP BY for per-section
+    member count, mean/min/max total and per-criterion averages, and one joined
+    row query in the same key order. Students without a guide are left out of the guide view.
+    Returns: [{"label", "key", "count", "avg_total", "min_total", "max_total", "avg_criteria", "members"}]
+    """
+    key = _grouping_key(by).label("section")
+    scope = [active_batch_clause(phase, review)]
+    if by == "guide":
+        scope.append(func.coalesce(func.trim(Student.project_guide), "") != "")
+
+    stats = db.session.execute(
+        select(
+            key, func.count(Evaluation.id), func.avg(Evaluation.total_marks),
+            func.min(Evaluation.total_marks), func.max(Evaluation.total_marks),
+            *[func.avg(getattr(Evaluation, f"criteria{i}")) for i in range(1, 5)],
+        )
+        .join(Evaluation, Evaluation.student_id == Student.id)
+        .where(*scope)
+        .group_by(key)
+        .order_by(key)
+    ).all()
+    rows = db.session.execute(
+        select(key, Student, Evaluation)
+        .join(Evaluation, Evaluation.student_id == Student.id)
+        .where(*scope)
+        .order_by(key, Student.name, Student.id)
+    ).all()
+
+    sections = []
+    members = {section: [(s, ev) for _, s, ev in group] for section, group in groupby(rows, key=lambda r: r[0])}
+    for section, count, avg_total, min_total, max_total, *avg_criteria in stats:
+        sections.append({
+            "label": section or "No Group",
+            "key": section or "",  # group / guide filter of iter_student_evaluations
+            "count": count,
+            "avg_total": float(avg_total or 0),
+            "min_total": min_total,
+            "max_total": max_total,
+            "avg_criteria": [float(a or 0) for a in avg_criteria],
+            "members": members.get(section, []),
+        })
+    return sections
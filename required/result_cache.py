@@ -0,0 +1,102 @@
+"""
+Result Cache
+In-process LRU cache for rendered views and exports, keyed by data version
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Default memory budget for cached results
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ResultCache:
+    """
+    Byte results keyed by strings that embed the data version they were built from,
+    so a new import simply stops matching old entries. Least recently used entries are
+    evicted past max_bytes; with a spill_dir they are written there and read back on a
+    later miss instead of being rebuilt. The name passed with a key says which result
+    it is a version of: spilling a version removes the older spilled versions of that name.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, spill_dir: Optional[Path] = None):
+        self.max_bytes = max_bytes
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self._entries: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str, name: Optional[str] = None) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[1]
+        value = self._read_spill(key, name or key)
+        if value is not None:
+            self.put(key, value, name)
+        return value
+
+    def put(self, key: str, value: bytes, name: Optional[str] = None) -> None:
+        """Store value under key; name defaults to the key, i.e. a result with a single version"""
+        name = name or key
+        if len(value) > self.max_bytes:
+            # Too large to keep in memory at all
+            self._write_spill(key, name, value)
+            return
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key)[1])
+            self._entries[key] = (name, value)
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                old_key, (old_name, old_value) = self._entries.popitem(last=False)
+                self._size -= len(old_value)
+                evicted.append((old_key, old_name, old_value))
+        for old_key, old_name, old_value in evicted:
+            self._write_spill(old_key, old_name, old_value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        if self.spill_dir:
+            for path in self.spill_dir.glob("*.cache"):
+                path.unlink(missing_ok=True)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _spill_path(self, key: str, name: str) -> Path:
+        # The prefix names the result, so its versions share it; the digest identifies the version
+        prefix = re.sub(r"[^A-Za-z0-9]+", "_", name)[:80]
+        return self.spill_dir / f"{prefix}.{hashlib.sha1(key.encode('utf-8')).hexdigest()}.cache"
+
+    def _write_spill(self, key: str, name: str, value: bytes) -> None:
+        if not self.spill_dir:
+            return
+        path = self._spill_path(key, name)
+        # Older versions of the same result can never match again
+        for stale in self.spill_dir.glob(f"{path.name.split('.')[0]}.*.cache"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(value)
+        os.replace(tmp, path)
+
+    def _read_spill(self, key: str, name: str) -> Optional[bytes]:
+        if not self.spill_dir:
+            return None
+        try:
+            return self._spill_path(key, name).read_bytes()
+        except FileNotFoundError:
+            return None
@@ -11,7 +11,9 @@ from app import create_app
 from models import db, Student, Evaluation
 from utils import normalize_header
 from upload_helpers import map_excel_columns_to_criteria
-from sqlalchemy import text
+from data_versions import bump_data_version
+from import_batches import active_batch_clause, active_evaluations
+from sqlalchemy import delete
 
 # Configuration
 EXCEL_PATH = Path(r"C:\Users\asus\OneDrive\Documents\Class_data1.xlsx")
@@ -77,16 +79,13 @@ def main():
                 print("ERROR: Excel must have Member 1, Member 2, and Internal Guide columns")
                 return
             
-            # Delete existing Phase 2 Review 2 data
+            # Delete the published Phase 2 Review 2 data; new rows land in the same batch
             print(f"\nDeleting existing Phase {PHASE} Review {REVIEW} data...")
-            count = db.session.execute(
-                text(f"SELECT COUNT(*) FROM evaluation WHERE phase = {PHASE} AND review_no = {REVIEW}")
-            ).scalar()
+            count = active_evaluations(PHASE, REVIEW).count()
             print(f"Found {count} existing records")
             
-            db.session.execute(
-                text(f"DELETE FROM evaluation WHERE phase = {PHASE} AND review_no = {REVIEW}")
-            )
+            db.session.execute(delete(Evaluation).where(active_batch_clause(PHASE, REVIEW)))
+            bump_data_version(PHASE, REVIEW)
             db.session.commit()
             print("Deleted existing records")
             
@@ -175,7 +174,7 @@ def main():
             print(f"{'='*60}")
             
             # Verify first record
-            first_ev = Evaluation.query.filter_by(phase=PHASE, review_no=REVIEW).first()
+            first_ev = active_evaluations(PHASE, REVIEW).first()
             if first_ev:
                 print(f"\nVerification - First record:")
                 print(f"  Criteria: {first_ev.criteria1}, {first_ev.criteria2}, {first_ev.criteria3}, {first_ev.criteria4}")
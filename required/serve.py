@@ -1,11 +1,19 @@
-
 from waitress import serve
 from app import create_app
+from models import db
+from sqlite_profile import release_sqlite_wal
+import atexit
 import os
 
-app = create_app()
-
+# Spawned worker processes (PDF and import pools) re-run this file as __mp_main__,
+# so the app is only created, and the WAL only released, by the server process itself
 if __name__ == "__main__":
+    # The server runs SQLite in WAL mode so pages stay readable during imports; on exit
+    # the WAL is folded back into app.db so the file can be copied or zipped on its own
+    app = create_app({"SQLITE_WAL": True})
+    with app.app_context():
+        atexit.register(release_sqlite_wal, db.engine)
+
     host = "0.0.0.0"
     port = 5000
     print(f"Starting production server on http://{host}:{port}")
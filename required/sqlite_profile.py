@@ -0,0 +1,78 @@
+"""
+SQLite Profile
+Connection pragmas and pool settings for serving SQLite from several waitress threads
+"""
+
+from typing import Dict
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+# Applied to every new connection; busy_timeout makes writers wait instead of failing
+SQLITE_PRAGMAS = {
+    "busy_timeout": 10000,  # ms
+    "mmap_size": 256 * 1024 * 1024,  # bytes
+    "cache_size": -32000,  # negative = KiB per connection
+    "temp_store": "MEMORY",
+}
+
+# Added when the server opts in (SQLITE_WAL): WAL lets readers run while an import
+# writes, and NORMAL sync is safe under WAL. WAL keeps recent commits in app.db-wal
+# until a checkpoint, so the server folds them back with release_sqlite_wal on exit
+SQLITE_WAL_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+}
+
+# Enough connections for the waitress threads plus the background import worker
+SQLITE_POOL_SIZE = 8
+SQLITE_MAX_OVERFLOW = 8
+
+
+def sqlite_engine_options(uri: str) -> Dict:
+    """Engine options for a file-backed SQLite URI; in-memory databases keep the defaults"""
+    if not uri.startswith("sqlite") or ":memory:" in uri or uri.rstrip("/") == "sqlite:":
+        return {}
+    return {
+        "poolclass": QueuePool,
+        "pool_size": SQLITE_POOL_SIZE,
+        "max_overflow": SQLITE_MAX_OVERFLOW,
+        # Pooled connections move between request threads
+        "connect_args": {"check_same_thread": False, "timeout": SQLITE_PRAGMAS["busy_timeout"] / 1000},
+    }
+
+
+def sqlite_pragmas(wal: bool) -> Dict:
+    """Connection pragmas for the app config, with the WAL pair when wal is set"""
+    return {**SQLITE_WAL_PRAGMAS, **SQLITE_PRAGMAS} if wal else dict(SQLITE_PRAGMAS)
+
+
+def install_sqlite_pragmas(engine, pragmas: Dict = SQLITE_PRAGMAS) -> None:
+    """
+    Run the pragmas on every connection the engine opens (no-op for other databases).
+    Called once per engine, when models.db makes it.
+    """
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
+def release_sqlite_wal(engine) -> None:
+    """
+    Copy every WAL commit into the database file and return it to the rollback journal,
+    which removes app.db-wal and app.db-shm so app.db alone holds the data again
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    engine.dispose()
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.exec_driver_sql("PRAGMA journal_mode = DELETE")
+    engine.dispose()
@@ -0,0 +1,54 @@
+"""
+Test the streamed ZIP of review sheets, rendered inline and in worker processes
+"""
+
+import io
+import zipfile
+import pytest
+from bulk_pdfs import sheet_payload, stream_review_sheets
+from repository import student_evaluations
+
+
+def test_review_sheets_zip_route(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+    rows = [(f"Student {i}", f"USN{i:03d}", "G1" if i < 6 else "", f"Dr. {i % 2}", 40, 42, 45) for i in range(10)]
+    upload(client, make_xlsx(rows))
+
+    response = client.get("/students/review-sheets.zip?phase=1&review=1")
+    assert response.status_code == 200
+    assert response.is_streamed
+    archive = zipfile.ZipFile(io.BytesIO(response.data))
+    assert len(archive.namelist()) == 10
+    assert "Phase1_Review1_USN000_Student_0.pdf" in archive.namelist()
+    assert archive.read("Phase1_Review1_USN000_Student_0.pdf").startswith(b"%PDF")
+
+    group = zipfile.ZipFile(io.BytesIO(client.get("/students/review-sheets.zip?phase=1&review=1&group=G1").data))
+    assert len(group.namelist()) == 6
+    no_group = zipfile.ZipFile(io.BytesIO(client.get("/students/review-sheets.zip?phase=1&review=1&group=").data))
+    assert len(no_group.namelist()) == 4
+    guide = zipfile.ZipFile(io.BytesIO(client.get("/students/review-sheets.zip?phase=1&review=1&guide=Dr. 1").data))
+    assert len(guide.namelist()) == 5
+
+    assert client.get("/students/review-sheets.zip?phase=2&review=2").status_code == 302
+    print("✅ Review sheets download as one ZIP, for a review or one group/guide")
+
+
+def test_review_sheets_render_in_worker_processes(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+    upload(client, make_xlsx([(f"Student {i}", f"USN{i:03d}", "G1", "Dr. Guide", 30, 35, 40) for i in range(6)]))
+
+    with app.app_context():
+        payloads = [sheet_payload(s, ev, 1, 1) for s, ev in student_evaluations(1, 1)]
+    chunks = list(stream_review_sheets(payloads, workers=2))
+    # One chunk per finished sheet plus the central directory
+    assert len(chunks) == 7
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert archive.testzip() is None
+    assert sorted(archive.namelist()) == sorted(f"Phase1_Review1_USN{i:03d}_Student_{i}.pdf" for i in range(6))
+    print("✅ Review sheets render in a process pool and stream into the archive")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q", "-s"]))
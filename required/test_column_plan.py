@@ -0,0 +1,59 @@
+"""
+Verify the compiled column plan maps rows exactly like map_excel_columns_to_criteria
+"""
+
+from upload_helpers import compile_column_plan, map_excel_columns_to_criteria
+
+HEADERS = {
+    "three_evaluators": ["Name", "Seat No", "Member 1", "Member 2", "Internal Guide"],
+    "components_p1r1": ["Name", "USN", "Literature Survey", "Problem Identification", "Presentation", "QA"],
+    "total": ["Student Name", "Seat No", "Group No", "Total"],
+}
+
+ROWS = {
+    "three_evaluators": [("A", "1", 45, 46, 50), ("B", "2", 0, 0, 19), ("C", "3", 31.0, "28", 40)],
+    "components_p1r1": [("A", "1", 18, 9, 8, 7), ("B", "2", 20.0, 10, 10, 10)],
+    "total": [("A", "1", "G1", 44), ("B", "2", "G1", 88), ("C", "3", None, 150)],
+}
+
+
+def _reference(fieldnames, vals, phase, review):
+    plan = compile_column_plan(fieldnames, phase, review)
+    row = {key: (vals[i] if i < len(vals) else None) for i, key in enumerate(fieldnames)}
+    return map_excel_columns_to_criteria(row, plan.key_map, phase, review)
+
+
+def test_plan_matches_row_by_row_mapping():
+    for phase, review in [(1, 1), (1, 2), (2, 1), (2, 2)]:
+        for label, fieldnames in HEADERS.items():
+            plan = compile_column_plan(fieldnames, phase, review)
+            for vals in ROWS[label]:
+                try:
+                    expected = _reference(fieldnames, vals, phase, review)
+                except ValueError as e:
+                    expected = e
+                try:
+                    got = plan.apply(vals)
+                except ValueError as e:
+                    got = e
+                if isinstance(expected, Exception):
+                    assert isinstance(got, ValueError) and str(got) == str(expected)
+                else:
+                    assert got == expected, f"P{phase}R{review} {label} {vals}: {got} != {expected}"
+    print("✅ Column plan matches map_excel_columns_to_criteria for all formats")
+
+
+def test_plan_is_cached_by_header_signature():
+    first = compile_column_plan(["Name", "Seat No", "Total"], 1, 1)
+    again = compile_column_plan(("Name", "Seat No", "Total"), 1, 1)
+    other_review = compile_column_plan(["Name", "Seat No", "Total"], 1, 2)
+    assert first is again
+    assert first is not other_review
+    assert first.mark_format == "total"
+    assert compile_column_plan(["Seat No", "Total"], 1, 1).missing == ["name"]
+    print("✅ Column plans are reused for identical headers")
+
+
+if __name__ == "__main__":
+    test_plan_matches_row_by_row_mapping()
+    test_plan_is_cached_by_header_signature()
@@ -0,0 +1,77 @@
+"""
+Verify read routes answer 304 until an import or script changes their review
+"""
+
+from datetime import date, timedelta
+import pytest
+import app as app_module
+from models import db
+from import_batches import active_evaluations
+
+
+def get(client, url, etag=None):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get(url, headers=headers)
+
+
+def test_conditional_get_follows_data_version(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 40, 40, 40)]))
+
+    first = get(client, "/students?phase=1&review=1")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Last-Modified"]
+    assert get(client, "/students?phase=1&review=1", etag).status_code == 304
+    summary_etag = get(client, "/summary.pdf").headers["ETag"]
+
+    # Another review changes the summary but not the Phase 1 Review 1 pages
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 30, 30, 30)]), review=2)
+    assert get(client, "/students?phase=1&review=1", etag).status_code == 304
+    assert get(client, "/summary.pdf", summary_etag).status_code == 200
+
+    # A re-import with different marks changes the version
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 45, 40, 40)]))
+    changed = get(client, "/students?phase=1&review=1", etag)
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+    # So does an ORM edit made by a fix script
+    etag = changed.headers["ETag"]
+    with app.app_context():
+        ev = active_evaluations(1, 1).one()
+        ev.member1_criteria1 = 1
+        db.session.commit()
+    assert get(client, "/students?phase=1&review=1", etag).status_code == 200
+    print("✅ Read routes revalidate against the per-review data version")
+
+
+class _Tomorrow(date):
+    @classmethod
+    def today(cls):
+        return date.today() + timedelta(days=1)
+
+
+def test_dated_report_is_not_revalidated_the_next_day(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 40, 40, 40)]))
+
+    first = get(client, "/summary.pdf")
+    etag = first.headers["ETag"]
+    assert "Last-Modified" not in first.headers
+    assert get(client, "/summary.pdf", etag).status_code == 304
+
+    app_module.date = _Tomorrow
+    try:
+        next_day = get(client, "/summary.pdf", etag)
+    finally:
+        app_module.date = date
+    assert next_day.status_code == 200
+    assert next_day.headers["ETag"] != etag
+    print("✅ The dated summary PDF is rebuilt on a new day")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q", "-s"]))
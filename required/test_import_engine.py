@@ -0,0 +1,352 @@
+"""
+Test the set-based upload import against a scratch SQLite database
+"""
+
+import io
+import os
+import sqlite3
+import types
+import pytest
+from openpyxl import Workbook
+from openpyxl.styles import Font
+import import_jobs
+from app import create_app
+from models import db, Student, Evaluation, UploadLedger, ImportBatch, ImportErrorRow
+from utils import reverse_engineer_components, score_evaluation
+from import_batches import active_evaluations, active_batch_id
+from upload_helpers import spool_upload, open_streaming_workbook, read_header, iter_row_values
+
+
+def test_bulk_import_creates_students_and_evaluations(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+
+    rows = [(f"Student {i}", f"USN{i:03d}", f"G{i // 4 + 1}", "Dr. Guide", 40, 42, 45) for i in range(1, 51)]
+    status = upload(client, make_xlsx(rows))
+    assert status["status"] == "done"
+    assert status["rows_parsed"] == 50
+    assert status["rows_written"] == 50
+    assert status["created"] == 50
+
+    with app.app_context():
+        assert Student.query.count() == 50
+        evaluations = active_evaluations(1, 1).all()
+        assert len(evaluations) == 50
+
+        ev = active_evaluations(1, 1).join(Student).filter(Student.seat_no == "USN001").one()
+        m1 = reverse_engineer_components(40, 1, 1)
+        assert ev.member1_criteria1 == m1["criteria1"]
+        assert ev.total_marks == ev.criteria1 + ev.criteria2 + ev.criteria3 + ev.criteria4
+        assert (ev.member1_total, ev.member2_total, ev.guide_total) == (40, 42, 45)
+
+        # Criteria edited through the ORM keep every derived score in step
+        ev.member1_criteria1 -= 5
+        db.session.commit()
+        expected = score_evaluation(*({f"criteria{i}": getattr(ev, f"{who}_criteria{i}") for i in range(1, 5)}
+                                      for who in ("member1", "member2", "guide")))
+        assert ev.member1_total == 35
+        assert ev.criteria1 == expected["criteria1"]
+        assert ev.total_marks == expected["total_marks"] == ev.criteria1 + ev.criteria2 + ev.criteria3 + ev.criteria4
+    print("✅ 50 students imported with bulk writes")
+
+
+def test_reimport_updates_existing_students(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+
+    upload(client, make_xlsx([("Old Name", "USN001", "G1", "Dr. A", 30, 30, 30)]))
+    # Blank group keeps the stored value, the name is corrected, duplicate seat rows: last one wins
+    upload(client, make_xlsx([
+        ("New Name", "USN001", None, "Dr. B", 35, 35, 35),
+        ("Newest Name", "USN001", None, None, 40, 40, 40),
+        ("Other", "USN002", "G2", "Dr. B", 20, 20, 20),
+    ]))
+
+    with app.app_context():
+        assert Student.query.count() == 2
+        s = Student.query.filter_by(seat_no="USN001").one()
+        assert s.name == "Newest Name"
+        assert s.group_no == "G1"
+        assert s.project_guide == "Dr. B"
+        evs = active_evaluations(1, 1).filter_by(student_id=s.id).all()
+        assert len(evs) == 1
+        assert evs[0].total_marks == 40
+    print("✅ Re-import keeps uq_eval_student_phase_review and update semantics")
+
+
+def test_reimport_writes_only_the_diff(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+
+    rows = [(f"Student {i}", f"USN{i:03d}", "G1", "Dr. Guide", 40, 40, 40) for i in range(1, 21)]
+    upload(client, make_xlsx(rows))
+    with app.app_context():
+        first_batch = active_batch_id(1, 1)
+
+    # One corrected mark, one student dropped, one student added
+    rows[0] = ("Student 1", "USN001", "G1", "Dr. Guide", 45, 40, 40)
+    rows = rows[:-1] + [("Student 21", "USN021", "G2", "Dr. Guide", 30, 30, 30)]
+    status = upload(client, make_xlsx(rows))
+    assert status["changes"]["Phase 1 Review 1"] == {"inserted": 1, "updated": 1, "deleted": 1, "unchanged": 18}
+    assert status["rows_written"] == 3
+    assert "1 added, 1 updated, 1 removed, 18 unchanged" in status["message"]
+
+    with app.app_context():
+        assert active_evaluations(1, 1).count() == 20
+        assert active_evaluations(1, 1).join(Student).filter(Student.seat_no == "USN020").count() == 0
+        # The previous import is kept untouched for rollback
+        assert active_batch_id(1, 1) != first_batch
+        assert Evaluation.query.filter_by(import_batch_id=first_batch).count() == 20
+
+    # Identical data publishes nothing new
+    status = upload(client, make_xlsx(rows + [("Student 21", "USN021", "G2", "Dr. Guide", 30, 30, 30)]))
+    assert status["rows_written"] == 0
+    with app.app_context():
+        assert ImportBatch.query.filter_by(phase=1, review_no=1).count() == 2
+    print("✅ Re-import writes only inserts, updates and deletes that are needed")
+
+
+def test_rollback_restores_previous_import(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 40, 40, 40)]))
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 20, 20, 20), ("B", "USN002", "G1", "Dr. Guide", 30, 30, 30)]))
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 10, 10, 10)]))
+    with app.app_context():
+        # Only the active batch and one previous batch are kept with rows
+        assert Evaluation.query.filter_by(phase=1, review_no=1).count() == 3
+
+    response = client.post("/upload/rollback", data={"phase": "1", "review": "1"})
+    assert response.status_code == 302
+    with app.app_context():
+        assert sorted(ev.total_marks for ev in active_evaluations(1, 1)) == [20, 30]
+        assert active_evaluations(1, 2).count() == 0
+
+    # Nothing older is kept, so a second rollback is refused
+    client.post("/upload/rollback", data={"phase": "1", "review": "1"})
+    with app.app_context():
+        assert active_evaluations(1, 1).count() == 2
+    print("✅ Rollback republishes the previous import instantly")
+
+
+def test_rollback_after_undo_restores_the_replaced_batch(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+
+    def live_totals():
+        with app.app_context():
+            return sorted(ev.total_marks for ev in active_evaluations(1, 1))
+
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 30, 30, 30)]))
+    first = live_totals()
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 40, 40, 40)]))
+    client.post("/upload/rollback", data={"phase": "1", "review": "1"})
+    assert live_totals() == first
+
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 20, 20, 20)]))
+    assert live_totals() != first
+    client.post("/upload/rollback", data={"phase": "1", "review": "1"})
+    assert live_totals() == first
+    print("✅ Undo after undo-and-import restores the batch that was replaced")
+
+
+def test_rolled_back_upload_can_be_imported_again(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 30, 30, 30)]))
+    undone = make_xlsx([("A", "USN001", "G1", "Dr. Guide", 40, 40, 40)]).getvalue()
+    upload(client, io.BytesIO(undone))
+    client.post("/upload/rollback", data={"phase": "1", "review": "1"})
+
+    status = upload(client, io.BytesIO(undone))
+    assert status["status"] == "done"
+    assert status["changes"]["Phase 1 Review 1"]["updated"] == 1
+    print("✅ An undone upload is not mistaken for the live import")
+
+
+def test_legacy_evaluation_table_is_migrated(tmp_path):
+    tmp_dir = tmp_path
+    path = os.path.join(tmp_dir, "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE student (id INTEGER PRIMARY KEY, group_no VARCHAR(50), project_title VARCHAR(255),
+                              project_guide VARCHAR(128), seat_no VARCHAR(64) NOT NULL, name VARCHAR(128) NOT NULL);
+        CREATE INDEX ix_student_seat_no ON student (seat_no);
+        CREATE TABLE evaluation (id INTEGER PRIMARY KEY, phase INTEGER DEFAULT 1 NOT NULL,
+            review_no INTEGER DEFAULT 1 NOT NULL, total_marks INTEGER NOT NULL,
+            criteria1 INTEGER NOT NULL, criteria2 INTEGER NOT NULL, criteria3 INTEGER NOT NULL, criteria4 INTEGER NOT NULL,
+            member1_criteria1 INTEGER, member1_criteria2 INTEGER, member1_criteria3 INTEGER, member1_criteria4 INTEGER,
+            member2_criteria1 INTEGER, member2_criteria2 INTEGER, member2_criteria3 INTEGER, member2_criteria4 INTEGER,
+            guide_criteria1 INTEGER, guide_criteria2 INTEGER, guide_criteria3 INTEGER, guide_criteria4 INTEGER,
+            student_id INTEGER NOT NULL REFERENCES student(id), UNIQUE (student_id, phase, review_no));
+        INSERT INTO student (id, seat_no, name) VALUES (1, 'USN001', 'A');
+        INSERT INTO evaluation (phase, review_no, total_marks, criteria1, criteria2, criteria3, criteria4, student_id)
+            VALUES (1, 2, 40, 10, 10, 10, 10, 1);
+    """)
+    conn.close()
+
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"})
+    with app.app_context():
+        assert active_evaluations(1, 2).one().total_marks == 40
+        assert active_batch_id(2, 2) is not None
+        # Scripts that insert without a batch write into the published one
+        db.session.add(Evaluation(student_id=1, phase=2, review_no=1, total_marks=8,
+                                  criteria1=2, criteria2=2, criteria3=2, criteria4=2))
+        db.session.commit()
+        assert active_evaluations(2, 1).count() == 1
+    print("✅ Existing evaluation tables are migrated into batches")
+
+
+def test_identical_reupload_is_skipped(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+
+    file_a = make_xlsx([("A", "USN001", "G1", "Dr. Guide", 40, 40, 40)]).getvalue()
+    file_b = make_xlsx([("A", "USN001", "G1", "Dr. Guide", 30, 30, 30)]).getvalue()
+
+    assert upload(client, io.BytesIO(file_a))["status"] == "done"
+    response = client.post("/upload", data={"phase": "1", "review": "1", "file": (io.BytesIO(file_a), "a.xlsx")},
+                           content_type="multipart/form-data")
+    assert "job=" not in response.headers["Location"]
+    assert "/students" in response.headers["Location"]
+
+    # The same bytes for another review, or after a different file, are imported again
+    assert upload(client, io.BytesIO(file_a), review=2)["status"] == "done"
+    assert upload(client, io.BytesIO(file_b))["status"] == "done"
+    assert upload(client, io.BytesIO(file_a))["status"] == "done"
+
+    with app.app_context():
+        assert UploadLedger.query.count() == 4
+        entry = UploadLedger.query.order_by(UploadLedger.id.desc()).first()
+        assert (entry.phase, entry.review_no, entry.rows_parsed, entry.rows_written) == (1, 1, 1, 1)
+        assert active_evaluations(1, 1).one().total_marks == 40
+    print("✅ Identical re-uploads short-circuit on the content hash")
+
+
+def test_multi_sheet_upload_imports_every_review(make_app, upload):
+    app = make_app()
+    client = app.test_client()
+
+    header = ["Name", "Seat No", "Group No", "Project Guide", "Member 1", "Member 2", "Internal Guide"]
+    wb = Workbook()
+    wb.active.title = "Notes"
+    for title, mark in (("Phase 1 Review 1", 30), ("P1R2", 35), ("PHASE - II REVIEW - I", 40)):
+        ws = wb.create_sheet(title)
+        ws.append(header)
+        for i in range(1, 11):
+            ws.append([f"Student {i}", f"USN{i:03d}", "G1", "Dr. Guide", mark, mark, mark])
+    buf = io.BytesIO()
+    wb.save(buf)
+    buf.seek(0)
+
+    status = upload(client, buf, mode="all_sheets")
+    assert status["status"] == "done", status["message"]
+    assert status["created"] == 30
+    assert status["rows_parsed"] == 30
+
+    with app.app_context():
+        assert Student.query.count() == 10
+        for (phase, review), mark in (((1, 1), 30), ((1, 2), 35), ((2, 1), 40)):
+            evs = active_evaluations(phase, review).all()
+            assert len(evs) == 10
+            assert all(ev.total_marks == mark for ev in evs)
+        assert active_evaluations(2, 2).count() == 0
+    print("✅ Multi-sheet upload imports each review in one job")
+
+
+def test_invalid_upload_fails_job(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+
+    status = upload(client, io.BytesIO(b"not a workbook"))
+    assert status["status"] == "failed"
+    assert "Could not read the .xlsx file" in status["message"]
+
+    status = upload(client, make_xlsx([("A", 40)], header=("Name", "Total")))
+    assert status["status"] == "failed"
+    assert "seat_no" in status["message"]
+    print("✅ Unreadable or incomplete uploads are reported on the job")
+
+
+def test_failed_bookkeeping_still_finishes_job(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("ledger unavailable")
+
+    rows = [("Asha", "USN001", "G1", "Dr. A", 40, 42, 45), ("Ravi", "USN002", "G1", "Dr. A", "absent", 42, 45)]
+    originals = import_jobs.record_import, import_jobs.record_import_errors
+    import_jobs.record_import = import_jobs.record_import_errors = broken
+    try:
+        status = upload(client, make_xlsx(rows))
+    finally:
+        import_jobs.record_import, import_jobs.record_import_errors = originals
+    # The marks were published, so the job is done and only warns about the bookkeeping
+    assert status["status"] == "done"
+    assert status["message"].count("Warning:") == 2 and "ledger unavailable" in status["message"]
+    assert status["error_count"] == 0
+    with app.app_context():
+        assert active_evaluations(1, 1).one().student.name == "Asha"
+        assert UploadLedger.query.count() == 0
+    print("✅ A job whose bookkeeping fails after publishing finishes with a warning")
+
+
+def test_row_errors_are_stored_server_side(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+
+    # No mark columns: every row is a row error, but the students are still imported
+    rows = [(f"Student {i}", f"USN{i:03d}", "G1") for i in range(1, 121)]
+    status = upload(client, make_xlsx(rows, header=("Name", "Seat No", "Group No")))
+    assert status["status"] == "done"
+    assert status["error_count"] == 120
+    assert "errors" not in status
+
+    with app.app_context():
+        assert Student.query.count() == 120
+        assert ImportErrorRow.query.filter_by(import_id=status["id"]).count() == 120
+        first = ImportErrorRow.query.filter_by(import_id=status["id"]).order_by(ImportErrorRow.id).first()
+        assert (first.row_no, first.student_name) == (2, "Student 1")
+
+    page = client.get(status["errors_url"]).get_data(as_text=True)
+    assert "Page 1 of 3" in page
+    assert "Student 1<" in page and "Student 51<" not in page
+    page = client.get(status["errors_url"] + "?page=3").get_data(as_text=True)
+    assert "Student 120<" in page
+    print("✅ Row errors are kept in a paginated server-side report")
+
+
+def test_streaming_reader_ignores_stray_formatting():
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Name", "Seat No", "Total"])
+    for i in range(1, 201):
+        ws.append([f"Student {i}", f"USN{i:03d}", 40])
+    # Formatting far outside the data stretches the stored sheet dimensions
+    ws["ZZ5000"].font = Font(bold=True)
+    buf = io.BytesIO()
+    wb.save(buf)
+    buf.seek(0)
+
+    path = spool_upload(buf)
+    try:
+        rwb = open_streaming_workbook(path)
+        fieldnames = read_header(rwb.active)
+        assert fieldnames == ["Name", "Seat No", "Total"]
+        rows = iter_row_values(rwb.active, len(fieldnames))
+        assert isinstance(rows, types.GeneratorType)
+        first = next(rows)
+        assert first == ("Student 1", "USN001", 40)
+        named = [r for r in rows if r[0]]
+        assert len(named) == 199
+        rwb.close()
+    finally:
+        os.remove(path)
+    print("✅ Streaming reader yields header-width rows lazily")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q", "-s"]))
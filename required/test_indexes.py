@@ -0,0 +1,94 @@
+"""
+Check that the read routes use the query indexes and that older databases get them
+"""
+
+import os
+import sqlite3
+import pytest
+from sqlalchemy import event, inspect
+from app import create_app
+from models import db, Student
+from import_batches import active_evaluations
+
+ROUTES = [
+    "/students?phase=1&review=1",
+    "/students/individual?phase=1&review=1",
+    "/students/groupwise?phase=1&review=1",
+    "/students/guidewise?phase=1&review=1",
+    "/export.csv?phase=1&review=1",
+]
+
+
+def query_plans(app, client, url):
+    """(statement, EXPLAIN QUERY PLAN) of every student/evaluation query a route runs"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM student" in statement or "FROM evaluation" in statement:
+            statements.append((statement, parameters))
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", capture)
+        try:
+            assert client.get(url).status_code == 200
+        finally:
+            event.remove(db.engine, "before_cursor_execute", capture)
+        with db.engine.connect() as conn:
+            return [
+                (statement, [row[-1] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)])
+                for statement, parameters in statements
+            ]
+
+
+def test_routes_use_the_review_index(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+    rows = [(f"Student {i}", f"USN{i:03d}", f"G{i % 7}", f"Dr. {i % 3}", 40, 42, 45) for i in range(200)]
+    upload(client, make_xlsx(rows))
+
+    for url in ROUTES:
+        plans = query_plans(app, client, url)
+        assert plans, url
+        for statement, plan in plans:
+            assert any("evaluation USING INDEX ix_eval_phase_review_batch_student" in step for step in plan), (url, plan)
+            # Students are reached by primary key; review statistics read evaluations only
+            if "JOIN student" in statement or "FROM student" in statement:
+                assert any("student USING INTEGER PRIMARY KEY" in step for step in plan), (url, plan)
+            assert not any(step.startswith("SCAN") for step in plan), (url, plan)
+    print("✅ Every read route searches evaluations by the review index")
+
+
+def test_duplicate_seat_numbers_are_merged_before_unique_index(tmp_path):
+    tmp_dir = tmp_path
+    path = os.path.join(tmp_dir, "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE student (id INTEGER PRIMARY KEY, group_no VARCHAR(50), project_title VARCHAR(255),
+                              project_guide VARCHAR(128), seat_no VARCHAR(64) NOT NULL, name VARCHAR(128) NOT NULL);
+        CREATE INDEX ix_student_seat_no ON student (seat_no);
+        CREATE TABLE evaluation (id INTEGER PRIMARY KEY, phase INTEGER DEFAULT 1 NOT NULL,
+            review_no INTEGER DEFAULT 1 NOT NULL, total_marks INTEGER NOT NULL,
+            criteria1 INTEGER NOT NULL, criteria2 INTEGER NOT NULL, criteria3 INTEGER NOT NULL, criteria4 INTEGER NOT NULL,
+            member1_criteria1 INTEGER, member1_criteria2 INTEGER, member1_criteria3 INTEGER, member1_criteria4 INTEGER,
+            member2_criteria1 INTEGER, member2_criteria2 INTEGER, member2_criteria3 INTEGER, member2_criteria4 INTEGER,
+            guide_criteria1 INTEGER, guide_criteria2 INTEGER, guide_criteria3 INTEGER, guide_criteria4 INTEGER,
+            student_id INTEGER NOT NULL REFERENCES student(id), UNIQUE (student_id, phase, review_no));
+        INSERT INTO student (id, seat_no, name) VALUES (1, 'USN001', 'A'), (2, 'USN001', 'A again');
+        INSERT INTO evaluation (phase, review_no, total_marks, criteria1, criteria2, criteria3, criteria4, student_id)
+            VALUES (1, 1, 40, 10, 10, 10, 10, 1), (1, 1, 20, 5, 5, 5, 5, 2), (1, 2, 30, 8, 8, 7, 7, 2);
+    """)
+    conn.close()
+
+    app = create_app({"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"})
+    with app.app_context():
+        assert Student.query.count() == 1
+        # The first student keeps its own marks and takes over the ones it lacked
+        assert active_evaluations(1, 1).one().total_marks == 40
+        assert active_evaluations(1, 2).one().student_id == 1
+        indexes = {ix["name"]: ix for ix in inspect(db.engine).get_indexes("student")}
+        assert indexes["ix_student_seat_no"]["unique"]
+    print("✅ Duplicate seat numbers are merged and seat_no becomes unique")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,99 @@
+"""
+Test the shared college logo and letterhead forms
+"""
+
+import io
+import os
+import re
+import subprocess
+import sys
+from reportlab import rl_config
+from reportlab.lib.enums import TA_CENTER
+from reportlab.pdfgen.canvas import Canvas
+from bench_pdf_report import make_report_data
+from comprehensive_pdf_template import build_comprehensive_pdf
+from pdf_assets import LOGO_FORM, REPORTLAB_VERSION, capture_drawing, draw_logo, letterhead, prepare_letterhead, replay_drawing
+from pdf_styles import paragraph_style
+
+
+def test_report_embeds_logo_and_letterhead_once():
+    data = make_report_data(6)
+    data[(1, 2)] = data[(2, 1)] = data[(1, 1)]
+    compression = rl_config.pageCompression
+    rl_config.pageCompression = 0
+    try:
+        first = build_comprehensive_pdf(data).getvalue()
+        second = build_comprehensive_pdf(data).getvalue()
+    finally:
+        rl_config.pageCompression = compression
+
+    for pdf in (first, second):
+        assert pdf.count(b"/Subtype /Image") == 1
+        assert pdf.count(b"/Subtype /Form") == 1
+        # One letterhead per section, all drawing the same form
+        assert len(re.findall(rb"/FormXob\.letterhead_\S+ Do", pdf)) == 3
+        assert b"GURU NANAK DEV ENGINEERING COLLEGE" in pdf
+    print("✅ Logo and letterhead are embedded once per PDF")
+
+
+def test_letterhead_is_prepared_once_and_maps_fonts():
+    style = paragraph_style(fontName='Helvetica-Bold', fontSize=13, alignment=TA_CENTER, spaceAfter=4, leading=16)
+    assert prepare_letterhead(style) is prepare_letterhead(style)
+
+    buffer = io.BytesIO()
+    canv = Canvas(buffer, pageCompression=0)
+    canv.setFont("Courier", 10)
+    head = letterhead(style)
+    head.wrapOn(canv, 500, 500)
+    head.drawOn(canv, 40, 700)
+    canv.showPage()
+    canv.save()
+    pdf = buffer.getvalue()
+    bold = canv._doc.getInternalFontName("Helvetica-Bold").encode()
+    assert bold + b" 13 Tf" in pdf
+    assert b"Courier" in pdf and b"/Subtype /Image" in pdf
+    print("✅ Letterhead is drawn once per process and uses each PDF's font names")
+
+
+def test_captured_drawing_replays_into_another_pdf():
+    scratch = Canvas(io.BytesIO())
+    scratch.setFont("Helvetica-Bold", 12)
+    scratch.drawString(10, 10, "Replayed")
+    assert draw_logo(scratch, 20, 20)
+    drawing = capture_drawing(scratch)
+
+    # The target PDF registers other fonts first, so the resource names differ
+    buffer = io.BytesIO()
+    canv = Canvas(buffer, pageCompression=0)
+    canv.setFont("Courier", 10)
+    canv.setFont("Times-Roman", 10)
+    replay_drawing(canv, drawing)
+    canv.showPage()
+    canv.save()
+    pdf = buffer.getvalue()
+    bold = canv._doc.getInternalFontName("Helvetica-Bold").encode()
+    assert bold not in (b"/F1", b"/F2") and bold + b" 12 Tf" in pdf and b"(Replayed) Tj" in pdf
+    # The logo is embedded and declared in the page resources
+    assert pdf.count(b"/Subtype /Image") == 1
+    assert re.search(rb"/XObject <<\s*/FormXob\.%s \d+ 0 R" % LOGO_FORM.encode(), pdf)
+    print("✅ Captured drawings keep their fonts and logo in another PDF")
+
+
+def test_other_reportlab_version_is_refused():
+    # capture_drawing/replay_drawing read canvas internals, checked for the pinned ReportLab only
+    with open(os.path.join(os.path.dirname(__file__), "requirements.txt")) as f:
+        assert f"reportlab=={REPORTLAB_VERSION}\n" in f.read()
+    # A fresh interpreter, since pdf_assets is already imported here
+    probe = "import reportlab; reportlab.Version = '0.0'; import pdf_assets"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True)
+    assert result.returncode != 0
+    assert f"RuntimeError: pdf_assets relies on ReportLab {REPORTLAB_VERSION}" in result.stderr, result.stderr
+    print("✅ pdf_assets refuses a ReportLab version its canvas internals were not checked against")
+
+
+if __name__ == "__main__":
+    test_report_embeds_logo_and_letterhead_once()
+    test_letterhead_is_prepared_once_and_maps_fonts()
+    test_captured_drawing_replays_into_another_pdf()
+    test_other_reportlab_version_is_refused()
@@ -0,0 +1,116 @@
+"""
+Test the overlay review sheets against the full platypus layout
+"""
+
+import re
+from types import SimpleNamespace
+import pytest
+from reportlab import rl_config
+from pdf_overlay import build_review1_pdf_fast, review_form
+from pdf_template import build_review1_pdf
+from repository import student_evaluations
+
+
+def page_words(pdf: bytes):
+    return sorted(b" ".join(re.findall(rb"\(([^()]*)\) Tj", pdf)).split())
+
+
+_TOKEN = re.compile(rb"\((?:\\.|[^\\)])*\)|[^\s\[\]]+")
+_NUMBER = re.compile(rb"-?[\d.]+")
+
+
+def placed_text(pdf: bytes):
+    """(x, y, string) of every non-blank string shown by the page streams of an uncompressed PDF"""
+    placed = []
+    for head, body in re.findall(rb"obj\s*<<(.*?)>>\s*stream\r?\n(.*?)endstream", pdf, re.S):
+        if b"/Subtype" in head:
+            continue  # images and forms, e.g. the letterhead of the full layout
+        ctm, saved, args = (1, 0, 0, 1, 0, 0), [], []
+        line, leading = [0.0, 0.0], 0.0
+        for token in _TOKEN.findall(body):
+            if token[:1] in (b"(", b"/") or _NUMBER.fullmatch(token):
+                args.append(token)
+                continue
+            nums = [float(a) for a in args if _NUMBER.fullmatch(a)]
+            if token == b"q":
+                saved.append(ctm)
+            elif token == b"Q":
+                ctm = saved.pop()
+            elif token == b"cm":
+                a, b, c, d, e, f = nums
+                A, B, C, D, E, F = ctm
+                ctm = (a*A + b*C, a*B + b*D, c*A + d*C, c*B + d*D, e*A + f*C + E, e*B + f*D + F)
+            elif token == b"BT":
+                line = [0.0, 0.0]
+            elif token == b"Tm":
+                line = nums[4:6]
+            elif token == b"TL":
+                leading = nums[0]
+            elif token == b"Td":
+                line = [line[0] + nums[0], line[1] + nums[1]]
+            elif token == b"T*":
+                line = [line[0], line[1] - leading]
+            elif token == b"Tj" and args[-1].strip(b"() "):
+                A, B, C, D, E, F = ctm
+                placed.append((line[0]*A + line[1]*C + E, line[0]*B + line[1]*D + F, args[-1]))
+            args = []
+    return placed
+
+
+def assert_same_placement(full: bytes, fast: bytes):
+    """Every string of the full layout's page is drawn at the same spot on the overlay sheet"""
+    drawn = placed_text(fast)
+    for x, y, text in placed_text(full):
+        assert any(t == text and abs(x - fx) < 0.5 and abs(y - fy) < 0.5 for fx, fy, t in drawn), (x, y, text)
+
+
+def build_both(student, ev):
+    compression = rl_config.pageCompression
+    rl_config.pageCompression = 0
+    try:
+        return build_review1_pdf(student, ev).getvalue(), build_review1_pdf_fast(student, ev).getvalue()
+    finally:
+        rl_config.pageCompression = compression
+
+
+def test_overlay_sheet_shows_the_same_values(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+    upload(client, make_xlsx([("Asha Rao", "3GN21CS001", "G4", "Dr. Guide", 40, 38, 44)]))
+
+    with app.app_context():
+        student, ev = student_evaluations(1, 1)[0]
+        full, fast = build_both(student, ev)
+
+    assert fast.startswith(b"%PDF") and fast.count(b"/Type /Page\n") == 1
+    # Every string of the full layout appears on the overlay sheet, values included
+    words = page_words(fast)
+    assert b"3GN21CS001" in words and b"Asha" in words
+    assert page_words(full) == words
+    # A short title takes one line, so the table starts where the full layout puts it
+    assert_same_placement(full, fast)
+    # The form is laid out once per phase/review
+    assert review_form(1, 1) is review_form(1, 1)
+    print("✅ Overlay review sheets carry the same text as the full layout")
+
+
+def test_long_name_and_title_wrap_like_the_full_layout():
+    marks = {f"{evaluator}_criteria{i}": 8 for evaluator in ("member1", "member2", "guide") for i in range(1, 5)}
+    ev = SimpleNamespace(phase=1, review_no=2, total_marks=36, **marks, **{f"criteria{i}": 9 for i in range(1, 5)})
+    for name in ("Mohammed Abdul Rahman Siddiqui", "Venkatanarasimharajuvaripeta Srinivas"):
+        student = SimpleNamespace(
+            seat_no="3GN21CS001", name=name, group_no="G12-AIML-SECTION-B",
+            project_title="Design and Implementation of a Scalable Real-Time Attendance Monitoring "
+                          "System Using Face Recognition, Edge Computing and Cloud Synchronisation",
+        )
+        full, fast = build_both(student, ev)
+        assert fast.count(b"/Type /Page\n") == 1
+        assert page_words(full) == page_words(fast)
+        assert_same_placement(full, fast)
+        # Too wide for one line of the 32mm name column, so never drawn as one string
+        assert f"({name})".encode() not in [text for _, _, text in placed_text(fast)]
+    print("✅ Long names and titles wrap and sit where the full layout puts them")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,39 @@
+"""
+Test the shared PDF styles and plain-string table cells
+"""
+
+from reportlab.lib.enums import TA_LEFT
+from reportlab.platypus import Paragraph
+from bench_pdf_report import make_report_data
+from comprehensive_pdf_template import build_comprehensive_pdf
+from pdf_styles import column_style, paragraph_style, table_cell
+
+
+def test_styles_and_cells_are_shared():
+    style = paragraph_style(fontSize=9, alignment=TA_LEFT)
+    assert paragraph_style(alignment=TA_LEFT, fontSize=9) is style
+    assert paragraph_style(fontSize=8, alignment=TA_LEFT) is not style
+
+    assert table_cell("Asha Rao", style, 95) == "Asha Rao"
+    wrapped = table_cell("Averyveryverylongname Withsurname & Co", style, 95)
+    assert isinstance(wrapped, Paragraph)
+    assert "&amp;" in wrapped.text
+
+    commands = dict((cmd[0], cmd[3]) for cmd in column_style(3, style))
+    assert commands["FONTSIZE"] == 9 and commands["LEADING"] == style.leading and commands["ALIGN"] == "LEFT"
+    print("✅ Paragraph styles are shared and short cells stay plain strings")
+
+
+def test_comprehensive_report_with_plain_cells():
+    data = make_report_data(120)
+    student = data[(1, 1)]["groups"]["G1"][0][0]
+    student.name = "Averyveryverylongname Withsurname Andmore"
+    pdf = build_comprehensive_pdf(data).getvalue()
+    assert pdf.startswith(b"%PDF")
+    assert len(pdf) > 10000
+    print("✅ Comprehensive report builds from plain cells and wrapped Paragraphs")
+
+
+if __name__ == "__main__":
+    test_styles_and_cells_are_shared()
+    test_comprehensive_report_with_plain_cells()
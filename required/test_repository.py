@@ -0,0 +1,114 @@
+"""
+Verify the list views run a constant number of queries and page by keyset
+"""
+
+import pytest
+from sqlalchemy import event
+from models import db
+from repository import grouped_evaluations
+
+VIEWS = [
+    "/students?phase=1&review=1",
+    "/students/groupwise?phase=1&review=1",
+    "/students/guidewise?phase=1&review=1",
+    "/students/individual?phase=1&review=1",
+    "/export.csv?phase=1&review=1",
+]
+
+
+def count_queries(app, client, url):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200, url
+    return len(statements)
+
+
+def test_query_count_does_not_grow_with_cohort(make_app, make_xlsx, upload):
+    counts = {}
+    for size in (5, 60):
+        app = make_app()
+        client = app.test_client()
+        rows = [(f"Student {i}", f"USN{i:03d}", f"G{i // 4 + 1}", f"Dr. Guide {i % 3}", 40, 42, 45)
+                for i in range(1, size + 1)]
+        assert upload(client, make_xlsx(rows))["status"] == "done"
+        counts[size] = {url: count_queries(app, client, url) for url in VIEWS}
+
+    for url in VIEWS:
+        assert counts[5][url] == counts[60][url], f"{url}: {counts[5][url]} vs {counts[60][url]} queries"
+        # data version lookup + joined rows (+ class statistics on the individual view)
+        assert counts[60][url] <= 3, f"{url}: {counts[60][url]} queries"
+    print("✅ List views use one joined query regardless of cohort size")
+
+
+def test_keyset_pages_cover_every_student_once(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+    # Blank groups and repeated names exercise every column of the (group_no, name, id) key
+    rows = [(f"Student {i % 90}", f"USN{i:03d}", f"G{i % 7}" if i % 5 else None, "Dr. Guide", 20 + i % 30, 30, 30)
+            for i in range(1, 251)]
+    assert upload(client, make_xlsx(rows))["status"] == "done"
+
+    page = client.get("/students?phase=1&review=1").get_data(as_text=True)
+    assert page.count("Download PDF</a>") == 100
+    assert 'id="load-more"' in page
+
+    seats = []
+    chunk = {"next": page.split('data-next="')[1].split('"')[0], "count": 100}
+    start = 100
+    while chunk["next"]:
+        chunk = client.get(f"/students/rows?view=list&phase=1&review=1&after={chunk['next']}&start={start}").get_json()
+        seats.extend(part.split("<")[0] for part in chunk["html"].split("<td>USN")[1:])
+        assert f"<td>{start + 1}</td>" in chunk["html"]
+        start += chunk["count"]
+    assert start == 250
+    assert len(seats) == len(set(seats)) == 150
+
+    individual = client.get("/students/individual?phase=1&review=1").get_data(as_text=True)
+    assert "250</span>" in individual
+    chunk = client.get("/students/rows?view=individual&phase=1&review=1").get_json()
+    assert chunk["count"] == 100 and chunk["next"]
+    print("✅ Student tables page by keyset and load more rows as JSON chunks")
+
+
+def test_grouped_sections_aggregate_in_sql(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+    rows = [
+        ("A", "USN001", "G2", " Dr. X ", 40, 40, 40),
+        ("B", "USN002", "G2", "Dr. X", 20, 20, 20),
+        ("C", "USN003", None, "Dr. Y", 30, 30, 30),
+        ("D", "USN004", "G1", None, 50, 50, 50),
+    ]
+    assert upload(client, make_xlsx(rows))["status"] == "done"
+
+    with app.app_context():
+        groups = grouped_evaluations(1, 1, by="group")
+        assert [(g["label"], g["count"]) for g in groups] == [("No Group", 1), ("G1", 1), ("G2", 2)]
+        g2 = groups[2]
+        assert (g2["min_total"], g2["max_total"], g2["avg_total"]) == (20, 40, 30.0)
+        assert [s.name for s, _ in g2["members"]] == ["A", "B"]
+        assert sum(g2["avg_criteria"]) == g2["avg_total"]
+
+        guides = grouped_evaluations(1, 1, by="guide")
+        # Guide names are trimmed before grouping; students without a guide are left out
+        assert [(g["label"], g["count"]) for g in guides] == [("Dr. X", 2), ("Dr. Y", 1)]
+
+    page = client.get("/students/groupwise?phase=1&review=1").get_data(as_text=True)
+    assert "Group G2 (2 students)" in page and "Group average (min 20, max 40)" in page
+    page = client.get("/students/guidewise?phase=1&review=1").get_data(as_text=True)
+    assert "Dr. X (2 students)" in page and "min 20 / max 40" in page
+    print("✅ Group-wise and guide-wise sections come from GROUP BY queries")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q", "-s"]))
@@ -0,0 +1,100 @@
+"""
+Test the versioned result cache and its use by the export routes
+"""
+
+import pytest
+from result_cache import ResultCache
+
+
+def test_lru_eviction_and_spill(tmp_path):
+    cache = ResultCache(max_bytes=10)
+    cache.put("a-v1", b"12345")
+    cache.put("b-v1", b"12345")
+    assert cache.get("a-v1") == b"12345"  # a is now most recent
+    cache.put("c-v1", b"12345")
+    assert cache.get("b-v1") is None
+    assert cache.get("a-v1") == b"12345"
+    assert cache.size == 10
+
+    spill_dir = tmp_path
+    cache = ResultCache(max_bytes=10, spill_dir=spill_dir)
+    cache.put("report-p1r1-v1", b"12345", "report-p1r1")
+    cache.put("report-p1r1-v2", b"67890", "report-p1r1")
+    cache.put("other-v1", b"abcde", "other")
+    # Evicted results are read back from disk
+    assert cache.get("report-p1r1-v1", "report-p1r1") == b"12345"
+    cache.put("report-p1r1-v3", b"x" * 20, "report-p1r1")
+    # Only the newest version of a result is kept on disk
+    assert len(list(spill_dir.glob("report_p1r1.*.cache"))) == 1
+    assert cache.get("report-p1r1-v3", "report-p1r1") == b"x" * 20
+    cache.clear()
+    assert not list(spill_dir.glob("*.cache"))
+    print("✅ Result cache evicts least recently used entries and spills to disk")
+
+
+def test_new_data_version_replaces_spilled_daily_result(make_app, make_xlsx, upload, tmp_path):
+    app = make_app()
+    client = app.test_client()
+    # Every result is too large to keep in memory, so each one goes straight to disk
+    app.extensions["result_cache"] = ResultCache(max_bytes=1, spill_dir=tmp_path / "cache")
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 40, 40, 40)]))
+    client.get("/summary.pdf")
+    first = list((tmp_path / "cache").glob("*.cache"))
+    assert len(first) == 1
+
+    # The summary's key holds every review's version and today's date
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 20, 20, 20)]))
+    client.get("/summary.pdf")
+    second = list((tmp_path / "cache").glob("*.cache"))
+    assert len(second) == 1 and second != first
+    print("✅ A new data version replaces the spilled copy of a daily result")
+
+
+def test_exports_are_served_from_cache_until_data_changes(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+    cache = app.extensions["result_cache"]
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 40, 40, 40)]))
+
+    first = client.get("/export.csv?phase=1&review=1").data
+    assert cache.size == len(first)
+    assert client.get("/export.csv?phase=1&review=1").data == first
+    client.get("/students/groupwise?phase=1&review=1")
+    client.get("/summary.pdf")
+    cached_keys = set(cache._entries)
+    assert len(cached_keys) == 3
+
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 20, 20, 20)]))
+    second = client.get("/export.csv?phase=1&review=1").data
+    assert second != first
+    assert len(set(cache._entries) - cached_keys) == 1
+    print("✅ Exports are cached per data version")
+
+
+def test_export_csv_streams_in_chunks(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+    cache = app.extensions["result_cache"]
+    rows = [(f"Student {i}", f"USN{i:04d}", f"G{i // 4}", "Dr. Guide", 40, 41, 42) for i in range(1200)]
+    upload(client, make_xlsx(rows))
+
+    # A download abandoned after the first chunk is not cached
+    response = client.get("/export.csv?phase=1&review=1", buffered=False)
+    assert response.is_streamed
+    assert next(iter(response.response)).startswith(b"group_no,")
+    response.close()
+    assert cache.size == 0
+
+    response = client.get("/export.csv?phase=1&review=1", buffered=False)
+    chunks = list(response.response)
+    response.close()
+    assert len(chunks) == 3  # 1201 lines in chunks of 500
+    body = b"".join(chunks)
+    assert body.count(b"\r\n") == 1201
+    assert cache.get(next(iter(cache._entries))) == body
+    assert client.get("/export.csv?phase=1&review=1").data == body
+    print("✅ The export CSV streams in chunks and caches the finished file")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q", "-s"]))
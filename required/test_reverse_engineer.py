@@ -74,3 +74,18 @@ if list(avg_p2r2.values()) == [14, 14, 9, 9]:
     print(f"  Got: [14, 14, 9, 9]")
 else:
     print("✓ P2R2 is different from P2R1 - Code is correct!")
+
+
+def test_lookup_table_matches_hamilton():
+    from utils import _hamilton_components, reverse_engineer_batch, WEIGHTS, TOTAL_MAX
+    from review_config import REVIEW_CRITERIA, get_weights_dict
+
+    for phase, review in list(REVIEW_CRITERIA) + [(9, 9)]:
+        weights = get_weights_dict(phase, review) or WEIGHTS
+        totals = list(range(-5, TOTAL_MAX + 6))
+        batch = reverse_engineer_batch(totals, phase, review)
+        for t, row in zip(totals, batch):
+            expected = _hamilton_components(max(0, min(t, TOTAL_MAX)), weights)
+            assert reverse_engineer_components(t, phase, review) == expected
+            assert list(row) == list(expected.values())
+    print("✓ Lookup tables match the Hamilton method for every total")
@@ -0,0 +1,151 @@
+"""
+Check the SQLite serving profile: pragmas on every connection and reads during an import write
+"""
+
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import time
+import pytest
+from sqlalchemy import text
+from models import db
+from sqlite_profile import release_sqlite_wal
+
+
+def database_path(app):
+    return app.config["SQLALCHEMY_DATABASE_URI"][len("sqlite:///"):]
+
+
+def test_connections_use_wal_profile(make_app):
+    app = make_app(SQLITE_WAL=True)
+    with app.app_context():
+        assert db.engine.pool.size() > 1
+        with db.engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 10000
+            assert conn.execute(text("PRAGMA cache_size")).scalar() == -32000
+    print("✅ SQLite connections run in WAL mode with the serving pragmas")
+
+
+def test_wal_app_does_not_reuse_engine_without_wal(make_app):
+    plain = make_app()
+    uri = plain.config["SQLALCHEMY_DATABASE_URI"]
+    wal = make_app(SQLALCHEMY_DATABASE_URI=uri, SQLITE_WAL=True)
+    with plain.app_context():
+        plain_engine = db.engine
+    with wal.app_context():
+        wal_engine = db.engine
+        assert wal_engine is not plain_engine
+        with db.engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+    # An app with the same settings still shares the engine
+    again = make_app(SQLALCHEMY_DATABASE_URI=uri, SQLITE_WAL=True)
+    with again.app_context():
+        assert db.engine is wal_engine
+    print("✅ Apps asking for different pragmas on one database get separate engines")
+
+
+def test_wal_is_opt_in(make_app, make_xlsx, upload):
+    app = make_app()
+    client = app.test_client()
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 40, 40, 40)]))
+    with app.app_context():
+        with db.engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 10000
+    assert not os.path.exists(database_path(app) + "-wal")
+    print("✅ Without SQLITE_WAL the database keeps its rollback journal and no side files")
+
+
+def test_released_database_copies_on_its_own(make_app, make_xlsx, upload, tmp_path):
+    app = make_app(SQLITE_WAL=True)
+    client = app.test_client()
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 40, 40, 40)]))
+    path = database_path(app)
+    assert os.path.exists(path + "-wal")
+
+    with app.app_context():
+        release_sqlite_wal(db.engine)
+    assert not os.path.exists(path + "-wal") and not os.path.exists(path + "-shm")
+
+    # Copying only the database file, as the share guide does, keeps every import
+    copy = os.path.join(tmp_path, "copy.db")
+    shutil.copyfile(path, copy)
+    conn = sqlite3.connect(copy)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone() == ("delete",)
+        assert conn.execute("SELECT name FROM student").fetchall() == [("A",)]
+        assert conn.execute("SELECT count(*) FROM evaluation").fetchone() == (1,)
+    finally:
+        conn.close()
+    print("✅ Releasing the WAL leaves a self-contained database file")
+
+
+def test_reads_are_not_blocked_by_an_open_write(make_app, make_xlsx, upload):
+    app = make_app(SQLITE_WAL=True)
+    client = app.test_client()
+    upload(client, make_xlsx([("A", "USN001", "G1", "Dr. Guide", 40, 40, 40)]))
+
+    # Hold the write lock the way a long import transaction would
+    writer = sqlite3.connect(database_path(app))
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("UPDATE student SET name = 'B'")
+    try:
+        started = time.perf_counter()
+        response = client.get("/students?phase=1&review=1")
+        assert response.status_code == 200
+        # Without WAL the read would wait for the busy timeout
+        assert time.perf_counter() - started < 5
+    finally:
+        writer.rollback()
+        writer.close()
+
+    # And an import commits while a reader keeps its snapshot open
+    reader = sqlite3.connect(database_path(app))
+    reader.execute("BEGIN")
+    assert reader.execute("SELECT count(*) FROM student").fetchone() == (1,)
+    try:
+        status = upload(client, make_xlsx([("B", "USN002", "G1", "Dr. Guide", 30, 30, 30)]))
+        assert status["status"] == "done"
+        assert reader.execute("SELECT count(*) FROM student").fetchone() == (1,)
+    finally:
+        reader.rollback()
+        reader.close()
+    print("✅ Reads and an import write no longer wait on each other")
+
+
+# Started as "python serve.py" would be: spawned workers re-run serve.py as __mp_main__
+SERVER_WITH_WORKER = """
+import multiprocessing, sys
+from app import create_app
+from models import db
+sys.modules["__main__"].__file__ = "serve.py"
+app = create_app({"SQLITE_WAL": True})
+with app.app_context(), db.engine.connect() as conn:
+    conn.exec_driver_sql("SELECT count(*) FROM student").scalar()
+    worker = multiprocessing.get_context("spawn").Process(target=print)
+    worker.start()
+    worker.join()
+    print(worker.exitcode, conn.exec_driver_sql("PRAGMA journal_mode").scalar())
+"""
+
+
+def test_spawned_worker_leaves_server_database_alone(tmp_path):
+    # A copy of the modules, so the server's app.db is a scratch one next to them
+    for path in os.listdir(os.path.dirname(os.path.abspath(__file__))):
+        if path.endswith(".py"):
+            shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), path), tmp_path)
+    result = subprocess.run([sys.executable, "-c", SERVER_WITH_WORKER], cwd=tmp_path,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split()[-2:] == ["0", "wal"], result.stdout
+    assert "Traceback" not in result.stderr and "locked" not in result.stderr, result.stderr
+    print("✅ A spawned worker neither bootstraps nor releases the server's database")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q", "-s"]))
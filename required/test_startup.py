@@ -0,0 +1,70 @@
+"""
+Check that create_app skips bootstrap work on a current schema and reuses the engine
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+import pytest
+from sqlalchemy import event, inspect
+from app import create_app
+from models import db
+from migrations import MIGRATIONS
+
+
+def test_second_app_reuses_engine_and_skips_bootstrap(tmp_path):
+    path = os.path.join(tmp_path, "test.db")
+    config = {"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"}
+    first = create_app(config)
+    with first.app_context():
+        engine = db.engine
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        second = create_app(config)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    with second.app_context():
+        assert db.engine is engine
+    # Only the schema marker is read
+    assert len(statements) == 1 and "schema_version" in statements[0], statements
+    print("✅ A second create_app() reads one marker row and shares the engine")
+
+
+def test_stale_marker_runs_bootstrap(tmp_path):
+    path = os.path.join(tmp_path, "test.db")
+    config = {"TESTING": True, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"}
+    create_app(config)
+
+    conn = sqlite3.connect(path)
+    conn.executescript(f"""
+        DROP TABLE upload_ledger;
+        UPDATE schema_version SET version = {len(MIGRATIONS) - 1};
+    """)
+    conn.commit()
+    conn.close()
+
+    app = create_app(config)
+    with app.app_context():
+        assert inspect(db.engine).has_table("upload_ledger")
+        assert db.session.execute(db.text("SELECT version FROM schema_version")).scalar() == len(MIGRATIONS)
+    print("✅ An outdated schema marker triggers create_all() and migrations")
+
+
+def test_importing_app_leaves_renderers_unloaded():
+    # A fresh interpreter, since this test process has long imported everything
+    probe = "import sys, app; print(sorted({m.split('.')[0] for m in sys.modules} & {'reportlab', 'openpyxl'}))"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]", result.stdout
+    print("✅ Importing app loads neither ReportLab nor openpyxl")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q", "-s"]))
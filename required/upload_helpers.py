@@ -3,23 +3,127 @@ Upload Helper Functions
 Handles dynamic column mapping based on phase/review
 """
 
-from typing import Dict, Tuple
-from review_config import get_review_config
-from utils import reverse_engineer_components
+import hashlib
+import os
+import re
+import tempfile
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from review_config import REVIEW_CRITERIA, get_review_config
+from renderers import load_workbook
+from utils import reverse_engineer_components, reverse_engineer_batch, normalize_header, average_components
 
-def map_excel_columns_to_criteria(row: Dict, key_map: Dict, phase: int, review: int) -> Tuple[Dict, Dict, Dict, Dict]:
+# Copy size used when spooling an upload to disk
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+def spool_upload(stream, hasher=None) -> str:
     """
-    Map Excel columns to generic criteria based on phase/review
-    Returns: (comp, member1_comp, member2_comp, guide_comp)
+    Copy an uploaded file stream to a temporary .xlsx file in fixed-size chunks
+    If a hashlib object is given it is fed the same chunks, so hashing costs no extra read
+    Returns: path of the temp file (caller removes it)
+    """
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    with os.fdopen(fd, "wb") as out:
+        while True:
+            chunk = stream.read(SPOOL_CHUNK_SIZE)
+            if not chunk:
+                break
+            if hasher is not None:
+                hasher.update(chunk)
+            out.write(chunk)
+    return path
+
+def upload_hasher(phase: Optional[int], review: Optional[int]):
+    """sha256 seeded with the import scope, so the same file for another review hashes differently"""
+    scope = "all" if phase is None else f"{phase}:{review}"
+    return hashlib.sha256(f"{scope}:".encode())
+
+def open_streaming_workbook(path: str):
+    """
+    Open a workbook in read-only mode so rows are parsed lazily from the XML.
+    Stored sheet dimensions are discarded: sheets with stray formatting often
+    declare huge ranges, which would pad every row out to thousands of cells.
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    for ws in wb.worksheets:
+        ws.reset_dimensions()
+    return wb
+
+_ROMAN = {"1": 1, "i": 1, "2": 2, "ii": 2}
+_SHEET_TITLE_RE = re.compile(r"^(?:phase|p)_?(1|2|i|ii)_?(?:review|r)_?(1|2|i|ii)$")
+
+def sheet_phase_review(title: str) -> Optional[Tuple[int, int]]:
+    """
+    Map a sheet name to a (phase, review) key of REVIEW_CRITERIA
+    Accepts e.g. "Phase 1 Review 2", "P2R1", "p1_r1" or the config title "PHASE - II REVIEW - I"
+    """
+    match = _SHEET_TITLE_RE.match(normalize_header(title))
+    if not match:
+        return None
+    key = (_ROMAN[match.group(1)], _ROMAN[match.group(2)])
+    return key if key in REVIEW_CRITERIA else None
+
+def read_header(ws) -> List[str]:
+    """Return the raw header row as strings"""
+    header_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), tuple())
+    return [str(v) if v is not None else "" for v in header_row]
+
+def iter_row_values(ws, width: int) -> Iterator[tuple]:
+    """Yield data rows one at a time as value tuples, at most `width` cells wide"""
+    if not width:
+        return
+    yield from ws.iter_rows(min_row=2, max_col=width, values_only=True)
+
+def build_key_map(fieldnames: Sequence[str]) -> Dict[str, str]:
+    """
+    Map common header names to our keys
+    Required: student name, seat no. Optional: group no, project title, evaluator marks.
+    """
+    key_map = {}
+    for raw in fieldnames or []:
+        h = normalize_header(raw)
+        # Default: map normalized key to raw header (for dynamic lookup)
+        key_map[h] = raw
+
+        if h in ("name", "student_name"):
+            key_map["name"] = raw
+        elif h in ("seat_no", "seatno", "usn", "univ_seat_no"):
+            key_map["seat_no"] = raw
+        elif h in ("total", "total_marks", "average", "avg"):
+            key_map["total"] = raw
+        elif h in ("group", "group_no", "group_number", "project_group"):
+            key_map["group_no"] = raw
+        elif h in ("project_title", "title"):
+            key_map["project_title"] = raw
+        elif h in ("project_guide",):
+            key_map["project_guide"] = raw
+        elif h in ("member1", "member_1", "chairperson"):
+            key_map["member1"] = raw
+        elif h in ("member2", "member_2"):
+            key_map["member2"] = raw
+        elif h in ("internal_guide", "guide", "project_guide"):
+            key_map["internal_guide"] = raw
+        elif h in ("literature", "literature_survey"):
+            key_map["literature_survey"] = raw
+        elif h in ("problem", "problem_identification"):
+            key_map["problem_identification"] = raw
+        elif h in ("presentation", "project_presentation_skill", "presentation_skill"):
+            key_map["presentation"] = raw
+        elif h in ("qa", "qna", "question_answer", "question_and_answer_session", "q_a"):
+            # Map to full name to ensure fuzzy match with criteria "Question and answer session"
+            key_map["question_and_answer_session"] = raw
+    return key_map
+
+def select_mark_format(key_map: Dict, config: Dict) -> Tuple[Optional[str], List[str]]:
+    """
+    Decide which evaluator format a header row uses
+    Returns: (format, raw column names) where format is "three_evaluators",
+    "components", "total" or None when no format applies
     """
-    config = get_review_config(phase, review)
-    if not config:
-        raise ValueError(f"No configuration found for Phase {phase} Review {review}")
-    
     # Check if we have three evaluator totals
     if all(k in key_map for k in ("member1", "member2", "internal_guide")):
-        return handle_three_evaluators(row, key_map, phase, review)
-    
+        return "three_evaluators", [key_map["member1"], key_map["member2"], key_map["internal_guide"]]
+
     # Check if we have individual component columns
     # Try to find columns matching the criteria names for this phase/review
     criteria_columns = {}
@@ -31,15 +135,50 @@ def map_excel_columns_to_criteria(row: Dict, key_map: Dict, phase: int, review:
             if criterion_name.replace('_', ' ') in normalized_key or normalized_key in criterion_name.replace('_', ' '):
                 criteria_columns[f'criteria{i}'] = col_name
                 break
-    
+
     if len(criteria_columns) == 4:
-        return handle_component_columns(row, criteria_columns, phase, review)
-    
+        return "components", [criteria_columns[f'criteria{i}'] for i in range(1, 5)]
+
     # Fall back to total marks
     if "total" in key_map:
+        return "total", [key_map["total"]]
+
+    return None, []
+
+COMPONENT_KEYS = ("criteria1", "criteria2", "criteria3", "criteria4")
+
+NO_FORMAT_MESSAGE = "Excel file must contain either: three evaluator totals, all four component columns, or total marks"
+
+def _normalize_total(raw_total: float) -> int:
+    total = int(round(raw_total))
+    # Normalize if out of range
+    TOTAL_MAX = 50
+    if total > TOTAL_MAX:
+        if total <= 100:
+            total = int(round((raw_total / 100.0) * TOTAL_MAX))
+        else:
+            total = TOTAL_MAX
+    return total
+
+def map_excel_columns_to_criteria(row: Dict, key_map: Dict, phase: int, review: int) -> Tuple[Dict, Dict, Dict, Dict]:
+    """
+    Map Excel columns to generic criteria based on phase/review
+    Returns: (comp, member1_comp, member2_comp, guide_comp)
+    """
+    config = get_review_config(phase, review)
+    if not config:
+        raise ValueError(f"No configuration found for Phase {phase} Review {review}")
+    
+    mark_format, columns = select_mark_format(key_map, config)
+    if mark_format == "three_evaluators":
+        return handle_three_evaluators(row, key_map, phase, review)
+    if mark_format == "components":
+        criteria_columns = {f'criteria{i}': col for i, col in enumerate(columns, 1)}
+        return handle_component_columns(row, criteria_columns, phase, review)
+    if mark_format == "total":
         return handle_total_marks(row, key_map, phase, review)
     
-    raise ValueError("Excel file must contain either: three evaluator totals, all four component columns, or total marks")
+    raise ValueError(NO_FORMAT_MESSAGE)
 
 def handle_three_evaluators(row: Dict, key_map: Dict, phase: int, review: int) -> Tuple[Dict, Dict, Dict, Dict]:
     """Handle Excel with Member 1, Member 2, Internal Guide total marks"""
@@ -53,20 +192,7 @@ def handle_three_evaluators(row: Dict, key_map: Dict, phase: int, review: int) -
     guide_comp = reverse_engineer_components(guide_total, phase, review)
     
     # Calculate average components
-    comp = {}
-    for key in member1_comp.keys():
-        m1 = member1_comp[key]
-        m2 = member2_comp[key]
-        g = guide_comp[key]
-        
-        # Count how many evaluators actually provided marks (non-zero)
-        evaluators = [m1, m2, g]
-        non_zero_evaluators = [val for val in evaluators if val > 0]
-        
-        if non_zero_evaluators:
-            comp[key] = int(round(sum(non_zero_evaluators) / len(non_zero_evaluators)))
-        else:
-            comp[key] = 0
+    comp = average_components(member1_comp, member2_comp, guide_comp)
     
     return comp, member1_comp, member2_comp, guide_comp
 
@@ -86,15 +212,7 @@ def handle_component_columns(row: Dict, criteria_columns: Dict, phase: int, revi
 def handle_total_marks(row: Dict, key_map: Dict, phase: int, review: int) -> Tuple[Dict, Dict, Dict, Dict]:
     """Handle Excel with only total marks"""
     raw_total = float(row.get(key_map["total"], 0))
-    total = int(round(raw_total))
-    
-    # Normalize if out of range
-    TOTAL_MAX = 50
-    if total > TOTAL_MAX:
-        if total <= 100:
-            total = int(round((raw_total / 100.0) * TOTAL_MAX))
-        else:
-            total = TOTAL_MAX
+    total = _normalize_total(raw_total)
     
     comp = reverse_engineer_components(total, phase, review)
     
@@ -105,6 +223,80 @@ def handle_total_marks(row: Dict, key_map: Dict, phase: int, review: int) -> Tup
     
     return comp, member1_comp, member2_comp, guide_comp
 
+class ColumnPlan:
+    """
+    Column-to-criteria mapping for one header row and phase/review.
+    Built once per upload (see compile_column_plan); applying it to a row
+    is a fixed list of index lookups and conversions.
+    """
+
+    def __init__(self, fieldnames: Sequence[str], phase: int, review: int):
+        self.phase = phase
+        self.review = review
+        self.key_map = build_key_map(fieldnames)
+        self.missing = [k for k in ("name", "seat_no") if k not in self.key_map]
+
+        config = get_review_config(phase, review)
+        if not config:
+            self.mark_format, columns = None, []
+            self.error = f"No configuration found for Phase {phase} Review {review}"
+        else:
+            self.mark_format, columns = select_mark_format(self.key_map, config)
+            self.error = None if self.mark_format else NO_FORMAT_MESSAGE
+
+        # Dict rows keep the last of any duplicated header, so index the same way
+        index = {name: i for i, name in enumerate(fieldnames)}
+        self.width = len(fieldnames)
+        self.name_idx = index.get(self.key_map.get("name"))
+        self.seat_idx = index.get(self.key_map.get("seat_no"))
+        self.info_idx = [index.get(self.key_map.get(k, "")) for k in ("group_no", "project_title", "project_guide")]
+        self.mark_idx = [index[col] for col in columns]
+
+    @staticmethod
+    def _value(vals: Sequence, idx: Optional[int], default=None):
+        if idx is None:
+            return default
+        return vals[idx] if idx < len(vals) else None
+
+    def student_fields(self, vals: Sequence) -> Tuple[str, str, str, str, str]:
+        """Return (name, seat_no, group_no, project_title, project_guide) for a row"""
+        name = str(self._value(vals, self.name_idx) or "").strip()
+        seat_no = str(self._value(vals, self.seat_idx) or "").strip()
+        group_no, project_title, project_guide = (
+            str(self._value(vals, idx, "") or "").strip() for idx in self.info_idx
+        )
+        return name, seat_no, group_no, project_title, project_guide
+
+    def apply(self, vals: Sequence) -> Tuple[Dict, Dict, Dict, Dict]:
+        """
+        Map one row to generic criteria, same result as map_excel_columns_to_criteria
+        Returns: (comp, member1_comp, member2_comp, guide_comp)
+        """
+        if self.error:
+            raise ValueError(self.error)
+        marks = [self._value(vals, idx) for idx in self.mark_idx]
+
+        if self.mark_format == "three_evaluators":
+            totals = [int(float(v)) for v in marks]
+            member1_comp, member2_comp, guide_comp = (
+                dict(zip(COMPONENT_KEYS, comp)) for comp in reverse_engineer_batch(totals, self.phase, self.review)
+            )
+            return average_components(member1_comp, member2_comp, guide_comp), member1_comp, member2_comp, guide_comp
+
+        if self.mark_format == "components":
+            comp = {f"criteria{i}": int(float(v)) for i, v in enumerate(marks, 1)}
+        else:
+            comp = reverse_engineer_components(_normalize_total(float(marks[0])), self.phase, self.review)
+        return comp, comp.copy(), comp.copy(), comp.copy()
+
+@lru_cache(maxsize=64)
+def _compile_column_plan(fieldnames: Tuple[str, ...], phase: int, review: int) -> ColumnPlan:
+    return ColumnPlan(fieldnames, phase, review)
+
+def compile_column_plan(fieldnames: Sequence[str], phase: int, review: int) -> ColumnPlan:
+    """Get the column plan for a header row, cached by header signature and phase/review"""
+    return _compile_column_plan(tuple(fieldnames), phase, review)
+
 def get_criteria_key_map(phase: int, review: int) -> Dict[str, str]:
     """
     Get mapping of expected Excel column names to criteria keys
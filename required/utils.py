@@ -1,6 +1,6 @@
-from typing import Dict, List
+from typing import Dict, Iterable, List, Tuple
 import re
-from review_config import get_weights_dict
+from review_config import REVIEW_CRITERIA, get_weights_dict
 
 # Default weights for Phase 1 Review 1 (backward compatibility)
 WEIGHTS = {
@@ -39,12 +39,76 @@ def _hamilton_round(values: Dict[str, float], target_sum: int) -> Dict[str, int]
         result[fracs[i % len(fracs)][0]] += 1
     return result
 
-def reverse_engineer_components(total: int, phase: int = 1, review: int = 1) -> Dict[str, int]:
-    """Reverse engineer component marks from total, using phase/review-specific weights"""
-    weights = get_weights_dict(phase, review) or WEIGHTS
-    t = max(0, min(int(total), TOTAL_MAX))
+def _hamilton_components(t: int, weights: Dict[str, int]) -> Dict[str, int]:
     if t == 0:
         return {k: 0 for k in weights}
     # proportional allocation by max weights, then Hamilton rounding to maintain sum
     scaled = {k: (t * (w / TOTAL_MAX)) for k, w in weights.items()}
     return _hamilton_round(scaled, t)
+
+def _build_component_table(weights: Dict[str, int]) -> Tuple[Tuple[str, ...], List[Tuple[int, ...]]]:
+    keys = tuple(weights)
+    rows = []
+    for t in range(TOTAL_MAX + 1):
+        comp = _hamilton_components(t, weights)
+        rows.append(tuple(comp[k] for k in keys))
+    return keys, rows
+
+# Every possible total (0..TOTAL_MAX) precomputed per weight set when the config loads
+_COMPONENT_TABLES = {}
+
+def _component_table(weights: Dict[str, int]):
+    signature = tuple(weights.items())
+    table = _COMPONENT_TABLES.get(signature)
+    if table is None:
+        table = _COMPONENT_TABLES[signature] = _build_component_table(weights)
+    return table
+
+for _phase, _review in REVIEW_CRITERIA:
+    _component_table(get_weights_dict(_phase, _review))
+_component_table(WEIGHTS)
+
+def reverse_engineer_components(total: int, phase: int = 1, review: int = 1) -> Dict[str, int]:
+    """Reverse engineer component marks from total, using phase/review-specific weights"""
+    keys, rows = _component_table(get_weights_dict(phase, review) or WEIGHTS)
+    t = max(0, min(int(total), TOTAL_MAX))
+    return dict(zip(keys, rows[t]))
+
+def reverse_engineer_batch(totals: Iterable[int], phase: int = 1, review: int = 1) -> List[Tuple[int, ...]]:
+    """
+    Reverse engineer many totals in one call
+    Returns: one (criteria1, ..., criteria4) row per total, same values as reverse_engineer_components
+    """
+    _, rows = _component_table(get_weights_dict(phase, review) or WEIGHTS)
+    return [rows[max(0, min(int(t), TOTAL_MAX))] for t in totals]
+
+EVALUATORS = ("member1", "member2", "guide")
+
+def average_components(member1_comp: Dict[str, int], member2_comp: Dict[str, int], guide_comp: Dict[str, int]) -> Dict[str, int]:
+    """
+    The scoring rule: each criterion is the rounded mean of the evaluators who
+    actually gave marks (non-zero). The stored criteria and total_marks come from here.
+    """
+    comp = {}
+    for key in member1_comp.keys():
+        non_zero_evaluators = [val for val in (member1_comp[key], member2_comp[key], guide_comp[key]) if val > 0]
+        if non_zero_evaluators:
+            comp[key] = int(round(sum(non_zero_evaluators) / len(non_zero_evaluators)))
+        else:
+            comp[key] = 0
+    return comp
+
+def score_evaluation(member1_comp: Dict[str, int], member2_comp: Dict[str, int], guide_comp: Dict[str, int]) -> Dict[str, int]:
+    """
+    Single source of truth for every stored score of an evaluation
+    Returns: Evaluation column values - criteria1-4 and total_marks (averaged),
+             plus each evaluator's criteria and member1_total / member2_total / guide_total
+    """
+    comp = average_components(member1_comp, member2_comp, guide_comp)
+    values = {"total_marks": sum(comp.values())}
+    values.update(comp)
+    for evaluator, marks in zip(EVALUATORS, (member1_comp, member2_comp, guide_comp)):
+        for key, mark in marks.items():
+            values[f"{evaluator}_{key}"] = mark
+        values[f"{evaluator}_total"] = sum(mark or 0 for mark in marks.values())
+    return values
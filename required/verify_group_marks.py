@@ -3,7 +3,8 @@ Verify that students in the same group have identical total marks
 """
 
 from app import create_app
-from models import db, Student, Evaluation
+from models import db, Student
+from import_batches import active_evaluations
 
 def verify_group_marks():
     app = create_app()
@@ -32,15 +33,17 @@ def verify_group_marks():
                 group_students = groups[group_no]
                 print(f"\nGroup {group_no} ({len(group_students)} students):")
                 
+                marks = []
                 for student in group_students:
-                    ev = Evaluation.query.filter_by(student=student, phase=phase, review_no=review).first()
+                    ev = active_evaluations(phase, review).filter_by(student_id=student.id).first()
                     if ev:
                         print(f"  {student.name:25} : {ev.total_marks}/50")
+                        marks.append(ev.total_marks)
                 
                 # Check if all marks are identical
-                marks = [Evaluation.query.filter_by(student=s, phase=phase, review_no=review).first().total_marks 
-                        for s in group_students]
-                if len(set(marks)) == 1:
+                if not marks:
+                    print("  No evaluations in the published import")
+                elif len(set(marks)) == 1:
                     print(f"  ✅ All students have identical marks ({marks[0]}/50)")
                 else:
                     print(f"  ⚠️  Marks vary: {marks}")